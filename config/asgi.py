@@ -0,0 +1,23 @@
+"""
+ASGI config for config project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Live update streams (sync:live) need it to stay open without tying up a
+worker each.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+application = get_asgi_application()
+
+# Compile templates before taking requests
+from src.apps.common.warmup import warm_up  # noqa: E402
+
+warm_up()
@@ -0,0 +1,138 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn -c python:config.gunicorn
+
+The app is loaded once, in the master, and workers are forked from it
+already warm: Django set up, URLs and templates compiled (see
+common.warmup). They share the master's memory copy-on-write, so a new
+worker, whether from a deploy or a max_requests recycle, is ready to
+serve straight away. Point the platform's health check at /ready/,
+which only passes once the database and cache are reachable too.
+
+Environment:
+
+    GUNICORN_WORKER_CLASS   asgi (default) for uvicorn workers running
+                            config.asgi, or gthread for threaded workers
+                            running config.wsgi. Live updates are only
+                            streamed under asgi: WSGI can't stream them.
+                            Under asgi, sync views run in a thread per
+                            request, and streamed downloads (archive
+                            exports) are read through async iterators,
+                            so they are sent as they are made.
+    WEB_CONCURRENCY         worker processes
+    GUNICORN_THREADS        threads per gthread worker
+    GUNICORN_MAX_REQUESTS   requests before a worker is replaced
+    PROMETHEUS_MULTIPROC_DIR
+                            where workers write their metrics, emptied
+                            each time the server starts
+    PORT                    port to listen on
+"""
+
+import gc
+import os
+import shutil
+
+# Imported under another name: gunicorn reads every module-level name
+# here as a setting, and "config" is one
+from decouple import config as env
+from django.core.exceptions import ImproperlyConfigured
+
+
+# Worker class and application for each GUNICORN_WORKER_CLASS
+WORKER_CLASSES = {
+    "asgi": ("uvicorn_worker.UvicornWorker", "config.asgi:application"),
+    "gthread": ("gthread", "config.wsgi:application"),
+}
+
+worker_type = env("GUNICORN_WORKER_CLASS", default="asgi")
+if worker_type not in WORKER_CLASSES:
+    raise ImproperlyConfigured(
+        f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}, not {worker_type!r}."
+    )
+worker_class, wsgi_app = WORKER_CLASSES[worker_type]
+
+
+# Metrics
+# ------------------------------------------------------------------------------
+
+# Each worker writes its samples to files here, and /metrics/ adds them
+# up, so any worker can answer a scrape (see common.metrics). It has to
+# be set before the app is preloaded, which is before any hook runs:
+# prometheus_client picks its storage when it's first imported.
+metrics_dir = env("PROMETHEUS_MULTIPROC_DIR", default="/dev/shm/littlenote-metrics")
+os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+os.makedirs(metrics_dir, exist_ok=True)
+
+
+# Workers
+# ------------------------------------------------------------------------------
+
+bind = f"0.0.0.0:{env('PORT', default=8000, cast=int)}"
+workers = env("WEB_CONCURRENCY", default=(os.cpu_count() or 1) * 2 + 1, cast=int)
+threads = env("GUNICORN_THREADS", default=4, cast=int)
+
+preload_app = True
+
+# Replace workers now and then to cap slow leaks. The jitter spreads
+# the restarts out, so workers don't all recycle at once.
+max_requests = env("GUNICORN_MAX_REQUESTS", default=1000, cast=int)
+max_requests_jitter = max_requests // 10
+
+# Kill workers stuck for this long; on restarts and deploys, give them
+# this long to finish their requests
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# Worker heartbeats go to memory, not a disk that may stall
+worker_tmp_dir = "/dev/shm"
+
+# Requests are logged by the app's access logger
+accesslog = None
+
+
+# Hooks
+# ------------------------------------------------------------------------------
+
+def on_starting(server):
+    """
+    Run in the master once, when the server starts.
+    """
+    # Start each deploy's counters from zero, rather than adding in the
+    # files of workers from an earlier one. That includes the master's
+    # own, left by preloading; workers open theirs when they fork.
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def when_ready(server):
+    """
+    Run in the master once the app is loaded, before any worker is
+    forked.
+    """
+    from django.db import connections
+
+    if worker_type == "gthread":
+        server.log.warning(
+            "Serving WSGI with gthread workers: live updates are off. "
+            "Set GUNICORN_WORKER_CLASS=asgi to stream them."
+        )
+
+    # Connections can't be shared across a fork
+    connections.close_all()
+
+    # Leave everything allocated while loading out of garbage
+    # collection, which would otherwise write to (and so copy) the
+    # memory each worker shares with the master
+    gc.freeze()
+
+
+def child_exit(server, worker):
+    """
+    Run in the master when a worker exits.
+    """
+    from prometheus_client import multiprocess
+
+    # Drop the worker's live gauges; its counters are kept
+    multiprocess.mark_process_dead(worker.pid, metrics_dir)
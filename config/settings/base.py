@@ -44,10 +44,13 @@ THIRD_PARTY_APPS = [
 
 LOCAL_APPS = [
     "src.apps.accounts",
+    "src.apps.archive",
+    "src.apps.bench",
     "src.apps.common",
     "src.apps.journal",
     "src.apps.notes",
     "src.apps.pages",
+    "src.apps.sync",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -58,6 +61,11 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 DJANGO_MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Serves static files, with far-future caching for fingerprinted ones
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Before the session middleware, so session writes pin the client
+    # to the primary database
+    "src.apps.common.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -68,7 +76,72 @@ DJANGO_MIDDLEWARE = [
 
 THIRD_PARTY_MIDDLEWARE = []
 
-MIDDLEWARE = DJANGO_MIDDLEWARE + THIRD_PARTY_MIDDLEWARE
+# Outermost, so the timings cover every other middleware
+INSTRUMENTATION_MIDDLEWARE = [
+    "src.apps.common.middleware.RequestContextMiddleware",
+    "src.apps.common.middleware.MetricsMiddleware",
+    "src.apps.common.middleware.InstrumentationMiddleware",
+]
+
+# Needs request.user, so runs after the authentication middleware
+LOCAL_MIDDLEWARE = [
+    "src.apps.common.middleware.ProfilingMiddleware",
+]
+
+MIDDLEWARE = (
+    INSTRUMENTATION_MIDDLEWARE + DJANGO_MIDDLEWARE + THIRD_PARTY_MIDDLEWARE + LOCAL_MIDDLEWARE
+)
+
+
+# Instrumentation
+# ------------------------------------------------------------------------------
+
+# Adds a Server-Timing header and timing fields to the access log
+INSTRUMENTATION_ENABLED = config("DJANGO_INSTRUMENTATION", default=False, cast=bool)
+
+# Prometheus metrics, scraped from /metrics/ with the bearer token
+METRICS_ENABLED = config("DJANGO_METRICS", default=True, cast=bool)
+METRICS_TOKEN = config("DJANGO_METRICS_TOKEN", default="")
+
+# Staff can profile a request with ?_profile or the X-Profile header
+PROFILING_ENABLED = config("DJANGO_PROFILING", default=False, cast=bool)
+PROFILING_DIR = config("DJANGO_PROFILING_DIR", default=str(BASE_DIR / "profiles"))
+
+
+# Databases
+# ------------------------------------------------------------------------------
+
+# Aliases in DATABASES of read replicas, which read-only views read from;
+# see common.replicas. Listed by the environment's settings.
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ["src.apps.common.replicas.ReplicaRouter"]
+
+
+# Caches
+# ------------------------------------------------------------------------------
+
+# Shared by all workers: Redis when REDIS_URL is set, otherwise a database
+# table (created by the common app's migrations). src.apps.common.cache
+# adds a per-worker LRU in front of it. The note list is only cached with
+# Redis: in the database, its version reads and bumps cost more queries
+# than they save (see notes.cache).
+REDIS_URL = config("REDIS_URL", default="")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "littlenote_cache",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        },
+    }
 
 
 # Templates
@@ -78,24 +151,46 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [SRC_DIR / "templates"],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # Templates are compiled once per process and kept; in
+            # development the cache is cleared whenever a template
+            # changes. Spelled out so django_cotton doesn't set up its
+            # own loaders.
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django_cotton.cotton_loader.Loader",
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+            "builtins": ["django_cotton.templatetags.cotton"],
             "context_processors": [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "config.context_processors.site_settings",
+                "src.apps.accounts.context_processors.user_stats",
+                "src.apps.sync.context_processors.live_updates",
             ],
         },
     },
 ]
 
 
+# Compile every project template when a process starts, before it takes
+# requests; see common.warmup
+TEMPLATE_WARMUP = config("DJANGO_TEMPLATE_WARMUP", default=True, cast=bool)
+
+
 #  URLs
 # ------------------------------------------------------------------------------
 
 ROOT_URLCONF = "config.urls"
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
 LOGIN_URL = "/"
 
 
@@ -124,3 +219,20 @@ AUTH_PASSWORD_VALIDATORS = [
 STATIC_ROOT = str(BASE_DIR / "staticfiles")
 STATIC_URL = "/static/"
 STATICFILES_DIRS = [SRC_DIR / "static"]
+STATICFILES_FINDERS = [
+    "django.contrib.staticfiles.finders.FileSystemFinder",
+    "django.contrib.staticfiles.finders.AppDirectoriesFinder",
+    "src.apps.common.assets.BundleFinder",
+]
+
+# Where CSS and JS bundles are built; see common.assets
+STATIC_BUNDLE_DIR = BASE_DIR / ".bundles"
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
@@ -1,6 +1,6 @@
 from .base import *
 
-from decouple import config
+from decouple import Csv, config
 
 # General
 # ------------------------------------------------------------------------------
@@ -15,22 +15,6 @@ ALLOWED_HOSTS = [
 ]
 
 
-# Middleware
-# ------------------------------------------------------------------------------
-
-MIDDLEWARE = [
-    "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
-]
-
-
-
 #  Databases
 # ------------------------------------------------------------------------------
 
@@ -45,6 +29,13 @@ DATABASES = {
     },
 }
 
+# Read replicas of the same database, one per host in DB_REPLICA_HOSTS;
+# see common.replicas
+for number, host in enumerate(config("DB_REPLICA_HOSTS", default="", cast=Csv()), start=1):
+    alias = f"replica_{number}"
+    DATABASES[alias] = {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(alias)
+
 
 #  Email
 # ------------------------------------------------------------------------------
@@ -65,7 +56,14 @@ RESEND_API_KEY = config("RESEND_API_KEY")
 # Static files
 # ------------------------------------------------------------------------------
 
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# Fingerprinted names, with Brotli and gzip variants written by
+# collectstatic. WhiteNoise serves fingerprinted files as immutable.
+STORAGES = {
+    **STORAGES,
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
 
 # Security
@@ -82,17 +80,28 @@ X_FRAME_OPTIONS = "DENY"
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "request_context": {
+            "()": "src.apps.common.log.RequestContextFilter",
+        },
+        "sample_ratelimit": {
+            "()": "src.apps.common.log.SamplingFilter",
+            "rate": config("LOG_RATELIMIT_SAMPLE_RATE", default=0.1, cast=float),
+        },
+    },
     "formatters": {
-        "verbose": {
-            "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
-            "style": "{",
+        "json": {
+            "()": "src.apps.common.log.JSONFormatter",
         },
     },
     "handlers": {
+        # Built with "()" rather than "class" so dictConfig doesn't apply
+        # its own QueueHandler wiring on Python 3.12+
         "console": {
+            "()": "src.apps.common.log.AsyncStreamHandler",
             "level": "INFO",
-            "class": "logging.StreamHandler",
-            "formatter": "verbose",
+            "formatter": "json",
+            "filters": ["request_context"],
         },
     },
     "root": {
@@ -110,5 +119,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "src.apps.pages.ratelimit": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "filters": ["sample_ratelimit"],
+            "propagate": False,
+        },
     },
 }
@@ -6,5 +6,8 @@ urlpatterns = [
     path("journal/", include("src.apps.journal.urls")),
     path("notes/", include("src.apps.notes.urls")),
     path("accounts/", include("src.apps.accounts.urls")),
+    path("archive/", include("src.apps.archive.urls")),
+    path("sync/", include("src.apps.sync.urls")),
+    path("", include("src.apps.common.urls")),
     path("admin/", admin.site.urls),
 ]
@@ -1,3 +1,58 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-# Register your models here.
+from .constants import SuccessMessages
+from .deletion import request_account_deletion
+from .models import AccountDeletion, UserStats
+
+
+User = get_user_model()
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class UserAdmin(BaseUserAdmin):
+    """
+    User admin that queues deleted users for the batched deletion worker
+    (see accounts.deletion), rather than cascading to every one of their
+    notes and journal entries within the request.
+    """
+    def get_deleted_objects(self, objs, request):
+        # Listing what the cascade would delete loads every related row
+        to_delete = [str(obj) for obj in objs]
+        return to_delete, {User._meta.verbose_name_plural: len(to_delete)}, set(), []
+
+    def delete_model(self, request, obj):
+        request_account_deletion(obj)
+        self.message_user(request, SuccessMessages.ACCOUNT_DELETION_QUEUED, messages.INFO)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            request_account_deletion(user)
+        self.message_user(request, SuccessMessages.ACCOUNT_DELETION_QUEUED, messages.INFO)
+
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "user",
+        "requested_at",
+        "started_at",
+        "completed_at",
+        "notes_deleted",
+        "journal_entries_deleted",
+    ]
+    list_select_related = ["user"]
+    raw_id_fields = ["user"]
+    readonly_fields = ["started_at", "completed_at", "notes_deleted", "journal_entries_deleted"]
+
+
+@admin.register(UserStats)
+class UserStatsAdmin(admin.ModelAdmin):
+    list_display = ["user", "note_count", "journal_entry_count", "word_count", "updated_at"]
+    list_select_related = ["user"]
+    raw_id_fields = ["user"]
+    readonly_fields = ["note_count", "journal_entry_count", "word_count", "updated_at"]
@@ -0,0 +1,31 @@
+"""Constants for the accounts app."""
+
+
+class DeletionConfig:
+    """
+    Account deletion constants.
+    """
+    # Rows deleted per statement, and the pause between statements, so
+    # deleting a large account never holds locks for long
+    BATCH_SIZE = 1000
+    PAUSE = 0.05
+
+    # Seconds between checks for new deletion requests when the worker
+    # runs continuously
+    POLL_INTERVAL = 10
+
+
+class SuccessMessages:
+    """
+    User-facing success message constants.
+    """
+    ACCOUNT_DELETION_REQUESTED = "Your account has been disabled and will be deleted shortly."
+    ACCOUNT_DELETION_QUEUED = "Deleted accounts are disabled now and their data is deleted in the background."
+
+
+class StatsConfig:
+    """
+    Per-user stats constants.
+    """
+    # Rows read at a time when recounting a user's words
+    CHUNK_SIZE = 2000
@@ -0,0 +1,14 @@
+from django.utils.functional import SimpleLazyObject
+
+from .stats import get_user_stats
+
+
+def user_stats(request):
+    """
+    Make the signed-in user's stats available to templates, loaded
+    only if a template uses them.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return {}
+    return {"user_stats": SimpleLazyObject(lambda: get_user_stats(user.pk))}
@@ -0,0 +1,116 @@
+"""
+Account deletion in bounded batches.
+
+Deleting a user directly makes Django's collector load every related
+row into memory and delete it all in one transaction. Instead, the
+account is disabled straight away and its rows are deleted by primary
+key, a batch at a time, so memory use and lock time stay the same
+however large the account is. Only then is the user deleted, with
+nothing left to cascade to.
+"""
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+from src.apps.sync.models import Tombstone
+
+from .constants import DeletionConfig
+from .models import AccountDeletion
+
+
+User = get_user_model()
+
+# Models deleted in batches, and the AccountDeletion field counting them
+BATCHED_MODELS = [
+    (Note, "notes_deleted"),
+    (JournalEntry, "journal_entries_deleted"),
+    (Tombstone, None),
+]
+
+
+def deleting_account(origin):
+    """
+    Return True if a deletion was cascaded from deleting a user, in
+    which case per-row bookkeeping (stats, tombstones, cache versions,
+    live updates) has no one left to serve. post_delete receivers take
+    origin from the signal.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is User
+
+
+def request_account_deletion(user):
+    """
+    Disable the user's account and queue it for deletion. Disabled users
+    are signed out of every session on their next request.
+    """
+    with transaction.atomic():
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        deletion, _ = AccountDeletion.objects.get_or_create(user=user)
+    return deletion
+
+
+def delete_batch(model, user_id, batch_size):
+    """
+    Delete up to batch_size of the user's rows. Returns the number
+    deleted.
+    """
+    # _base_manager includes trashed notes
+    ids = list(
+        model._base_manager.filter(author_id=user_id).values_list("pk", flat=True)[:batch_size]
+    )
+    if not ids:
+        return 0
+    # Nothing references these rows, so they can go without being loaded
+    return model._base_manager.filter(pk__in=ids)._raw_delete(model._base_manager.db)
+
+
+def process_deletion(deletion, batch_size=DeletionConfig.BATCH_SIZE, pause=DeletionConfig.PAUSE):
+    """
+    Delete the account's notes, journal entries and tombstones in
+    batches, recording progress after each one, then the user. Safe to
+    run again if it's interrupted.
+    """
+    if deletion.started_at is None:
+        deletion.started_at = timezone.now()
+        deletion.save(update_fields=["started_at"])
+
+    for model, counter in BATCHED_MODELS:
+        while True:
+            with transaction.atomic():
+                deleted = delete_batch(model, deletion.user_id, batch_size)
+                if deleted and counter:
+                    AccountDeletion.objects.filter(pk=deletion.pk).update(
+                        **{counter: F(counter) + deleted}
+                    )
+            if deleted < batch_size:
+                break
+            time.sleep(pause)
+
+    with transaction.atomic():
+        User.objects.filter(pk=deletion.user_id).delete()
+        AccountDeletion.objects.filter(pk=deletion.pk).update(completed_at=timezone.now())
+
+    deletion.refresh_from_db()
+    return deletion
+
+
+def delete_account(user, batch_size=DeletionConfig.BATCH_SIZE, pause=DeletionConfig.PAUSE):
+    """
+    Disable and delete an account straight away, in batches, for callers
+    that wait for it rather than queueing it for the worker.
+    """
+    return process_deletion(request_account_deletion(user), batch_size, pause)
+
+
+def pending_deletions():
+    """
+    Return deletion requests that haven't completed, oldest first.
+    """
+    return AccountDeletion.objects.filter(completed_at__isnull=True).order_by("requested_at")
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...constants import DeletionConfig
+from ...deletion import pending_deletions, process_deletion
+
+
+class Command(BaseCommand):
+    help = "Delete accounts queued for deletion, their data a batch at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DeletionConfig.BATCH_SIZE,
+            help="Rows deleted per statement.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=DeletionConfig.PAUSE,
+            help="Seconds to wait between batches.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and check for new requests every poll interval.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=DeletionConfig.POLL_INTERVAL,
+            help="Seconds between checks for new requests with --loop.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            for deletion in pending_deletions():
+                deletion = process_deletion(
+                    deletion, batch_size=options["batch_size"], pause=options["pause"]
+                )
+                self.stdout.write(
+                    f"Completed account deletion {deletion.pk}: {deletion.notes_deleted} notes, "
+                    f"{deletion.journal_entries_deleted} journal entries."
+                )
+
+            if not options["loop"]:
+                break
+            time.sleep(options["poll_interval"])
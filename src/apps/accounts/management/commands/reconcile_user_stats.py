@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from ...stats import reconcile_user_stats
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Recount users' stats and repair any that have drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="ID of a user to reconcile. Can be repeated; defaults to every user.",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by("pk")
+        if options["user_ids"]:
+            users = users.filter(pk__in=options["user_ids"])
+
+        checked = repaired = 0
+        for user_id in users.values_list("pk", flat=True).iterator():
+            _, drifted = reconcile_user_stats(user_id)
+            checked += 1
+            if drifted:
+                repaired += 1
+                self.stdout.write(f"Repaired stats for user {user_id}.")
+
+        self.stdout.write(f"Checked {checked} users, repaired {repaired}.")
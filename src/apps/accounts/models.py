@@ -1,3 +1,60 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class AccountDeletion(models.Model):
+    """
+    A request to delete an account. The user is disabled as soon as the
+    request is made, and their data is deleted in batches by the
+    process_account_deletions worker, which records its progress here.
+    The record outlives the user.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="deletion",
+    )
+    requested_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    notes_deleted = models.PositiveBigIntegerField(default=0)
+    journal_entries_deleted = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["requested_at"],
+                name="accounts_deletion_pending_idx",
+                condition=models.Q(completed_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Deletion of user {self.user_id} requested at {self.requested_at}"
+
+
+class UserStats(models.Model):
+    """
+    Running totals of a user's notes, journal entries and words, so
+    pages can show them by reading a single row. They're adjusted with
+    F() increments in the same transaction as each change to a note or
+    journal entry; see accounts.stats. Notes in the trash don't count.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    note_count = models.BigIntegerField(default=0)
+    journal_entry_count = models.BigIntegerField(default=0)
+    word_count = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name_plural = "user stats"
+
+    def __str__(self):
+        return f"Stats for user {self.user_id}"
@@ -0,0 +1,91 @@
+"""Signal handlers keeping per-user stats up to date."""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+from src.apps.notes.signals import notes_bulk_saved, notes_restored, notes_trashed
+
+from .deletion import deleting_account
+from .models import UserStats
+from .stats import adjust_stats, count_words, words_added
+
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def create_user_stats(sender, instance, created, raw=False, **kwargs):
+    # Users from before stats existed are counted on first use instead
+    if created and not raw:
+        UserStats.objects.create(user=instance)
+
+
+@receiver(post_save, sender=Note)
+def count_note_save(sender, instance, created, raw=False, **kwargs):
+    if not raw and instance.deleted_at is None:
+        adjust_stats(
+            instance.author_id,
+            note_count=int(created),
+            word_count=words_added(instance, created),
+        )
+
+
+@receiver(post_save, sender=JournalEntry)
+def count_journal_entry_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        adjust_stats(
+            instance.author_id,
+            journal_entry_count=int(created),
+            word_count=words_added(instance, created),
+        )
+
+
+@receiver(post_delete, sender=Note)
+def count_note_deletion(sender, instance, origin=None, **kwargs):
+    # Notes in the trash were taken off the totals when trashed, and
+    # deleted accounts take their stats with them
+    if not deleting_account(origin) and instance.deleted_at is None:
+        adjust_stats(
+            instance.author_id, note_count=-1, word_count=-count_words(instance.content)
+        )
+
+
+@receiver(post_delete, sender=JournalEntry)
+def count_journal_entry_deletion(sender, instance, origin=None, **kwargs):
+    if not deleting_account(origin):
+        adjust_stats(
+            instance.author_id,
+            journal_entry_count=-1,
+            word_count=-count_words(instance.content),
+        )
+
+
+@receiver(notes_bulk_saved)
+def count_bulk_note_save(sender, author_id, notes, created, **kwargs):
+    adjust_stats(
+        author_id,
+        note_count=len(notes) if created else 0,
+        word_count=sum(words_added(note, created) for note in notes),
+    )
+
+
+def count_notes(author_id, ids):
+    contents = Note.all_objects.filter(author_id=author_id, pk__in=ids).values_list(
+        "content", flat=True
+    )
+    return [count_words(content) for content in contents]
+
+
+@receiver(notes_trashed)
+def count_note_trashing(sender, author_id, ids, **kwargs):
+    words = count_notes(author_id, ids)
+    adjust_stats(author_id, note_count=-len(words), word_count=-sum(words))
+
+
+@receiver(notes_restored)
+def count_note_restoring(sender, author_id, ids, **kwargs):
+    words = count_notes(author_id, ids)
+    adjust_stats(author_id, note_count=len(words), word_count=sum(words))
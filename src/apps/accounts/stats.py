@@ -0,0 +1,132 @@
+"""
+Per-user stats, kept in step with notes and journal entries.
+
+Each change adds its difference to the user's UserStats row with a
+single UPDATE of F() expressions, inside the transaction making the
+change, so the totals commit or roll back with it and concurrent
+writers never lose each other's increments. The signal handlers in
+accounts.signals call adjust_stats for every write path.
+
+Anything that bypasses those paths, like raw SQL or a restored backup,
+can leave the totals out of step. reconcile_user_stats recounts a user
+from scratch and repairs their row; the reconcile_user_stats command
+runs it for every user.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from src.apps.common.text import count_words
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+
+from .constants import StatsConfig
+from .models import UserStats
+
+
+COUNTED_FIELDS = ("note_count", "journal_entry_count", "word_count")
+
+
+def words_added(instance, created):
+    """
+    Return the number of words a save added to a note or journal entry,
+    which is negative if it removed some. Edits are compared with the
+    word count the instance was loaded with, which then becomes the
+    baseline for its next save.
+    """
+    loaded = getattr(instance, "_loaded_word_count", None)
+    words = count_words(instance.content)
+
+    if created:
+        added = words
+    elif loaded is not None:
+        added = words - loaded
+    else:
+        # The old content was deferred or never loaded; leave any
+        # difference for reconcile_user_stats
+        added = 0
+
+    instance._loaded_word_count = words
+    return added
+
+
+def adjust_stats(user_id, **deltas):
+    """
+    Add deltas to the user's counters. A user without a stats row yet
+    is counted from scratch instead, which already takes in the change
+    being recorded, as long as it's called after the change is made.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    updated = UserStats.objects.filter(pk=user_id).update(
+        **{field: F(field) + delta for field, delta in deltas.items()},
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        reconcile_user_stats(user_id)
+
+
+def count_stats(user_id):
+    """
+    Count the user's totals from their notes and journal entries,
+    reading their content a chunk at a time.
+    """
+    totals = dict.fromkeys(COUNTED_FIELDS, 0)
+    counted = [
+        ("note_count", Note.objects.filter(author_id=user_id)),
+        ("journal_entry_count", JournalEntry.objects.filter(author_id=user_id)),
+    ]
+    for field, queryset in counted:
+        contents = queryset.order_by().values_list("content", flat=True).iterator(
+            StatsConfig.CHUNK_SIZE
+        )
+        for content in contents:
+            totals[field] += 1
+            totals["word_count"] += count_words(content)
+    return totals
+
+
+def reconcile_user_stats(user_id):
+    """
+    Recount the user's totals and repair their stats row if it's
+    missing or has drifted. Returns (stats, repaired).
+
+    The row is locked before counting, so writers committing in the
+    meantime apply their increments on top of the recount rather than
+    being overwritten by it.
+    """
+    with transaction.atomic():
+        stats = UserStats.objects.select_for_update().filter(pk=user_id).first()
+        totals = count_stats(user_id)
+
+        if stats is None:
+            try:
+                with transaction.atomic():
+                    stats = UserStats.objects.create(user_id=user_id, **totals)
+            except IntegrityError:
+                # Created by a concurrent recount, which counted the same rows
+                return UserStats.objects.get(pk=user_id), False
+            return stats, True
+
+        if all(getattr(stats, field) == total for field, total in totals.items()):
+            return stats, False
+
+        for field, total in totals.items():
+            setattr(stats, field, total)
+        stats.updated_at = timezone.now()
+        stats.save(update_fields=[*COUNTED_FIELDS, "updated_at"])
+        return stats, True
+
+
+def get_user_stats(user_id):
+    """
+    Return the user's stats row, counting them first if they don't
+    have one yet.
+    """
+    stats = UserStats.objects.filter(pk=user_id).first()
+    if stats is None:
+        stats, _ = reconcile_user_stats(user_id)
+    return stats
@@ -1,9 +1,25 @@
 """Tests for accounts app."""
 
+import io
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from src.apps.accounts.deletion import process_deletion, request_account_deletion
+from src.apps.accounts.models import AccountDeletion, UserStats
+from src.apps.accounts.stats import reconcile_user_stats
+from src.apps.common.testing import QueryBudgetMixin
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.batch import apply_batch
+from src.apps.notes.models import Note
+from src.apps.notes.trash import restore_notes, trash_notes
+from src.apps.sync.models import Tombstone
+
 
 User = get_user_model()
 
@@ -70,3 +86,245 @@ class SignOutViewTest(TestCase):
 
         # Should still redirect to front page
         self.assertRedirects(response, self.front_page_url)
+
+
+class AccountDeletionTest(TestCase):
+    """Tests for requesting and processing account deletion."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+        self.other_user = User.objects.create_user(
+            username="otheruser@example.com",
+            email="otheruser@example.com"
+        )
+        Note.objects.bulk_create(
+            Note(content=f"Note #{num}", author=self.user) for num in range(5)
+        )
+        JournalEntry.objects.bulk_create(
+            JournalEntry(content=f"Entry #{num}", author=self.user) for num in range(3)
+        )
+        Note.objects.create(content="Keep me", author=self.other_user)
+        self.delete_url = reverse("accounts:delete")
+
+    def test_request_disables_and_signs_out(self):
+        """Test that requesting deletion disables the account at once."""
+        self.client.force_login(self.user)
+
+        response = self.client.post(self.delete_url)
+
+        self.assertRedirects(response, reverse("pages:front"))
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertTrue(AccountDeletion.objects.filter(user=self.user).exists())
+        self.assertRedirects(self.client.get("/notes/"), "/")
+
+    def test_disabled_sessions_are_signed_out(self):
+        """Test that other sessions of a disabled user stop working."""
+        other_session = Client()
+        other_session.force_login(self.user)
+        request_account_deletion(self.user)
+
+        self.assertRedirects(other_session.get("/notes/"), "/")
+
+    def test_process_deletes_in_batches(self):
+        """Test that data is deleted in batches, progress recorded and the user deleted last."""
+        # Trashed notes go too
+        trash_notes(self.user.pk, Note.objects.filter(author=self.user).values_list("pk", flat=True)[:1])
+        deletion = request_account_deletion(self.user)
+
+        call_command("process_account_deletions", batch_size=2, pause=0, stdout=io.StringIO())
+
+        deletion.refresh_from_db()
+        self.assertIsNotNone(deletion.completed_at)
+        self.assertIsNone(deletion.user)
+        self.assertEqual(deletion.notes_deleted, 5)
+        self.assertEqual(deletion.journal_entries_deleted, 3)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Note.all_objects.filter(author_id=self.user.pk).exists())
+        self.assertFalse(Tombstone.objects.filter(author_id=self.user.pk).exists())
+        self.assertTrue(Note.objects.filter(author=self.other_user).exists())
+
+    def test_cascaded_deletes_skip_per_note_bookkeeping(self):
+        """Test that deleting a user directly doesn't bump the list version for each note."""
+        with patch("src.apps.notes.signals.invalidate_list") as invalidate_list:
+            self.user.delete()
+
+        invalidate_list.assert_not_called()
+        self.assertFalse(Note.all_objects.filter(author_id=self.user.pk).exists())
+
+    def test_admin_queues_deletion(self):
+        """Test that deleting a user in the admin queues it for the batched worker."""
+        admin_user = User.objects.create_superuser(
+            username="admin@example.com", email="admin@example.com"
+        )
+        self.client.force_login(admin_user)
+        url = reverse("admin:auth_user_delete", args=[self.user.pk])
+
+        self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.post(url, {"post": "yes"})
+
+        self.assertRedirects(response, reverse("admin:auth_user_changelist"))
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertTrue(AccountDeletion.objects.filter(user=self.user, completed_at=None).exists())
+        self.assertEqual(Note.all_objects.filter(author=self.user).count(), 5)
+
+    def test_batches_are_bounded(self):
+        """Test that no statement deletes more than one batch."""
+        deletion = request_account_deletion(self.user)
+
+        with CaptureQueriesContext(connection) as context:
+            process_deletion(deletion, batch_size=2, pause=0)
+
+        deletes = [query["sql"] for query in context.captured_queries if query["sql"].startswith("DELETE")]
+        note_deletes = [sql for sql in deletes if "notes_note" in sql]
+        self.assertEqual(len(note_deletes), 3)
+
+
+class UserStatsTest(QueryBudgetMixin, TestCase):
+    """Tests for per-user stats."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+
+    def assertStats(self, notes, journal_entries, words):
+        stats = UserStats.objects.get(pk=self.user.pk)
+        self.assertEqual(
+            (stats.note_count, stats.journal_entry_count, stats.word_count),
+            (notes, journal_entries, words),
+        )
+
+    def test_new_users_start_at_zero(self):
+        """Test that new users get an empty stats row."""
+        self.assertStats(0, 0, 0)
+
+    def test_note_create_edit_and_delete(self):
+        """Test that note writes adjust the counts and words."""
+        note = Note.objects.create(title="A title", content="one two three", author=self.user)
+        self.assertStats(1, 0, 3)
+
+        note = Note.objects.get(pk=note.pk)
+        note.content = "one two"
+        note.save()
+        self.assertStats(1, 0, 2)
+
+        note.content = "one two three four"
+        note.save()
+        self.assertStats(1, 0, 4)
+
+        note.delete()
+        self.assertStats(0, 0, 0)
+
+    def test_loaded_rows_keep_only_a_word_count(self):
+        """Test that loading a note keeps its word count for the next save, not its field values."""
+        Note.objects.create(title="A title", content="one two three", author=self.user)
+
+        note = Note.objects.get(author=self.user)
+        self.assertEqual(note._loaded_word_count, 3)
+        self.assertFalse(hasattr(note, "_loaded_values"))
+
+        deferred = Note.objects.defer("content").get(author=self.user)
+        self.assertFalse(hasattr(deferred, "_loaded_word_count"))
+
+    def test_journal_entry_create_edit_and_delete(self):
+        """Test that journal writes adjust the counts and words."""
+        entry = JournalEntry.objects.create(content="one two", author=self.user)
+        self.assertStats(0, 1, 2)
+
+        entry = JournalEntry.objects.get(pk=entry.pk)
+        entry.content = "one"
+        entry.save()
+        self.assertStats(0, 1, 1)
+
+        entry.delete()
+        self.assertStats(0, 0, 0)
+
+    def test_trashed_notes_are_not_counted(self):
+        """Test that trashing takes notes off the totals and restoring puts them back."""
+        note = Note.objects.create(content="one two", author=self.user)
+        Note.objects.create(content="three", author=self.user)
+
+        trash_notes(self.user.pk, [note.pk])
+        self.assertStats(1, 0, 1)
+
+        restore_notes(self.user.pk, [note.pk])
+        self.assertStats(2, 0, 3)
+
+        trash_notes(self.user.pk, [note.pk])
+        Note.all_objects.get(pk=note.pk).delete()
+        self.assertStats(1, 0, 1)
+
+    def test_trashing_counts_only_the_notes_it_trashes(self):
+        """Test that notes already in the trash, or back out of it, aren't counted again."""
+        note = Note.objects.create(content="one two", author=self.user)
+        other = Note.objects.create(content="three", author=self.user)
+
+        trash_notes(self.user.pk, [note.pk])
+        self.assertEqual(trash_notes(self.user.pk, [note.pk, other.pk]), 1)
+        self.assertStats(0, 0, 0)
+
+        restore_notes(self.user.pk, [note.pk])
+        self.assertEqual(restore_notes(self.user.pk, [note.pk, other.pk]), 1)
+        self.assertStats(2, 0, 3)
+
+    def test_batch_writes(self):
+        """Test that batch creates, updates and deletes are counted."""
+        note = Note.objects.create(content="one two", author=self.user)
+        other = Note.objects.create(content="three", author=self.user)
+
+        apply_batch(self.user, [
+            {"op": "create", "content": "four five six"},
+            {"op": "update", "id": str(note.pk), "content": "one"},
+            {"op": "delete", "id": str(other.pk)},
+        ])
+
+        self.assertStats(2, 0, 4)
+
+    def test_rolled_back_writes_are_not_counted(self):
+        """Test that stats roll back with the write that changed them."""
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            Note.objects.create(content="one two", author=self.user)
+            raise RuntimeError
+
+        self.assertStats(0, 0, 0)
+
+    def test_reconcile_repairs_drift(self):
+        """Test that the reconcile command recounts drifted and missing rows."""
+        Note.objects.create(content="one two", author=self.user)
+        JournalEntry.objects.create(content="three", author=self.user)
+        UserStats.objects.filter(pk=self.user.pk).update(note_count=7, word_count=0)
+        other_user = User.objects.create_user(username="otheruser@example.com")
+        UserStats.objects.filter(pk=other_user.pk).delete()
+
+        stdout = io.StringIO()
+        call_command("reconcile_user_stats", stdout=stdout)
+
+        self.assertStats(1, 1, 3)
+        self.assertTrue(UserStats.objects.filter(pk=other_user.pk).exists())
+        self.assertIn("Checked 2 users, repaired 2.", stdout.getvalue())
+        self.assertFalse(reconcile_user_stats(self.user.pk)[1])
+
+    def test_missing_row_is_counted_on_first_write(self):
+        """Test that users from before stats existed are counted from scratch."""
+        Note.objects.create(content="one two", author=self.user)
+        UserStats.objects.filter(pk=self.user.pk).delete()
+
+        JournalEntry.objects.create(content="three", author=self.user)
+
+        self.assertStats(1, 1, 3)
+
+    def test_stats_page(self):
+        """Test that the stats page shows the totals within its budget."""
+        Note.objects.create(content="one two", author=self.user)
+        self.client.force_login(self.user)
+
+        response, _ = self.assertWithinQueryBudget(reverse("accounts:stats"))
+
+        self.assertContains(response, "Words written")
+        self.assertContains(response, '<span class="badge">1</span>', html=True)
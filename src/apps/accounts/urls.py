@@ -1,9 +1,11 @@
 from django.urls import path
 
-from .views import SignOutView
+from .views import AccountDeleteView, SignOutView, StatsView
 
 app_name = "accounts"
 
 urlpatterns = [
-    path("logout/", SignOutView.as_view(), name="logout")
+    path("logout/", SignOutView.as_view(), name="logout"),
+    path("delete/", AccountDeleteView.as_view(), name="delete"),
+    path("stats/", StatsView.as_view(), name="stats"),
 ]
@@ -1,5 +1,15 @@
+from django.contrib import messages
+from django.contrib.auth import logout
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LogoutView
+from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.views.generic import TemplateView
+
+from src.apps.common.htmx import BoostedNavigationMixin
+
+from .constants import SuccessMessages
+from .deletion import request_account_deletion
 
 
 class SignOutView(LogoutView):
@@ -7,3 +17,34 @@ class SignOutView(LogoutView):
     View to sign out user and redirect to login page.
     """
     next_page = reverse_lazy("pages:front")
+
+
+class AccountDeleteView(LoginRequiredMixin, BoostedNavigationMixin, TemplateView):
+    """
+    View for deleting the user's account. The account is disabled and
+    the user signed out at once; their data is deleted in the
+    background, see accounts.deletion.
+    """
+    template_name = "accounts/delete.html"
+    redirect_field_name = None
+
+    # Session, user, disable, deletion lookup, insert, session delete
+    query_budget = 6
+
+    def post(self, request, *args, **kwargs):
+        request_account_deletion(request.user)
+        logout(request)
+        messages.success(request, SuccessMessages.ACCOUNT_DELETION_REQUESTED)
+        return redirect("pages:front")
+
+
+class StatsView(LoginRequiredMixin, BoostedNavigationMixin, TemplateView):
+    """
+    View for the user's stats, read from their stats row through the
+    user_stats context processor.
+    """
+    template_name = "accounts/stats.html"
+    redirect_field_name = None
+
+    # Session, user, stats
+    query_budget = 3
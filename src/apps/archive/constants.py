@@ -0,0 +1,69 @@
+"""Constants for the archive app."""
+
+
+class ExportConfig:
+    """
+    Export-related constants.
+    """
+    # Rows fetched per round trip from the server-side cursor
+    CURSOR_CHUNK_SIZE = 500
+
+    # Formats
+    MARKDOWN = "markdown"
+    JSONL = "jsonl"
+    FORMATS = (MARKDOWN, JSONL)
+
+    # Archive layout
+    FILENAME = "littlenote-{date}.{extension}"
+    NOTES_DIR = "notes"
+    JOURNAL_DIR = "journal"
+
+    # Written at the root of every Markdown export, so the importer can
+    # tell a Littlenote archive from any other zip of Markdown files
+    MANIFEST = "littlenote.json"
+    MANIFEST_VERSION = 1
+
+    # Range of zip member timestamps. Imported notes can be older or
+    # newer, and are stamped with the nearest one.
+    EARLIEST_ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+    LATEST_ZIP_DATE = (2107, 12, 31, 23, 59, 58)
+
+
+class ImportConfig:
+    """
+    Import-related constants.
+    """
+    # Notes inserted per bulk_create
+    BATCH_SIZE = 1000
+
+    # Largest uncompressed size, in bytes, of one file in a zip and of
+    # all of them together. Archives over either are rejected, so a
+    # small zip bomb can't exhaust a worker's memory.
+    MAX_MEMBER_SIZE = 10 * 1024 * 1024
+    MAX_ARCHIVE_SIZE = 500 * 1024 * 1024
+
+    # Formats
+    MARKDOWN_ZIP = "markdown"
+    ENEX = "enex"
+    FORMATS = (MARKDOWN_ZIP, ENEX)
+
+
+class SuccessMessages:
+    """
+    User-facing success message constants.
+    """
+    NOTES_IMPORTED = "Imported {count} notes."
+
+
+class ErrorMessages:
+    """
+    User-facing error message constants.
+    """
+    MISSING_FILE = "Please choose a file to import."
+
+
+class TemplatePaths:
+    """
+    Template-related constants.
+    """
+    ARCHIVE = "archive/archive.html"
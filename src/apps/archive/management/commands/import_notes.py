@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from ...constants import ImportConfig
+from ...utils.importers import ArchiveImportError, detect_format, import_notes
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Import notes for a user from a Markdown zip or an Evernote ENEX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("email", help="Email address of the user who will own the notes.")
+        parser.add_argument("path", help="Path to a .zip of Markdown files or an .enex export.")
+        parser.add_argument(
+            "--format",
+            choices=ImportConfig.FORMATS,
+            help="Archive format. Detected from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ImportConfig.BATCH_SIZE,
+            help="Notes inserted per bulk_create.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options["email"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['email']}.")
+
+        def report(count):
+            self.stdout.write(f"\rImported {count} notes...", ending="")
+            self.stdout.flush()
+
+        try:
+            import_format = options["format"] or detect_format(options["path"])
+            with open(options["path"], "rb") as fileobj:
+                count = import_notes(
+                    user,
+                    fileobj,
+                    import_format,
+                    batch_size=options["batch_size"],
+                    progress=report,
+                )
+        except (ArchiveImportError, OSError) as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(f"Imported {count} notes for {user.email}."))
@@ -0,0 +1,23 @@
+// Pages are swapped in by boosted navigation, so set up the import
+// form whenever content containing it is loaded.
+htmx.onLoad((content) => {
+    const importForm = content.matches("#import_form")
+        ? content
+        : content.querySelector("#import_form");
+    const importProgress = document.getElementById("import_progress");
+
+    if (!importForm || !importProgress) {
+        return;
+    }
+
+    importForm.addEventListener("htmx:xhr:progress", (e) => {
+        importProgress.hidden = false;
+
+        if (e.detail.loaded < e.detail.total) {
+            importProgress.value = (e.detail.loaded / e.detail.total) * 100;
+        } else {
+            // Upload done; show an indeterminate bar while notes are inserted.
+            importProgress.removeAttribute("value");
+        }
+    });
+});
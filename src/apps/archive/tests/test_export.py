@@ -0,0 +1,82 @@
+"""Unit tests for export utilities."""
+
+import datetime
+import uuid
+import zipfile
+
+from django.test import SimpleTestCase
+
+from src.apps.archive.utils.export import (
+    StreamBuffer,
+    note_filename,
+    note_to_markdown,
+    render_front_matter,
+)
+
+
+class StreamBufferTest(SimpleTestCase):
+    """
+    Unit tests for the StreamBuffer class.
+    """
+    def test_drain_returns_written_bytes_once(self):
+        """
+        Test that drain returns everything written since the last
+        drain, and nothing more.
+        """
+        buffer = StreamBuffer()
+        buffer.write(b"abc")
+        buffer.write(b"def")
+        self.assertEqual(buffer.drain(), b"abcdef")
+        self.assertEqual(buffer.drain(), b"")
+        self.assertEqual(buffer.tell(), 6)
+
+    def test_zipfile_treats_buffer_as_stream(self):
+        """
+        Test that zipfile can write to the buffer without seeking.
+        """
+        buffer = StreamBuffer()
+        with zipfile.ZipFile(buffer, mode="w") as archive:
+            archive.writestr("hello.md", "Hello")
+        self.assertTrue(buffer.drain().startswith(b"PK"))
+
+
+class MarkdownRenderingTest(SimpleTestCase):
+    """
+    Unit tests for the Markdown rendering helpers.
+    """
+    def setUp(self):
+        timestamp = datetime.datetime(2025, 9, 1, 12, 30, tzinfo=datetime.timezone.utc)
+        self.note = {
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "title": 'A "quoted" title',
+            "content": "# Body",
+            "created_at": timestamp,
+            "modified_at": timestamp,
+        }
+
+    def test_front_matter_escapes_values(self):
+        """
+        Test that front matter values are quoted and escaped.
+        """
+        front_matter = render_front_matter({"title": self.note["title"]})
+        self.assertIn('title: "A \\"quoted\\" title"', front_matter)
+
+    def test_note_markdown_ends_with_content(self):
+        """
+        Test that the rendered note keeps its content after the front
+        matter.
+        """
+        text = note_to_markdown(self.note)
+        self.assertTrue(text.startswith("---\n"))
+        self.assertIn('created_at: "2025-09-01T12:30:00+00:00"', text)
+        self.assertTrue(text.endswith("---\n\n# Body"))
+
+    def test_note_filename_falls_back_for_untitled_notes(self):
+        """
+        Test that untitled notes still get a readable filename.
+        """
+        self.note["title"] = ""
+        self.assertEqual(
+            note_filename(self.note),
+            "notes/note-12345678-1234-5678-1234-567812345678.md"
+        )
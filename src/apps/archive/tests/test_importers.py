@@ -0,0 +1,237 @@
+"""Tests for import utilities and the import_notes command."""
+
+import datetime
+import io
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from src.apps.archive.constants import ImportConfig
+from src.apps.archive.utils.export import stream_markdown_zip
+from src.apps.archive.utils.importers import (
+    ArchiveImportError,
+    detect_format,
+    enml_to_text,
+    import_notes,
+    iter_enex,
+    markdown_to_record,
+)
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+
+
+User = get_user_model()
+
+ENEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE en-export SYSTEM "http://xml.evernote.com/pub/evernote-export3.dtd">
+<en-export export-date="20250101T000000Z" application="Evernote">
+    <note>
+        <title>Groceries</title>
+        <content><![CDATA[<?xml version="1.0" encoding="UTF-8"?><en-note><div>Buy:</div><ul><li>Milk</li><li>Eggs</li></ul></en-note>]]></content>
+        <created>20240102T030405Z</created>
+        <resource><data encoding="base64">aGVsbG8=</data></resource>
+    </note>
+    <note>
+        <title>Second</title>
+        <content><![CDATA[<en-note><p>Hello</p></en-note>]]></content>
+    </note>
+</en-export>
+"""
+
+
+def build_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, mode="w") as archive:
+        for name, text in files.items():
+            archive.writestr(name, text)
+    buffer.seek(0)
+    return buffer
+
+
+class MarkdownRecordTest(SimpleTestCase):
+    """
+    Unit tests for Markdown parsing.
+    """
+    def test_title_from_front_matter(self):
+        """
+        Test that front matter provides the title and created_at.
+        """
+        record = markdown_to_record(
+            "notes/a.md",
+            '---\ntitle: "Hello"\ncreated_at: "2024-01-02T03:04:05+00:00"\n---\n\nBody'
+        )
+        self.assertEqual(record["title"], "Hello")
+        self.assertEqual(record["content"], "Body")
+        self.assertEqual(record["created_at"].year, 2024)
+
+    def test_title_from_heading(self):
+        """
+        Test that a leading heading becomes the title.
+        """
+        record = markdown_to_record("a.md", "# Heading\n\nBody")
+        self.assertEqual(record["title"], "Heading")
+        self.assertEqual(record["content"], "Body")
+
+    def test_title_from_filename(self):
+        """
+        Test that the filename is the title of last resort.
+        """
+        record = markdown_to_record("folder/My idea.md", "Body")
+        self.assertEqual(record["title"], "My idea")
+        self.assertIsNone(record["created_at"])
+
+    def test_detect_format(self):
+        """
+        Test that formats are detected from file extensions.
+        """
+        self.assertEqual(detect_format("export.ZIP"), ImportConfig.MARKDOWN_ZIP)
+        self.assertEqual(detect_format("export.enex"), ImportConfig.ENEX)
+        with self.assertRaises(ArchiveImportError):
+            detect_format("export.pdf")
+
+
+class EnexTest(SimpleTestCase):
+    """
+    Unit tests for ENEX parsing.
+    """
+    def test_enml_to_text_keeps_structure(self):
+        """
+        Test that ENML blocks and list items become lines.
+        """
+        text = enml_to_text("<en-note><div>Buy:</div><ul><li>Milk</li><li>Eggs</li></ul></en-note>")
+        self.assertEqual(text, "Buy:\n- Milk\n- Eggs")
+
+    def test_iter_enex_yields_each_note(self):
+        """
+        Test that each <note> element produces a record.
+        """
+        records = list(iter_enex(io.BytesIO(ENEX)))
+        self.assertEqual([r["title"] for r in records], ["Groceries", "Second"])
+        self.assertEqual(
+            records[0]["created_at"],
+            datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+        )
+        self.assertIsNone(records[1]["created_at"])
+
+    def test_iter_enex_rejects_invalid_xml(self):
+        """
+        Test that malformed XML raises ArchiveImportError.
+        """
+        with self.assertRaises(ArchiveImportError):
+            list(iter_enex(io.BytesIO(b"<en-export><note>")))
+
+
+class ImportNotesTest(TestCase):
+    """
+    Integration tests for import_notes.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+
+    def test_import_in_batches_reports_progress(self):
+        """
+        Test that notes are inserted in batches and progress is
+        reported after each one.
+        """
+        files = {f"note-{num}.md": f"# Note {num}\n\nBody" for num in range(5)}
+        reported = []
+
+        count = import_notes(
+            self.user,
+            build_zip(files),
+            ImportConfig.MARKDOWN_ZIP,
+            batch_size=2,
+            progress=reported.append,
+        )
+
+        self.assertEqual(count, 5)
+        self.assertEqual(reported, [2, 4, 5])
+        self.assertEqual(Note.objects.filter(author=self.user).count(), 5)
+
+    @patch.object(ImportConfig, "MAX_MEMBER_SIZE", 1024)
+    def test_import_rejects_oversized_files(self):
+        """
+        Test that a zip holding a file that decompresses past the limit
+        is rejected without importing anything.
+        """
+        files = {"small.md": "# Small\n\nBody", "large.md": "a" * 1025}
+
+        with self.assertRaises(ArchiveImportError):
+            import_notes(self.user, build_zip(files), ImportConfig.MARKDOWN_ZIP)
+        self.assertFalse(Note.objects.filter(author=self.user).exists())
+
+    @patch.object(ImportConfig, "MAX_ARCHIVE_SIZE", 1024)
+    def test_import_rejects_oversized_archives(self):
+        """
+        Test that a zip whose files together decompress past the limit
+        is rejected.
+        """
+        files = {f"note-{num}.md": "a" * 600 for num in range(2)}
+
+        with self.assertRaises(ArchiveImportError):
+            import_notes(self.user, build_zip(files), ImportConfig.MARKDOWN_ZIP)
+        self.assertFalse(Note.objects.filter(author=self.user).exists())
+
+    def test_import_keeps_original_timestamps(self):
+        """
+        Test that imported ENEX notes keep their creation date.
+        """
+        import_notes(self.user, io.BytesIO(ENEX), ImportConfig.ENEX)
+        note = Note.objects.get(title="Groceries")
+        self.assertEqual(note.created_at.year, 2024)
+
+    def test_export_round_trip(self):
+        """
+        Test that a Markdown export can be imported again.
+        """
+        Note.objects.create(title="Round trip", content="There and back", author=self.user)
+        archive = io.BytesIO(b"".join(stream_markdown_zip(self.user)))
+        Note.objects.all().delete()
+
+        import_notes(self.user, archive, ImportConfig.MARKDOWN_ZIP)
+        note = Note.objects.get(author=self.user)
+        self.assertEqual(note.title, "Round trip")
+        self.assertEqual(note.content, "There and back")
+
+    def test_export_round_trip_skips_journal_entries(self):
+        """
+        Test that journal entries in a Markdown export aren't imported
+        as notes.
+        """
+        JournalEntry.objects.create(content="Dear diary", author=self.user)
+        archive = io.BytesIO(b"".join(stream_markdown_zip(self.user)))
+
+        count = import_notes(self.user, archive, ImportConfig.MARKDOWN_ZIP)
+        self.assertEqual(count, 0)
+        self.assertFalse(Note.objects.filter(author=self.user).exists())
+
+    def test_import_keeps_journal_folder_of_other_archives(self):
+        """
+        Test that a journal folder in a zip that isn't a Littlenote
+        export is imported like any other.
+        """
+        files = {"journal/monday.md": "# Monday\n\nBody", "ideas.md": "# Ideas\n\nBody"}
+
+        count = import_notes(self.user, build_zip(files), ImportConfig.MARKDOWN_ZIP)
+        self.assertEqual(count, 2)
+        self.assertTrue(Note.objects.filter(author=self.user, title="Monday").exists())
+
+    def test_import_command(self):
+        """
+        Test that the import_notes command imports a file from disk.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".enex") as fileobj:
+            fileobj.write(ENEX)
+            fileobj.flush()
+            out = io.StringIO()
+            call_command("import_notes", self.user.email, fileobj.name, stdout=out)
+
+        self.assertIn("Imported 2 notes", out.getvalue())
+        self.assertEqual(Note.objects.filter(author=self.user).count(), 2)
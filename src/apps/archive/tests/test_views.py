@@ -0,0 +1,264 @@
+"""Integration tests for archive views."""
+
+import datetime
+import io
+import json
+import warnings
+import zipfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+
+
+User = get_user_model()
+
+
+class ArchiveTestCase(TestCase):
+    """
+    Extended class for archive tests. Includes creation of two users,
+    each with their own notes and journal entries.
+    """
+    def setUp(self):
+        self.test_user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+        self.strange_user = User.objects.create_user(
+            username="strangeuser@example.com",
+            email="strangeuser@example.com"
+        )
+
+        for num in range(1, 4):
+            Note.objects.create(
+                title=f"Test note #{num}",
+                content="Hello, test user!",
+                author=self.test_user
+            )
+
+        JournalEntry.objects.create(content="Dear diary", author=self.test_user)
+        Note.objects.create(
+            title="Strange note",
+            content="Hello, stranger!",
+            author=self.strange_user
+        )
+
+        self.markdown_export_url = reverse("archive:export", args=["markdown"])
+        self.jsonl_export_url = reverse("archive:export", args=["jsonl"])
+
+
+class ArchivePageTests(ArchiveTestCase):
+    """
+    Integration tests for the archive page.
+    """
+    def test_archive_redirects_unauthenticated_users(self):
+        """
+        Test that unauthenticated users are redirected to the front
+        page.
+        """
+        response = self.client.get(reverse("archive:home"))
+        self.assertRedirects(response, "/")
+
+    def test_archive_links_to_exports(self):
+        """
+        Test that the archive page links to both export formats.
+        """
+        self.client.force_login(self.test_user)
+        response = self.client.get(reverse("archive:home"))
+        self.assertContains(response, self.markdown_export_url)
+        self.assertContains(response, self.jsonl_export_url)
+
+
+class ExportTests(ArchiveTestCase):
+    """
+    Integration tests for the export view.
+    """
+    def _read_zip(self, response):
+        content = b"".join(response.streaming_content)
+        return zipfile.ZipFile(io.BytesIO(content))
+
+    def test_export_redirects_unauthenticated_users(self):
+        """
+        Test that unauthenticated users are redirected to the front
+        page.
+        """
+        response = self.client.get(self.markdown_export_url)
+        self.assertRedirects(response, "/")
+
+    def test_export_is_streamed_as_attachment(self):
+        """
+        Test that the export is a streaming download.
+        """
+        self.client.force_login(self.test_user)
+        response = self.client.get(self.markdown_export_url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertIn("attachment", response["Content-Disposition"])
+
+    def test_markdown_export_contains_one_file_per_row(self):
+        """
+        Test that the zip holds one Markdown file per note and journal
+        entry, and nothing that belongs to strangers.
+        """
+        self.client.force_login(self.test_user)
+        archive = self._read_zip(self.client.get(self.markdown_export_url))
+        names = archive.namelist()
+
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(len([n for n in names if n.startswith("notes/")]), 3)
+        self.assertEqual(len([n for n in names if n.startswith("journal/")]), 1)
+        self.assertIn("littlenote.json", names)
+
+        contents = "".join(archive.read(name).decode() for name in names)
+        self.assertNotIn("Strange note", contents)
+
+    def test_markdown_export_of_notes_older_than_zip_dates(self):
+        """
+        Test that notes from before 1980, which zip timestamps can't
+        hold, are exported with the earliest one instead.
+        """
+        created_at = datetime.datetime(1975, 6, 1, tzinfo=datetime.timezone.utc)
+        Note.objects.filter(title="Test note #1").update(created_at=created_at)
+
+        self.client.force_login(self.test_user)
+        archive = self._read_zip(self.client.get(self.markdown_export_url))
+        note = Note.objects.get(title="Test note #1")
+        member = next(m for m in archive.infolist() if str(note.id) in m.filename)
+
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(member.date_time, (1980, 1, 1, 0, 0, 0))
+        self.assertIn('created_at: "1975-06-01T00:00:00+00:00"', archive.read(member).decode())
+
+    def test_markdown_export_has_front_matter(self):
+        """
+        Test that each note file starts with front matter holding its
+        title and timestamps.
+        """
+        self.client.force_login(self.test_user)
+        archive = self._read_zip(self.client.get(self.markdown_export_url))
+        note = Note.objects.get(title="Test note #1")
+        name = next(n for n in archive.namelist() if str(note.id) in n)
+        text = archive.read(name).decode()
+
+        self.assertTrue(text.startswith("---\n"))
+        self.assertIn('title: "Test note #1"', text)
+        self.assertIn(f'created_at: "{note.created_at.isoformat()}"', text)
+        self.assertIn(f'modified_at: "{note.modified_at.isoformat()}"', text)
+        self.assertTrue(text.endswith("Hello, test user!"))
+
+    def test_jsonl_export_contains_one_line_per_row(self):
+        """
+        Test that the JSONL export holds one record per note and
+        journal entry.
+        """
+        self.client.force_login(self.test_user)
+        response = self.client.get(self.jsonl_export_url)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        records = [json.loads(line) for line in lines]
+
+        self.assertEqual([r["type"] for r in records].count("note"), 3)
+        self.assertEqual([r["type"] for r in records].count("journal_entry"), 1)
+        self.assertNotIn("Strange note", [r.get("title") for r in records])
+
+    async def _read_async(self, url):
+        await self.async_client.aforce_login(self.test_user)
+        response = await self.async_client.get(url)
+
+        # Read the way the ASGI handler does, which warns if it has to
+        # collect a synchronous stream before sending it
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            content = b"".join([chunk async for chunk in response])
+
+        self.assertEqual([str(w.message) for w in caught], [])
+        return content
+
+    async def test_markdown_export_is_streamed_under_asgi(self):
+        """
+        Test that under ASGI the zip is streamed chunk by chunk, with no
+        warning that it was read into memory first.
+        """
+        content = await self._read_async(self.markdown_export_url)
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(len(archive.namelist()), 5)
+
+    async def test_jsonl_export_is_streamed_under_asgi(self):
+        """
+        Test that under ASGI the JSONL export is streamed chunk by
+        chunk, with no warning that it was read into memory first.
+        """
+        content = await self._read_async(self.jsonl_export_url)
+        self.assertEqual(len(content.decode().splitlines()), 4)
+
+    def test_unknown_format_returns_404(self):
+        """
+        Test that an unsupported export format returns a 404.
+        """
+        self.client.force_login(self.test_user)
+        response = self.client.get(reverse("archive:export", args=["pdf"]))
+        self.assertEqual(response.status_code, 404)
+
+
+class ImportTests(ArchiveTestCase):
+    """
+    Integration tests for the import view.
+    """
+    def setUp(self):
+        super().setUp()
+        self.import_url = reverse("archive:import")
+
+    def _upload(self, name, content):
+        return SimpleUploadedFile(name, content)
+
+    def test_import_redirects_unauthenticated_users(self):
+        """
+        Test that unauthenticated users cannot import notes.
+        """
+        response = self.client.post(self.import_url)
+        self.assertRedirects(response, "/")
+
+    def test_import_creates_notes_for_user(self):
+        """
+        Test that an uploaded Markdown zip creates notes owned by the
+        logged-in user.
+        """
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, mode="w") as archive:
+            archive.writestr("imported.md", "# Imported note\n\nFrom elsewhere")
+
+        self.client.force_login(self.test_user)
+        response = self.client.post(self.import_url, {
+            "archive": self._upload("notes.zip", buffer.getvalue())
+        })
+
+        self.assertRedirects(response, reverse("archive:home"))
+        note = Note.objects.get(title="Imported note")
+        self.assertEqual(note.author, self.test_user)
+
+    def test_import_rejects_unsupported_file(self):
+        """
+        Test that unsupported files show an error and import nothing.
+        """
+        self.client.force_login(self.test_user)
+        response = self.client.post(self.import_url, {
+            "archive": self._upload("notes.pdf", b"%PDF")
+        }, follow=True)
+        self.assertContains(response, "Unsupported file type")
+        self.assertEqual(Note.objects.filter(author=self.test_user).count(), 3)
+
+    def test_htmx_import_uses_hx_redirect(self):
+        """
+        Test that HTMX uploads are redirected with HX-Redirect.
+        """
+        self.client.force_login(self.test_user)
+        response = self.client.post(
+            self.import_url,
+            {"archive": self._upload("notes.enex", b"<en-export></en-export>")},
+            headers={"HX-Request": "true"},
+        )
+        self.assertEqual(response["HX-Redirect"], reverse("archive:home"))
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from .views import ArchiveView, ExportView, ImportView
+
+app_name = "archive"
+
+urlpatterns = [
+    path("", ArchiveView.as_view(), name="home"),
+    path("export/<str:format>/", ExportView.as_view(), name="export"),
+    path("import/", ImportView.as_view(), name="import"),
+]
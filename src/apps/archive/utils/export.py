@@ -0,0 +1,213 @@
+"""Streaming export of a user's notes and journal entries."""
+
+import json
+import zipfile
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from django.utils.text import slugify
+
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+
+from ..constants import ExportConfig
+
+
+NOTE_FIELDS = ("id", "title", "content", "created_at", "modified_at")
+JOURNAL_ENTRY_FIELDS = ("id", "content", "created_at")
+
+
+class StreamBuffer:
+    """
+    Write-only file object that holds zip output until it is drained.
+
+    It deliberately has no seek(), so zipfile treats it as a stream and
+    writes data descriptors instead of rewinding to patch headers.
+    """
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """
+        Return everything written since the last drain.
+        """
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_notes(user):
+    """
+    Iterate over the user's notes through a server-side cursor.
+    """
+    return (
+        Note.objects.filter(author=user)
+        .order_by("created_at")
+        .values(*NOTE_FIELDS)
+        .iterator(chunk_size=ExportConfig.CURSOR_CHUNK_SIZE)
+    )
+
+
+def iter_journal_entries(user):
+    """
+    Iterate over the user's journal entries through a server-side
+    cursor.
+    """
+    return (
+        JournalEntry.objects.filter(author=user)
+        .order_by("created_at")
+        .values(*JOURNAL_ENTRY_FIELDS)
+        .iterator(chunk_size=ExportConfig.CURSOR_CHUNK_SIZE)
+    )
+
+
+def render_front_matter(fields):
+    """
+    Render a front matter block. Values are JSON-encoded, which keeps
+    them valid YAML scalars.
+    """
+    lines = ["---"]
+    for key, value in fields.items():
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        lines.append(f"{key}: {json.dumps(str(value))}")
+    lines.append("---")
+    return "\n".join(lines) + "\n\n"
+
+
+def note_to_markdown(note):
+    """
+    Render a note row as a Markdown document with front matter.
+    """
+    front_matter = render_front_matter({
+        "id": note["id"],
+        "title": note["title"],
+        "created_at": note["created_at"],
+        "modified_at": note["modified_at"],
+    })
+    return front_matter + note["content"]
+
+
+def journal_entry_to_markdown(entry):
+    """
+    Render a journal entry row as a Markdown document with front
+    matter.
+    """
+    front_matter = render_front_matter({
+        "id": entry["id"],
+        "created_at": entry["created_at"],
+    })
+    return front_matter + entry["content"]
+
+
+def note_filename(note):
+    """
+    Archive path for a note, unique thanks to the note ID.
+    """
+    slug = slugify(note["title"])[:50] or "note"
+    return f"{ExportConfig.NOTES_DIR}/{slug}-{note['id']}.md"
+
+
+def journal_entry_filename(entry):
+    """
+    Archive path for a journal entry.
+    """
+    date = entry["created_at"].strftime("%Y-%m-%d")
+    return f"{ExportConfig.JOURNAL_DIR}/{date}-{entry['id']}.md"
+
+
+def render_manifest():
+    """
+    Describe the archive's layout, marking it as a Littlenote export.
+    """
+    return json.dumps({
+        "version": ExportConfig.MANIFEST_VERSION,
+        "notes": ExportConfig.NOTES_DIR,
+        "journal": ExportConfig.JOURNAL_DIR,
+    })
+
+
+def _write_member(archive, filename, timestamp, text):
+    date_time = min(
+        max(timestamp.timetuple()[:6], ExportConfig.EARLIEST_ZIP_DATE),
+        ExportConfig.LATEST_ZIP_DATE,
+    )
+    member = zipfile.ZipInfo(filename, date_time=date_time)
+    member.compress_type = zipfile.ZIP_DEFLATED
+    archive.writestr(member, text.encode("utf-8"))
+
+
+def stream_markdown_zip(user):
+    """
+    Yield a zip archive of the user's notes and journal entries, one
+    Markdown file per row. Only one row is held in memory at a time.
+    """
+    buffer = StreamBuffer()
+
+    with zipfile.ZipFile(buffer, mode="w") as archive:
+        _write_member(archive, ExportConfig.MANIFEST, timezone.now(), render_manifest())
+
+        for note in iter_notes(user):
+            _write_member(archive, note_filename(note), note["created_at"], note_to_markdown(note))
+            yield buffer.drain()
+
+        for entry in iter_journal_entries(user):
+            _write_member(
+                archive,
+                journal_entry_filename(entry),
+                entry["created_at"],
+                journal_entry_to_markdown(entry),
+            )
+            yield buffer.drain()
+
+    # Central directory is written on close
+    yield buffer.drain()
+
+
+def _to_json_line(kind, row):
+    record = {"type": kind}
+    for key, value in row.items():
+        record[key] = value.isoformat() if hasattr(value, "isoformat") else str(value)
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def stream_jsonl(user):
+    """
+    Yield the user's notes and journal entries as JSON lines.
+    """
+    for note in iter_notes(user):
+        yield _to_json_line("note", note)
+
+    for entry in iter_journal_entries(user):
+        yield _to_json_line("journal_entry", entry)
+
+
+async def aiterate(chunks):
+    """
+    Yield from a synchronous stream without blocking the event loop, so
+    ASGI servers send each chunk as it is made instead of collecting the
+    whole stream first. Every step runs in the request's thread, where
+    the stream's database cursor was opened.
+    """
+    chunks = iter(chunks)
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    end = object()
+
+    try:
+        while (chunk := await next_chunk(chunks, end)) is not end:
+            yield chunk
+    finally:
+        # Closes the cursor and zip file if the client goes away early
+        await sync_to_async(chunks.close, thread_sensitive=True)()
@@ -0,0 +1,257 @@
+"""Streaming import of notes from Markdown archives and Evernote exports."""
+
+import datetime
+import html
+import json
+import re
+import zipfile
+from pathlib import PurePosixPath
+from xml.etree.ElementTree import iterparse
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from src.apps.notes.cache import invalidate_list
+from src.apps.notes.models import Note
+from src.apps.notes.signals import notes_bulk_saved
+
+from ..constants import ExportConfig, ImportConfig
+
+
+FRONT_MATTER_PATTERN = re.compile(r"\A---\n(.*?)\n---\n\n?", re.DOTALL)
+HEADING_PATTERN = re.compile(r"\A#\s+(.+)\n+")
+
+# ENML conversion
+LIST_ITEM_PATTERN = re.compile(r"<li\b[^>]*>", re.IGNORECASE)
+BLOCK_TAG_PATTERN = re.compile(r"<(?:div|p|br|h[1-6]|tr)\b[^>]*>", re.IGNORECASE)
+MARKUP_PATTERN = re.compile(r"<[^>]+>")
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+
+
+class ArchiveImportError(Exception):
+    """
+    Raised when an uploaded archive cannot be read.
+    """
+
+
+def detect_format(filename):
+    """
+    Guess the import format from a filename.
+    """
+    suffix = PurePosixPath(filename).suffix.lower()
+    if suffix == ".zip":
+        return ImportConfig.MARKDOWN_ZIP
+    if suffix == ".enex":
+        return ImportConfig.ENEX
+    raise ArchiveImportError(f"Unsupported file type: {filename}")
+
+
+def parse_front_matter(text):
+    """
+    Split a Markdown document into its front matter fields and body.
+    Values may be JSON-quoted (as written by the exporter) or bare.
+    """
+    match = FRONT_MATTER_PATTERN.match(text)
+    if not match:
+        return {}, text
+
+    fields = {}
+    for line in match.group(1).splitlines():
+        key, separator, value = line.partition(":")
+        if not separator:
+            continue
+        value = value.strip()
+        try:
+            value = json.loads(value)
+        except ValueError:
+            pass
+        fields[key.strip()] = str(value)
+
+    return fields, text[match.end():]
+
+
+def parse_timestamp(value):
+    """
+    Parse an ISO 8601 timestamp, returning None if it is missing or
+    malformed.
+    """
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        return None
+    if parsed and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, datetime.timezone.utc)
+    return parsed
+
+
+def markdown_to_record(filename, text):
+    """
+    Build a note record from a Markdown document. The title comes from
+    front matter, a leading heading, or the filename, in that order.
+    """
+    fields, body = parse_front_matter(text)
+    title = fields.get("title")
+
+    if title is None:
+        heading = HEADING_PATTERN.match(body)
+        if heading:
+            title = heading.group(1).strip()
+            body = body[heading.end():]
+        else:
+            title = PurePosixPath(filename).stem
+
+    return {
+        "title": title,
+        "content": body,
+        "created_at": parse_timestamp(fields.get("created_at")),
+    }
+
+
+def iter_markdown_zip(fileobj):
+    """
+    Yield note records from a zip of Markdown files, reading one member
+    at a time. Journal files are skipped if the zip is a Littlenote
+    export, which carries a manifest; in any other zip, a journal
+    folder is the user's own and is imported like the rest.
+    """
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile as exc:
+        raise ArchiveImportError("The uploaded file is not a valid zip archive.") from exc
+
+    total_size = 0
+    with archive:
+        is_export = ExportConfig.MANIFEST in archive.namelist()
+        for member in archive.infolist():
+            path = PurePosixPath(member.filename)
+            if member.is_dir() or path.suffix.lower() not in (".md", ".markdown", ".txt"):
+                continue
+            if is_export and path.parts[0] == ExportConfig.JOURNAL_DIR:
+                continue
+
+            data = read_member(archive, member)
+            total_size += len(data)
+            if total_size > ImportConfig.MAX_ARCHIVE_SIZE:
+                raise ArchiveImportError("The uploaded archive is too large to import.")
+
+            yield markdown_to_record(member.filename, data.decode("utf-8", errors="replace"))
+
+
+def read_member(archive, member):
+    """
+    Read one file from a zip, refusing files larger than
+    ImportConfig.MAX_MEMBER_SIZE, and never decompressing more than
+    that whatever the zip's header says.
+    """
+    error = f"{member.filename} is too large to import."
+    if member.file_size > ImportConfig.MAX_MEMBER_SIZE:
+        raise ArchiveImportError(error)
+
+    with archive.open(member) as file:
+        data = file.read(ImportConfig.MAX_MEMBER_SIZE + 1)
+    if len(data) > ImportConfig.MAX_MEMBER_SIZE:
+        raise ArchiveImportError(error)
+    return data
+
+
+def enml_to_text(enml):
+    """
+    Convert Evernote's ENML (an XHTML subset) to plain Markdown-ish
+    text, keeping line structure and dropping all other markup.
+    """
+    text = LIST_ITEM_PATTERN.sub("\n- ", enml or "")
+    text = BLOCK_TAG_PATTERN.sub("\n", text)
+    text = html.unescape(MARKUP_PATTERN.sub("", text))
+    return BLANK_LINES_PATTERN.sub("\n\n", text).strip()
+
+
+def parse_enex_timestamp(value):
+    """
+    Parse an ENEX timestamp such as 20250101T120000Z.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.strptime(value, "%Y%m%dT%H%M%SZ")
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+def iter_enex(fileobj):
+    """
+    Yield note records from an Evernote ENEX export. The XML is parsed
+    incrementally and each <note> is discarded once it has been read,
+    so attachments never accumulate in memory.
+    """
+    root = None
+
+    try:
+        for event, element in iterparse(fileobj, events=("start", "end")):
+            if root is None:
+                root = element
+            if event != "end" or element.tag != "note":
+                continue
+
+            yield {
+                "title": element.findtext("title", default=""),
+                "content": enml_to_text(element.findtext("content")),
+                "created_at": parse_enex_timestamp(element.findtext("created")),
+            }
+
+            element.clear()
+            root.clear()
+    except SyntaxError as exc:
+        raise ArchiveImportError("The uploaded file is not a valid ENEX export.") from exc
+
+
+READERS = {
+    ImportConfig.MARKDOWN_ZIP: iter_markdown_zip,
+    ImportConfig.ENEX: iter_enex,
+}
+
+
+def import_notes(user, fileobj, import_format, batch_size=ImportConfig.BATCH_SIZE, progress=None):
+    """
+    Import notes for a user from an archive, inserting them with one
+    bulk_create per batch inside a single transaction. Calls
+    progress(count) after each batch and returns the number of notes
+    imported.
+    """
+    records = READERS[import_format](fileobj)
+    batch = []
+    count = 0
+
+    def flush():
+        nonlocal count
+        Note.objects.bulk_create(batch, batch_size=batch_size)
+        notes_bulk_saved.send(sender=Note, author_id=user.pk, notes=list(batch), created=True)
+        count += len(batch)
+        batch.clear()
+        if progress:
+            progress(count)
+
+    now = timezone.now()
+    with transaction.atomic():
+        for record in records:
+            if not record["content"] and not record["title"]:
+                continue
+            batch.append(Note(
+                author=user,
+                title=record["title"],
+                content=record["content"],
+                created_at=record["created_at"] or now,
+            ))
+            if len(batch) >= batch_size:
+                flush()
+
+        if batch:
+            flush()
+
+        # bulk_create doesn't send post_save
+        invalidate_list(user.pk)
+
+    return count
@@ -0,0 +1,80 @@
+from django.contrib import messages
+from django.contrib.auth import get_user
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.views import View
+from django.views.generic import TemplateView
+
+from src.apps.common.htmx import BoostedNavigationMixin, htmx_redirect
+
+from .constants import ErrorMessages, ExportConfig, SuccessMessages, TemplatePaths
+from .utils.export import aiterate, stream_jsonl, stream_markdown_zip
+from .utils.importers import ArchiveImportError, detect_format, import_notes
+
+
+class ArchiveView(LoginRequiredMixin, BoostedNavigationMixin, TemplateView):
+    """
+    View for the archive page.
+    """
+    template_name = TemplatePaths.ARCHIVE
+    redirect_field_name = None
+
+
+class ExportView(LoginRequiredMixin, View):
+    """
+    View that streams a full export of the user's notes and journal.
+    """
+    redirect_field_name = None
+
+    exporters = {
+        ExportConfig.MARKDOWN: (stream_markdown_zip, "application/zip", "zip"),
+        ExportConfig.JSONL: (stream_jsonl, "application/jsonl", "jsonl"),
+    }
+
+    def get(self, request, *args, **kwargs):
+        try:
+            stream, content_type, extension = self.exporters[kwargs["format"]]
+        except KeyError:
+            raise Http404
+
+        filename = ExportConfig.FILENAME.format(
+            date=timezone.now().strftime("%Y%m%d"),
+            extension=extension,
+        )
+        content = stream(get_user(request))
+        if isinstance(request, ASGIRequest):
+            # ASGI servers can only stream asynchronous iterators; a
+            # synchronous one is read to the end before anything is sent
+            content = aiterate(content)
+
+        return StreamingHttpResponse(
+            content,
+            content_type=content_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+
+class ImportView(LoginRequiredMixin, View):
+    """
+    View for uploading a Markdown zip or ENEX file of notes.
+    """
+    redirect_field_name = None
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get("archive")
+
+        if upload is None:
+            messages.error(request, ErrorMessages.MISSING_FILE)
+            return htmx_redirect(request, reverse("archive:home"))
+
+        try:
+            count = import_notes(get_user(request), upload, detect_format(upload.name))
+        except ArchiveImportError as exc:
+            messages.error(request, str(exc))
+        else:
+            messages.success(request, SuccessMessages.NOTES_IMPORTED.format(count=count))
+
+        return htmx_redirect(request, reverse("archive:home"))
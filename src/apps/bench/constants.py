@@ -0,0 +1,51 @@
+"""Constants for the bench app."""
+
+
+class SeedConfig:
+    """
+    Seeding-related constants.
+    """
+    EMAIL = "bench-user-{num}@bench.littlenote.local"
+    EMAIL_DOMAIN = "@bench.littlenote.local"
+    BATCH_SIZE = 1000
+
+    # Size distributions
+    FIXED = "fixed"
+    UNIFORM = "uniform"
+    LOGNORMAL = "lognormal"
+    DISTRIBUTIONS = (FIXED, UNIFORM, LOGNORMAL)
+    LOGNORMAL_SIGMA = 1.0
+
+    # Spread of created_at timestamps
+    HISTORY_DAYS = 365
+
+    VOCABULARY = (
+        "apple", "river", "garden", "coffee", "meeting", "idea", "python",
+        "journal", "morning", "project", "travel", "recipe", "book", "music",
+        "weekend", "budget", "letter", "window", "summer", "planet",
+    )
+
+
+class RunnerConfig:
+    """
+    Benchmark-runner constants.
+    """
+    REQUESTS = 200
+    WARMUP = 10
+    SERVER_NAME = "localhost"
+    SEARCH_TERM = "garden"
+
+
+class KeyBenchConfig:
+    """
+    Primary key insert benchmark constants.
+    """
+    ROWS = 1_000_000
+    INSERTS = 100_000
+    BATCH_SIZE = 1000
+
+    TABLE = "bench_keys_{name}"
+
+    # Stands in for the rest of a row, so index pages aren't unrealistically
+    # dense relative to the table
+    PAYLOAD = "x" * 200
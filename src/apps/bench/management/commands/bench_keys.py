@@ -0,0 +1,35 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...constants import KeyBenchConfig
+from ...utils.keys import KeyBenchmark
+
+
+class Command(BaseCommand):
+    help = "Compare insert throughput into a large table keyed by UUIDv4 versus UUIDv7 and report it as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=KeyBenchConfig.ROWS, help="Rows in the table before timing.")
+        parser.add_argument("--inserts", type=int, default=KeyBenchConfig.INSERTS, help="Timed inserts per key type.")
+        parser.add_argument("--batch-size", type=int, default=KeyBenchConfig.BATCH_SIZE, help="Rows per transaction.")
+        parser.add_argument("--output", help="Write the report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            benchmark = KeyBenchmark(
+                rows=options["rows"],
+                inserts=options["inserts"],
+                batch_size=options["batch_size"],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        report = json.dumps(benchmark.run(), indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w") as fileobj:
+                fileobj.write(report + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote key benchmark report to {options['output']}."))
+        else:
+            self.stdout.write(report)
@@ -0,0 +1,38 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...constants import RunnerConfig
+from ...utils.runner import BenchmarkRunner
+
+
+class Command(BaseCommand):
+    help = "Benchmark the main views as the seeded users and report latency percentiles as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=RunnerConfig.REQUESTS, help="Timed requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=RunnerConfig.WARMUP, help="Untimed requests per endpoint.")
+        parser.add_argument("--search-term", default=RunnerConfig.SEARCH_TERM, help="Term used for the search endpoint.")
+        parser.add_argument("--endpoint", action="append", dest="endpoints", help="Only run the named endpoint(s).")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument("--output", help="Write the report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            runner = BenchmarkRunner(
+                requests=options["requests"],
+                warmup=options["warmup"],
+                search_term=options["search_term"],
+                random_seed=options["seed"],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        report = json.dumps(runner.run(only=options["endpoints"]), indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w") as fileobj:
+                fileobj.write(report + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote benchmark report to {options['output']}."))
+        else:
+            self.stdout.write(report)
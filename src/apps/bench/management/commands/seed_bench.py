@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from ...constants import SeedConfig
+from ...utils.seeding import delete_bench_data, seed
+
+
+class Command(BaseCommand):
+    help = "Seed benchmark users with notes and journal entries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10, help="Number of users to create.")
+        parser.add_argument("--notes", type=int, default=200, help="Mean notes per user.")
+        parser.add_argument("--journal-entries", type=int, default=100, help="Mean journal entries per user.")
+        parser.add_argument("--note-words", type=int, default=120, help="Mean words per note.")
+        parser.add_argument("--journal-words", type=int, default=60, help="Mean words per journal entry.")
+        parser.add_argument(
+            "--distribution",
+            choices=SeedConfig.DISTRIBUTIONS,
+            default=SeedConfig.LOGNORMAL,
+            help="Distribution used for counts and sizes.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Delete existing benchmark users first.",
+        )
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            delete_bench_data()
+
+        counts = seed(
+            users=options["users"],
+            notes_per_user=options["notes"],
+            journal_entries_per_user=options["journal_entries"],
+            note_words=options["note_words"],
+            journal_words=options["journal_words"],
+            distribution=options["distribution"],
+            random_seed=options["seed"],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            "Seeded {users} users, {notes} notes and {journal_entries} journal entries.".format(**counts)
+        ))
@@ -0,0 +1,37 @@
+"""Tests for the primary key insert benchmark."""
+
+import io
+import json
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+
+class BenchKeysTest(TestCase):
+    """
+    Integration tests for the bench_keys command.
+    """
+    def test_reports_each_key_type(self):
+        """
+        Test that both key types are timed and their tables dropped.
+        """
+        out = io.StringIO()
+        call_command("bench_keys", rows=20, inserts=10, batch_size=4, stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(set(report["keys"]), {"uuid4", "uuid7"})
+        self.assertEqual(report["meta"]["inserts"], 10)
+        for result in report["keys"].values():
+            self.assertGreater(result["rows_per_second"], 0)
+
+        tables = connection.introspection.table_names()
+        self.assertFalse([table for table in tables if table.startswith("bench_keys_")])
+
+    def test_rejects_invalid_sizes(self):
+        """
+        Test that a benchmark with nothing to time is refused.
+        """
+        with self.assertRaises(CommandError):
+            call_command("bench_keys", inserts=0, stdout=io.StringIO())
@@ -0,0 +1,85 @@
+"""Tests for the benchmark runner."""
+
+import io
+import json
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from src.apps.bench.constants import SeedConfig
+from src.apps.bench.utils.runner import summarize
+from src.apps.bench.utils.seeding import seed
+
+
+class SummarizeTest(SimpleTestCase):
+    """
+    Unit tests for summarize.
+    """
+    def test_percentiles_in_milliseconds(self):
+        """
+        Test that percentiles are reported in milliseconds.
+        """
+        samples = [num / 1000 for num in range(1, 101)]
+        summary = summarize(samples, errors=0, elapsed=1.0)
+        self.assertEqual(summary["requests"], 100)
+        self.assertEqual(summary["throughput_rps"], 100.0)
+        self.assertAlmostEqual(summary["p50_ms"], 50.5)
+        self.assertAlmostEqual(summary["p99_ms"], 99.01)
+
+
+@override_settings(ALLOWED_HOSTS=["localhost"])
+class RunBenchTest(TestCase):
+    """
+    Integration tests for the run_bench command.
+    """
+    def test_run_bench_reports_each_endpoint(self):
+        """
+        Test that the report holds percentiles for every endpoint.
+        """
+        seed(
+            users=1,
+            notes_per_user=3,
+            journal_entries_per_user=2,
+            note_words=10,
+            journal_words=5,
+            distribution=SeedConfig.FIXED,
+        )
+        out = io.StringIO()
+        call_command("run_bench", requests=3, warmup=0, stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(
+            set(report["endpoints"]),
+            {"notes:list", "notes:search", "notes:detail", "journal:home", "pages:front:login"},
+        )
+        for result in report["endpoints"].values():
+            self.assertEqual(result["requests"], 3)
+            self.assertEqual(result["errors"], 0)
+            self.assertIn("p95_ms", result)
+
+    @override_settings(RESEND_API_KEY="re_test")
+    def test_run_bench_sends_no_real_emails(self):
+        """
+        Test that the login benchmark doesn't send passcodes through
+        Resend, even with an API key configured.
+        """
+        seed(
+            users=1,
+            notes_per_user=1,
+            journal_entries_per_user=1,
+            note_words=10,
+            journal_words=5,
+            distribution=SeedConfig.FIXED,
+        )
+        with patch("resend.Emails.send") as send:
+            call_command("run_bench", requests=2, warmup=0, endpoints=["pages:front:login"], stdout=io.StringIO())
+        send.assert_not_called()
+
+    def test_run_bench_requires_seeded_users(self):
+        """
+        Test that running without seeded users fails clearly.
+        """
+        with self.assertRaises(CommandError):
+            call_command("run_bench", requests=1, warmup=0, stdout=io.StringIO())
@@ -0,0 +1,100 @@
+"""Tests for benchmark seeding."""
+
+import io
+import random
+
+from django.core.management import call_command
+from django.db.models.signals import post_delete
+from django.test import SimpleTestCase, TestCase
+
+from src.apps.bench.constants import SeedConfig
+from src.apps.bench.utils.seeding import bench_users, delete_bench_data, sample_size, seed
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+
+
+class SampleSizeTest(SimpleTestCase):
+    """
+    Unit tests for sample_size.
+    """
+    def test_fixed_distribution_returns_mean(self):
+        """
+        Test that the fixed distribution always returns the mean.
+        """
+        rng = random.Random(0)
+        self.assertEqual(sample_size(rng, SeedConfig.FIXED, 7), 7)
+
+    def test_sizes_are_reproducible(self):
+        """
+        Test that the same seed gives the same sizes.
+        """
+        first = [sample_size(random.Random(1), SeedConfig.LOGNORMAL, 50) for _ in range(5)]
+        second = [sample_size(random.Random(1), SeedConfig.LOGNORMAL, 50) for _ in range(5)]
+        self.assertEqual(first, second)
+
+    def test_uniform_sizes_stay_in_range(self):
+        """
+        Test that uniform sizes stay between zero and twice the mean.
+        """
+        rng = random.Random(0)
+        sizes = [sample_size(rng, SeedConfig.UNIFORM, 10) for _ in range(100)]
+        self.assertTrue(all(0 <= size <= 20 for size in sizes))
+
+
+class SeedTest(TestCase):
+    """
+    Integration tests for seed and the seed_bench command.
+    """
+    def test_seed_creates_users_and_content(self):
+        """
+        Test that fixed-size seeding creates exactly the requested rows.
+        """
+        counts = seed(
+            users=2,
+            notes_per_user=3,
+            journal_entries_per_user=2,
+            note_words=10,
+            journal_words=5,
+            distribution=SeedConfig.FIXED,
+        )
+        self.assertEqual(counts, {"users": 2, "notes": 6, "journal_entries": 4})
+        self.assertEqual(bench_users().count(), 2)
+        self.assertEqual(Note.objects.count(), 6)
+        self.assertEqual(JournalEntry.objects.count(), 4)
+
+    def test_seed_bench_reset(self):
+        """
+        Test that --reset replaces existing benchmark data.
+        """
+        options = {"users": 1, "notes": 2, "journal_entries": 0, "distribution": SeedConfig.FIXED}
+        call_command("seed_bench", stdout=io.StringIO(), **options)
+        call_command("seed_bench", reset=True, stdout=io.StringIO(), **options)
+        self.assertEqual(Note.objects.count(), 2)
+
+    def test_delete_bench_data_deletes_in_batches(self):
+        """
+        Test that benchmark data is deleted by batch rather than loaded
+        row by row through cascades.
+        """
+        seed(
+            users=1,
+            notes_per_user=5,
+            journal_entries_per_user=2,
+            note_words=3,
+            journal_words=3,
+            distribution=SeedConfig.FIXED,
+        )
+
+        deleted = []
+
+        def record(sender, instance, **kwargs):
+            deleted.append(instance)
+
+        post_delete.connect(record, sender=Note)
+        self.addCleanup(post_delete.disconnect, record, sender=Note)
+        delete_bench_data()
+
+        self.assertFalse(bench_users().exists())
+        self.assertEqual(Note.all_objects.count(), 0)
+        self.assertEqual(JournalEntry.objects.count(), 0)
+        self.assertEqual(deleted, [])
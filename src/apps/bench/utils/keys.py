@@ -0,0 +1,113 @@
+"""Insert benchmark for random (UUIDv4) versus time-ordered (UUIDv7) keys."""
+
+import platform
+import time
+import uuid
+
+import django
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from src.apps.common.ids import uuid7
+
+from ..constants import KeyBenchConfig
+
+
+GENERATORS = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+
+class KeyBenchmark:
+    """
+    Time inserts into a scratch table with a UUID primary key that
+    already holds a large number of rows, once per key generator. Each
+    table is dropped once it has been measured.
+    """
+    def __init__(self, rows=KeyBenchConfig.ROWS, inserts=KeyBenchConfig.INSERTS,
+                 batch_size=KeyBenchConfig.BATCH_SIZE):
+        if rows < 0 or inserts < 1 or batch_size < 1:
+            raise ValueError("rows can't be negative, and inserts and batch size must be positive.")
+
+        self.rows = rows
+        self.inserts = inserts
+        self.batch_size = batch_size
+        # Converts UUIDs to what the database stores, e.g. hex on SQLite
+        self.id_field = models.UUIDField()
+
+    def create_table(self, table):
+        id_type = connection.data_types["UUIDField"]
+        payload_type = connection.data_types["TextField"]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE {table} (id {id_type} PRIMARY KEY, payload {payload_type} NOT NULL)"
+            )
+
+    def drop_table(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+    def insert(self, table, generate, count):
+        """
+        Insert count rows with keys from generate, one transaction per
+        batch.
+        """
+        sql = f"INSERT INTO {table} (id, payload) VALUES (%s, %s)"
+        remaining = count
+        while remaining > 0:
+            size = min(self.batch_size, remaining)
+            rows = [
+                (self.id_field.get_db_prep_value(generate(), connection), KeyBenchConfig.PAYLOAD)
+                for _ in range(size)
+            ]
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+            remaining -= size
+
+    def index_bytes(self, table):
+        """
+        Return the size of the table's indexes, where the database can
+        tell us.
+        """
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_indexes_size(%s::regclass)", [table])
+            return cursor.fetchone()[0]
+
+    def measure(self, name, generate):
+        table = connection.ops.quote_name(KeyBenchConfig.TABLE.format(name=name))
+        self.drop_table(table)
+        self.create_table(table)
+        try:
+            self.insert(table, generate, self.rows)
+
+            start = time.perf_counter()
+            self.insert(table, generate, self.inserts)
+            elapsed = time.perf_counter() - start
+
+            return {
+                "seconds": round(elapsed, 3),
+                "rows_per_second": round(self.inserts / elapsed, 1),
+                "index_bytes": self.index_bytes(table),
+            }
+        finally:
+            self.drop_table(table)
+
+    def run(self):
+        """
+        Run the benchmark and return a JSON-serializable report.
+        """
+        return {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "rows": self.rows,
+                "inserts": self.inserts,
+                "batch_size": self.batch_size,
+            },
+            "keys": {name: self.measure(name, generate) for name, generate in GENERATORS.items()},
+        }
@@ -0,0 +1,167 @@
+"""Benchmark runner that drives the main views through the test client."""
+
+import platform
+import random
+import statistics
+import time
+
+import django
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from src.apps.notes.models import Note
+from src.apps.pages.constants import AuthSessionKeys
+
+from ..constants import RunnerConfig
+from .seeding import bench_users
+
+
+def summarize(samples, errors, elapsed):
+    """
+    Summarize request durations (in seconds) as throughput and
+    percentiles in milliseconds.
+    """
+    ms = sorted(sample * 1000 for sample in samples)
+    if len(ms) > 1:
+        percentiles = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+    else:
+        p50 = p95 = p99 = ms[0] if ms else 0.0
+
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "throughput_rps": round(len(ms) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+    }
+
+
+class BenchmarkRunner:
+    """
+    Drive a fixed set of endpoints as the seeded benchmark users and
+    collect per-endpoint latency statistics.
+    """
+    def __init__(self, requests=RunnerConfig.REQUESTS, warmup=RunnerConfig.WARMUP,
+                 search_term=RunnerConfig.SEARCH_TERM, random_seed=0):
+        self.requests = requests
+        self.warmup = warmup
+        self.search_term = search_term
+        self.rng = random.Random(random_seed)
+        self.users = list(bench_users().order_by("pk"))
+
+        if not self.users:
+            raise ValueError("No benchmark users found. Run seed_bench first.")
+
+        # Looked up ahead of time so the timed requests don't include it
+        self.note_ids = {
+            user.pk: list(
+                Note.objects.filter(author=user).values_list("pk", flat=True)[:20]
+            )
+            for user in self.users
+        }
+        self.clients = {}
+
+    def client_for(self, user):
+        """
+        Return a logged-in client for the user, reused across requests.
+        """
+        if user.pk not in self.clients:
+            client = Client(SERVER_NAME=RunnerConfig.SERVER_NAME)
+            client.force_login(user)
+            self.clients[user.pk] = client
+        return self.clients[user.pk]
+
+    def endpoints(self):
+        """
+        Map endpoint names to callables that each perform one request.
+        """
+        return {
+            "notes:list": self.notes_list,
+            "notes:search": self.notes_search,
+            "notes:detail": self.note_detail,
+            "journal:home": self.journal,
+            "pages:front:login": self.login,
+        }
+
+    def notes_list(self):
+        return self.client_for(self.rng.choice(self.users)).get(reverse("notes:list"))
+
+    def notes_search(self):
+        client = self.client_for(self.rng.choice(self.users))
+        return client.get(reverse("notes:list"), {"search": self.search_term})
+
+    def note_detail(self):
+        user = self.rng.choice(self.users)
+        if not self.note_ids[user.pk]:
+            return self.notes_list()
+        note_id = self.rng.choice(self.note_ids[user.pk])
+        return self.client_for(user).get(reverse("notes:detail", args=[note_id]))
+
+    def journal(self):
+        return self.client_for(self.rng.choice(self.users)).get(reverse("journal:home"))
+
+    def login(self):
+        """
+        Full passcode login: submit the email, then the passcode.
+        """
+        client = Client(SERVER_NAME=RunnerConfig.SERVER_NAME)
+        email = self.rng.choice(self.users).email
+        front_page_url = reverse("pages:front")
+
+        client.post(front_page_url, {"email": email})
+        passcode = client.session[AuthSessionKeys.PASSCODE][AuthSessionKeys.PASSCODE_CODE]
+        return client.post(front_page_url, {"email": email, "passcode": passcode})
+
+    def measure(self, request):
+        """
+        Time repeated calls of one endpoint.
+        """
+        for _ in range(self.warmup):
+            request()
+
+        samples = []
+        errors = 0
+        started = time.perf_counter()
+        for _ in range(self.requests):
+            start = time.perf_counter()
+            response = request()
+            samples.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+        return summarize(samples, errors, time.perf_counter() - started)
+
+    def run(self, only=None):
+        """
+        Run the benchmark and return a JSON-serializable report.
+        """
+        results = {}
+        # Passcode emails go to memory: no Resend, no SMTP
+        with override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+            RESEND_API_KEY="",
+            RATELIMIT_ENABLE=False,
+        ):
+            for name, request in self.endpoints().items():
+                if only and name not in only:
+                    continue
+                results[name] = self.measure(request)
+
+        return {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "users": len(self.users),
+                "notes": Note.objects.filter(author__in=self.users).count(),
+                "requests": self.requests,
+                "warmup": self.warmup,
+            },
+            "endpoints": results,
+        }
@@ -0,0 +1,132 @@
+"""Reproducible seeding of benchmark users, notes and journal entries."""
+
+import datetime
+import itertools
+import math
+import random
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from src.apps.accounts.deletion import delete_account
+from src.apps.accounts.stats import reconcile_user_stats
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.cache import invalidate_list
+from src.apps.notes.models import Note
+
+from ..constants import SeedConfig
+
+
+User = get_user_model()
+
+
+def sample_size(rng, distribution, mean):
+    """
+    Draw a non-negative size from the named distribution with the given
+    mean.
+    """
+    if mean <= 0:
+        return 0
+    if distribution == SeedConfig.FIXED:
+        return mean
+    if distribution == SeedConfig.UNIFORM:
+        return rng.randint(0, 2 * mean)
+    if distribution == SeedConfig.LOGNORMAL:
+        sigma = SeedConfig.LOGNORMAL_SIGMA
+        mu = math.log(mean) - sigma ** 2 / 2
+        return int(rng.lognormvariate(mu, sigma))
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+
+def generate_text(rng, words):
+    """
+    Generate text of roughly the given number of words.
+    """
+    return " ".join(rng.choices(SeedConfig.VOCABULARY, k=max(words, 1)))
+
+
+def random_timestamp(rng, now):
+    """
+    Pick a timestamp within the seeding history window.
+    """
+    seconds = rng.randint(0, SeedConfig.HISTORY_DAYS * 24 * 60 * 60)
+    return now - datetime.timedelta(seconds=seconds)
+
+
+def bulk_create_in_batches(model, objects, batch_size):
+    """
+    Insert objects from an iterable without materializing all of them,
+    returning the number inserted.
+    """
+    count = 0
+    iterator = iter(objects)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        model.objects.bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+def bench_users():
+    """
+    Return a queryset of the users created by seeding.
+    """
+    return User.objects.filter(email__endswith=SeedConfig.EMAIL_DOMAIN)
+
+
+def delete_bench_data():
+    """
+    Delete all benchmark users and their data, a batch at a time rather
+    than through cascades that load every row.
+    """
+    for user in bench_users():
+        delete_account(user, pause=0)
+
+
+def seed(
+    users,
+    notes_per_user,
+    journal_entries_per_user,
+    note_words,
+    journal_words,
+    distribution=SeedConfig.LOGNORMAL,
+    random_seed=0,
+    batch_size=SeedConfig.BATCH_SIZE,
+):
+    """
+    Create benchmark users with notes and journal entries. The same
+    arguments always produce the same sizes and content.
+    """
+    rng = random.Random(random_seed)
+    now = timezone.now()
+    counts = {"users": 0, "notes": 0, "journal_entries": 0}
+
+    for num in range(users):
+        email = SeedConfig.EMAIL.format(num=num)
+        user, _ = User.objects.get_or_create(email=email, defaults={"username": email})
+        counts["users"] += 1
+
+        notes = (
+            Note(
+                author=user,
+                title=generate_text(rng, rng.randint(1, 6)),
+                content=generate_text(rng, sample_size(rng, distribution, note_words)),
+                created_at=random_timestamp(rng, now),
+            )
+            for _ in range(sample_size(rng, distribution, notes_per_user))
+        )
+        counts["notes"] += bulk_create_in_batches(Note, notes, batch_size)
+        invalidate_list(user.pk)
+
+        entries = (
+            JournalEntry(
+                author=user,
+                content=generate_text(rng, sample_size(rng, distribution, journal_words)),
+            )
+            for _ in range(sample_size(rng, distribution, journal_entries_per_user))
+        )
+        counts["journal_entries"] += bulk_create_in_batches(JournalEntry, entries, batch_size)
+
+        # bulk_create doesn't send the signals that keep stats up to date
+        reconcile_user_stats(user.pk)
+
+    return counts
@@ -0,0 +1,94 @@
+"""Admin building blocks for tables too large to count or scan."""
+
+from django import forms
+from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+from django.utils.translation import gettext as _
+
+from .constants import AdminConfig
+
+
+def estimated_count(queryset):
+    """
+    Return PostgreSQL's estimate of the number of rows in the queryset's
+    table, or None if the queryset is filtered, the database isn't
+    PostgreSQL or the table hasn't been analyzed yet.
+    """
+    connection = connections[queryset.db]
+    if queryset.query.where or connection.vendor != "postgresql":
+        return None
+
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [table])
+        row = cursor.fetchone()
+
+    # reltuples is -1 until the table is first vacuumed or analyzed
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the planner's row estimate for unfiltered
+    querysets over large tables, instead of running COUNT(*) over every
+    row on each page. The last page number may be off by a little.
+    """
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is not None and estimate >= AdminConfig.ESTIMATE_THRESHOLD:
+            return estimate
+        return super().count
+
+
+class ProjectedChangeList(ChangeList):
+    """
+    Change list that only loads the columns named in the admin's
+    list_only.
+    """
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        if self.model_admin.list_only:
+            queryset = queryset.only(*self.model_admin.list_only)
+        return queryset
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin for tables with millions of rows. Change lists skip full
+    table counts and only load list_only columns, and search only uses
+    indexed exact lookups: a search term that is a valid primary key
+    finds that row, anything else goes through search_fields, which
+    should all be exact (=) lookups on indexed columns.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_only = ()
+
+    def action_checkbox(self, obj):
+        # Labelled with the primary key rather than str(obj), which
+        # would load deferred columns one row at a time
+        attrs = {
+            "class": "action-select",
+            "aria-label": format_html(_("Select this object for an action - {}"), obj.pk),
+        }
+        checkbox = forms.CheckboxInput(attrs, lambda value: False)
+        return checkbox.render(helpers.ACTION_CHECKBOX_NAME, str(obj.pk))
+
+    def get_changelist(self, request, **kwargs):
+        return ProjectedChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        try:
+            pk = self.model._meta.pk.to_python(search_term.strip())
+        except ValidationError:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk=pk), False
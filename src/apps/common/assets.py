@@ -0,0 +1,127 @@
+"""
+Bundled static assets.
+
+Each page type loads one stylesheet bundle and at most one script
+bundle, built from the source files listed in AssetConfig.BUNDLES.
+BundleFinder makes the bundles look like any other static file: they
+are built into STATIC_BUNDLE_DIR on first request, rebuilt whenever a
+source changes, and picked up by collectstatic, where the production
+storage fingerprints them and writes Brotli and gzip variants for
+WhiteNoise to serve with far-future caching.
+"""
+
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import FileSystemStorage
+
+from .constants import AssetConfig
+
+
+CSS_STRING = r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')"""
+CSS_COMMENT_PATTERN = re.compile(CSS_STRING + r"|/\*.*?\*/", re.DOTALL)
+CSS_SPACE_PATTERN = re.compile(CSS_STRING + r"|\s+")
+CSS_IMPORT_PATTERN = re.compile(r"""@import\s(?:"[^"]*"|'[^']*'|[^;"'])+;""")
+
+# Whitespace next to these is never significant
+CSS_PUNCTUATION = "{};,>"
+
+
+def minify_css(css):
+    """
+    Strip comments and insignificant whitespace from a stylesheet,
+    leaving strings untouched.
+    """
+    def strip_comment(match):
+        return match.group(1) or ""
+
+    def collapse_space(match):
+        if match.group(1):
+            return match.group(1)
+        before = match.string[match.start() - 1:match.start()]
+        after = match.string[match.end():match.end() + 1]
+        return "" if before in CSS_PUNCTUATION or after in CSS_PUNCTUATION else " "
+
+    css = CSS_COMMENT_PATTERN.sub(strip_comment, css)
+    return CSS_SPACE_PATTERN.sub(collapse_space, css).strip()
+
+
+def join_css(sources):
+    """
+    Concatenate and minify stylesheets. @import rules only work at the
+    top of a stylesheet, so they're moved there.
+    """
+    imports = []
+    rules = []
+    for source in sources:
+        imports.extend(CSS_IMPORT_PATTERN.findall(source))
+        rules.append(minify_css(CSS_IMPORT_PATTERN.sub("", source)))
+    return "".join(imports + rules)
+
+
+def join_js(sources):
+    # Each script is self-contained, so a semicolon between them is
+    # enough to keep one from running into the next
+    return ";\n".join(source.strip() for source in sources) + "\n"
+
+
+def find_source(path):
+    source = finders.find(path)
+    if source is None:
+        raise ImproperlyConfigured(f"Static bundle source {path!r} could not be found.")
+    return source
+
+
+def build_bundle(name, force=False):
+    """
+    Build a bundle into STATIC_BUNDLE_DIR, unless it's already newer
+    than all of its sources. Returns the path of the built file.
+    """
+    sources = [find_source(path) for path in AssetConfig.BUNDLES[name]]
+    target = Path(settings.STATIC_BUNDLE_DIR) / name
+
+    if not force and target.exists():
+        if target.stat().st_mtime >= max(os.path.getmtime(source) for source in sources):
+            return str(target)
+
+    contents = [Path(source).read_text(encoding="utf-8") for source in sources]
+    built = join_css(contents) if name.endswith(".css") else join_js(contents)
+
+    # Written aside and moved into place, so concurrent requests never
+    # serve a half-written bundle
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=target.parent, delete=False
+    ) as file:
+        file.write(built)
+    os.replace(file.name, target)
+    return str(target)
+
+
+class BundleFinder(finders.BaseFinder):
+    """
+    Static files finder for the bundles in AssetConfig.BUNDLES.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.storage = FileSystemStorage(location=settings.STATIC_BUNDLE_DIR)
+
+    def check(self, **kwargs):
+        return []
+
+    def find(self, path, find_all=False, **kwargs):
+        if path not in AssetConfig.BUNDLES:
+            return [] if find_all else None
+        built = build_bundle(path)
+        return [built] if find_all else built
+
+    def list(self, ignore_patterns):
+        # collectstatic always gets freshly built bundles
+        for name in AssetConfig.BUNDLES:
+            build_bundle(name, force=True)
+            yield name, self.storage
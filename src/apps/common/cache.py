@@ -0,0 +1,281 @@
+"""
+Two-tier cache: a small in-process LRU in front of the shared Django
+cache (Redis in production, a database table otherwise).
+
+Values found in the shared tier are copied into the calling worker's
+LRU, so repeated reads of hot keys don't leave the process. The LRU is
+never invalidated across workers, which makes it safe only for values
+that don't change under a key. Use versioned keys for anything that
+does: bumping the version moves readers to a new key, and entries under
+old versions simply age out of both tiers. Version numbers themselves
+are always read from the shared tier.
+
+Without Redis the shared tier is a database table, where every lookup
+and version bump is a query or several. Callers that cache to save
+queries should check in_database and skip the cache there.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.db import DatabaseCache
+from django.db import connections, router, transaction
+
+from .constants import CacheConfig
+from .metrics import CACHE_REQUESTS
+
+
+_missing = object()
+
+
+class LocalLRU:
+    """
+    Thread-safe, size-bounded LRU with a per-entry expiry.
+    """
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TieredCache:
+    """
+    In-process LRU in front of a shared Django cache, with versioned
+    keys, single-flight recompute and hit/miss statistics.
+    """
+    def __init__(self, alias=DEFAULT_CACHE_ALIAS, max_entries=CacheConfig.LOCAL_MAX_ENTRIES,
+                 local_timeout=CacheConfig.LOCAL_TIMEOUT):
+        self.alias = alias
+        self.local = LocalLRU(max_entries, local_timeout)
+        self._stats = {"local_hit": 0, "shared_hit": 0, "miss": 0}
+        self._stats_lock = threading.Lock()
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    @property
+    def shared(self):
+        # Django cache connections are per thread, so look it up each time
+        return caches[self.alias]
+
+    @property
+    def in_database(self):
+        """
+        Whether the shared tier is a database table, so that reading or
+        bumping a version costs queries.
+        """
+        return isinstance(self.shared, DatabaseCache)
+
+    def _record(self, result):
+        with self._stats_lock:
+            self._stats[result] += 1
+        CACHE_REQUESTS.labels(result).inc()
+
+    def stats(self):
+        """
+        Return this worker's hit and miss counts and hit ratio.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        lookups = sum(stats.values())
+        stats["hit_ratio"] = (stats["local_hit"] + stats["shared_hit"]) / lookups if lookups else 0.0
+        stats["local_entries"] = len(self.local)
+        return stats
+
+    def get(self, key, default=None):
+        value = self.local.get(key, _missing)
+        if value is not _missing:
+            self._record("local_hit")
+            return value
+
+        value = self.shared.get(key, _missing)
+        if value is not _missing:
+            self._record("shared_hit")
+            self.local.set(key, value)
+            return value
+
+        self._record("miss")
+        return default
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self.shared.set(key, value, timeout)
+        self.local.set(key, value)
+
+    def delete(self, key):
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def clear(self):
+        """
+        Clear this worker's LRU and the whole shared cache.
+        """
+        self.local.clear()
+        self.shared.clear()
+
+    def get_or_set(self, key, compute, timeout=DEFAULT_TIMEOUT):
+        """
+        Return the cached value for key, calling compute() to fill it
+        on a miss. Concurrent misses for the same key compute it once:
+        threads in this worker wait on a lock, and other workers wait
+        for the one holding the shared lock to store its result.
+        """
+        value = self.get(key, _missing)
+        if value is not _missing:
+            return value
+
+        with self._flights_lock:
+            flight = self._flights.setdefault(key, threading.Lock())
+
+        waited = not flight.acquire(blocking=False)
+        if waited:
+            flight.acquire()
+        try:
+            # Another thread may have filled it while we waited
+            if waited:
+                value = self.get(key, _missing)
+                if value is not _missing:
+                    return value
+            return self._compute_once(key, compute, timeout)
+        finally:
+            with self._flights_lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.release()
+
+    def _compute_once(self, key, compute, timeout):
+        lock_key = CacheConfig.LOCK_KEY.format(key=key)
+        locked = self.shared.add(lock_key, 1, CacheConfig.LOCK_TIMEOUT)
+        if not locked:
+            value = self._wait_for(key)
+            if value is not _missing:
+                return value
+
+        # Either we hold the lock, or its holder is taking too long
+        try:
+            value = compute()
+            self.set(key, value, timeout)
+            return value
+        finally:
+            if locked:
+                self.shared.delete(lock_key)
+
+    def _wait_for(self, key):
+        deadline = time.monotonic() + CacheConfig.LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(CacheConfig.LOCK_POLL_INTERVAL)
+            value = self.shared.get(key, _missing)
+            if value is not _missing:
+                self.local.set(key, value)
+                return value
+        return _missing
+
+    def get_version(self, name):
+        """
+        Return the current version of a namespace, starting one if it
+        doesn't exist.
+        """
+        key = CacheConfig.VERSION_KEY.format(name=name)
+        version = self.shared.get(key)
+        if version is None:
+            self.shared.add(key, _initial_version(), None)
+            version = self.shared.get(key)
+        return version
+
+    def bump_version(self, name):
+        """
+        Atomically move a namespace to a new version, so keys built
+        with the old version are no longer read.
+        """
+        key = CacheConfig.VERSION_KEY.format(name=name)
+        try:
+            return self._incr(key)
+        except ValueError:
+            version = _initial_version()
+            if self.shared.add(key, version, None):
+                return version
+            return self._incr(key)
+
+    def _incr(self, key):
+        """
+        Increment a version in the shared tier, raising ValueError if
+        it doesn't exist. Redis increments atomically. DatabaseCache
+        reads the value and writes it back, so there the row is locked
+        in between, and concurrent bumps can't both write the same
+        version.
+        """
+        shared = self.shared
+        if not self.in_database:
+            return shared.incr(key)
+
+        db = router.db_for_write(shared.cache_model_class)
+        connection = connections[db]
+        with transaction.atomic(using=db):
+            if connection.features.has_select_for_update:
+                table = connection.ops.quote_name(shared._table)
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"SELECT cache_key FROM {table} WHERE cache_key = %s FOR UPDATE",
+                        [shared.make_and_validate_key(key)],
+                    )
+
+            version = shared.get(key)
+            if version is None:
+                raise ValueError(f"Key '{key}' not found")
+            # Unlike DatabaseCache.incr, which would give it the default
+            # timeout, keep the version from expiring
+            version += 1
+            shared.set(key, version, None)
+            return version
+
+    def versioned_key(self, name, key):
+        """
+        Build a key under the current version of a namespace.
+        """
+        return CacheConfig.VERSIONED_KEY.format(
+            name=name, version=self.get_version(name), key=key
+        )
+
+
+def _initial_version():
+    # Time-based, so a version key that was evicted restarts above any
+    # version it could have reached before.
+    return time.time_ns() // 1000
+
+
+tiered_cache = TieredCache()
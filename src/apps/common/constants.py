@@ -0,0 +1,158 @@
+"""Constants for the common app."""
+
+import datetime
+
+
+class ProfilingConfig:
+    """
+    On-demand request profiling constants.
+    """
+    QUERY_PARAM = "_profile"
+    REQUEST_HEADER = "X-Profile"
+    RESPONSE_HEADER = "X-Profile-URL"
+
+    # Profiles per staff user
+    RATE = "10/h"
+    RATELIMIT_GROUP = "profiling"
+
+    EXTENSION = ".prof"
+
+    # Saved profiles are pruned to the newest KEEP, and any older than
+    # MAX_AGE are deleted too
+    KEEP = 100
+    MAX_AGE = datetime.timedelta(days=7)
+
+
+class StartupProfileConfig:
+    """
+    Startup profiling constants.
+    """
+    # Imported in a fresh interpreter, timing how long it takes to be
+    # ready for requests
+    MODULE = "config.wsgi"
+
+    # Modules listed, slowest first
+    LIMIT = 30
+
+    # Seconds before the profiled interpreter is given up on
+    TIMEOUT = 120
+
+
+class ReadinessConfig:
+    """
+    Readiness check constants.
+    """
+    # Read, never written, to check the shared cache is reachable
+    CACHE_KEY = "readiness"
+
+    DATABASE = "database"
+    CACHE = "cache"
+    TEMPLATES = "templates"
+
+
+class ReplicaConfig:
+    """
+    Read replica routing constants.
+    """
+    # After a write, the client reads from the primary for this many
+    # seconds. Longer than MAX_LAG plus LAG_CHECK_INTERVAL, so a replica
+    # that starts falling behind just after a check is still covered.
+    STICKY_COOKIE = "primary_until"
+    STICKY_SECONDS = 10
+
+    # Replicas further behind than this many seconds aren't read from
+    MAX_LAG = 2
+    LAG_CHECK_INTERVAL = 5
+
+    # Apps whose tables are always read from the primary: the database
+    # cache has to see its own writes
+    PRIMARY_APPS = {"django_cache"}
+
+
+class LoggingConfig:
+    """
+    Structured logging constants.
+    """
+    REQUEST_ID_HEADER = "X-Request-ID"
+    REQUEST_ID_PATTERN = r"^[A-Za-z0-9._-]{1,64}$"
+
+    # Records buffered for the log writer thread before dropping
+    QUEUE_SIZE = 10000
+
+
+class CacheConfig:
+    """
+    Two-tier cache constants.
+    """
+    # In-process tier, per worker
+    LOCAL_MAX_ENTRIES = 1000
+    LOCAL_TIMEOUT = 60
+
+    # Single-flight recompute: how long a recompute lock is held at most,
+    # and how long other workers wait for its result before computing it
+    # themselves
+    LOCK_TIMEOUT = 10
+    LOCK_WAIT = 2.0
+    LOCK_POLL_INTERVAL = 0.05
+
+    VERSION_KEY = "version:{name}"
+    VERSIONED_KEY = "{name}:v{version}:{key}"
+    LOCK_KEY = "lock:{key}"
+
+
+class AdminConfig:
+    """
+    Admin constants for large tables.
+    """
+    # Unfiltered change lists over tables estimated to have at least
+    # this many rows show the estimate instead of counting them
+    ESTIMATE_THRESHOLD = 100_000
+
+    # Characters of long text columns shown in change lists
+    PREVIEW_LENGTH = 80
+
+
+class AssetConfig:
+    """
+    Static asset bundle constants.
+    """
+    # Bundle name and the static files it's built from, in order
+    BUNDLES = {
+        "bundles/front.css": [
+            "css/reset.css",
+            "css/base.css",
+            "pages/css/front_page.css",
+        ],
+        "bundles/app.css": [
+            "css/reset.css",
+            "css/base.css",
+            "css/app.css",
+            "notes/css/list.css",
+            "notes/css/detail.css",
+            "notes/css/edit.css",
+            "journal/css/journal.css",
+            "archive/css/archive.css",
+        ],
+        # App pages are swapped in by boosted navigation rather than
+        # loaded, so every page's behaviour ships with the shell
+        "bundles/app.js": [
+            "js/htmx.min.js",
+            "notes/js/delete.js",
+            "archive/js/import.js",
+            "sync/js/live.js",
+        ],
+    }
+
+
+class HtmxConfig:
+    """
+    htmx request header and boosted navigation constants.
+    """
+    REQUEST = "HX-Request"
+    BOOSTED = "HX-Boosted"
+    HISTORY_RESTORE_REQUEST = "HX-History-Restore-Request"
+
+    # Blocks of app.html pages sent for boosted navigation, and the
+    # template putting them together
+    BOOSTED_BLOCKS = ["app_content", "app_header"]
+    BOOSTED_TEMPLATE = "partials/boosted.html"
@@ -0,0 +1,147 @@
+"""
+htmx helpers: telling kinds of htmx request apart, and rendering only
+some blocks of a page template.
+
+Fragments are blocks of the page they belong to rather than separate
+partial templates, so a page and its fragments can't drift apart.
+Every view that answers htmx requests differently varies on the htmx
+request headers, so an HTTP cache never serves a fragment for a full
+page load or the reverse.
+"""
+
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.template.context import make_context
+from django.template.loader import render_to_string, select_template
+from django.template.loader_tags import BLOCK_CONTEXT_KEY, BlockContext, BlockNode, ExtendsNode
+from django.utils.cache import patch_vary_headers
+
+from .constants import HtmxConfig
+
+
+def is_htmx(request):
+    return request.headers.get(HtmxConfig.REQUEST) == "true"
+
+
+def is_boosted(request):
+    return request.headers.get(HtmxConfig.BOOSTED) == "true"
+
+
+def is_history_restore(request):
+    return request.headers.get(HtmxConfig.HISTORY_RESTORE_REQUEST) == "true"
+
+
+def wants_fragment(request):
+    """
+    Return True for htmx requests for part of a page. Boosted
+    navigation and history restores aren't: they need a page's app
+    shell or the whole page.
+    """
+    return is_htmx(request) and not is_boosted(request) and not is_history_restore(request)
+
+
+def build_block_context(template, context):
+    """
+    Collect the blocks of a template and every template it extends,
+    the way {% extends %} does when rendering.
+    """
+    block_context = BlockContext()
+    while True:
+        extends = next((node for node in template.nodelist if isinstance(node, ExtendsNode)), None)
+        if extends is None:
+            block_context.add_blocks(
+                {node.name: node for node in template.nodelist.get_nodes_by_type(BlockNode)}
+            )
+            return block_context
+        block_context.add_blocks(extends.blocks)
+        template = extends.get_parent(context)
+
+
+def render_blocks(template_names, block_names, context=None, request=None):
+    """
+    Render only the named blocks of a template, as they'd appear in the
+    full page with inheritance applied. Returns {name: html}.
+    """
+    if isinstance(template_names, str):
+        template_names = [template_names]
+    template = select_template(template_names).template
+    context = make_context(context or {}, request, autoescape=template.engine.autoescape)
+
+    with context.render_context.push_state(template):
+        with context.bind_template(template):
+            context.template_name = template.name
+            block_context = build_block_context(template, context)
+            context.render_context[BLOCK_CONTEXT_KEY] = block_context
+
+            rendered = {}
+            for name in block_names:
+                block = block_context.get_block(name)
+                if block is None:
+                    raise ValueError(f"Template {template.name!r} has no block {name!r}.")
+                rendered[name] = block.render(context)
+            return rendered
+
+
+def htmx_redirect(request, url):
+    """
+    Redirect to url. htmx requests are told to load it as a new page
+    with HX-Redirect, rather than following the redirect and swapping
+    the page it leads to into the current one.
+    """
+    if is_htmx(request):
+        response = HttpResponse()
+        response["HX-Redirect"] = url
+    else:
+        response = redirect(url)
+
+    patch_vary_headers(response, [HtmxConfig.REQUEST])
+    return response
+
+
+class FragmentMixin:
+    """
+    Mixin for views answering htmx requests with a fragment of the
+    page: the block named by fragment_block, rendered from the view's
+    own template. Views without a fragment_block still vary on the
+    htmx request headers, as their redirects and errors can differ.
+    """
+    fragment_block = None
+    vary_headers = [HtmxConfig.REQUEST]
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        patch_vary_headers(response, self.vary_headers)
+        return response
+
+    def get_fragment_block(self, context):
+        return self.fragment_block
+
+    def render_to_response(self, context, **response_kwargs):
+        block = self.get_fragment_block(context)
+        if block is None or not wants_fragment(self.request):
+            return super().render_to_response(context, **response_kwargs)
+
+        blocks = render_blocks(self.get_template_names(), [block], context, self.request)
+        return HttpResponse(blocks[block], status=response_kwargs.get("status"))
+
+
+class BoostedNavigationMixin(FragmentMixin):
+    """
+    Mixin for views of pages in the app shell (app.html). Links and
+    forms in the shell are boosted, and boosted requests get only what
+    changes from page to page: the app_content block, swapped into
+    <main>, and the header with the navbar, swapped out of band.
+    """
+    vary_headers = [HtmxConfig.REQUEST, HtmxConfig.BOOSTED]
+
+    def render_to_response(self, context, **response_kwargs):
+        if not is_boosted(self.request):
+            return super().render_to_response(context, **response_kwargs)
+
+        blocks = render_blocks(
+            self.get_template_names(), HtmxConfig.BOOSTED_BLOCKS, context, self.request
+        )
+        return HttpResponse(
+            render_to_string(HtmxConfig.BOOSTED_TEMPLATE, blocks),
+            status=response_kwargs.get("status"),
+        )
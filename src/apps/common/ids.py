@@ -0,0 +1,27 @@
+"""Time-ordered identifiers."""
+
+import os
+import time
+import uuid
+
+
+def uuid7():
+    """
+    Generate a UUIDv7 (RFC 9562): a 48-bit Unix timestamp in
+    milliseconds, then 12 bits of sub-millisecond time and 62 random
+    bits. IDs generated later sort higher, so new rows are appended at
+    the right-hand edge of a primary key index instead of landing on a
+    random page.
+    """
+    milliseconds, nanoseconds = divmod(time.time_ns(), 1_000_000)
+    fraction = nanoseconds * 4096 // 1_000_000
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+
+    value = (
+        milliseconds << 80
+        | 0x7 << 76
+        | fraction << 64
+        | 0b10 << 62
+        | random_bits
+    )
+    return uuid.UUID(int=value)
@@ -0,0 +1,27 @@
+"""
+Lazy imports for heavy dependencies that most requests never use.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    Import a module the first time one of its attributes is used
+    rather than now, so it costs nothing in processes that never touch
+    it. A module that isn't installed still fails here, at import time.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
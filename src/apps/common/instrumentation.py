@@ -0,0 +1,137 @@
+"""Per-request timing of SQL, template and Markdown rendering."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.template.base import Template
+
+
+_current_timings = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Timings collected over the course of a single request. Durations
+    are in seconds.
+    """
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.markdown_time = 0.0
+        self._template_depth = 0
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self):
+        """
+        Format the timings as a Server-Timing header value.
+        """
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries"',
+            f"tpl;dur={self.template_time * 1000:.1f}",
+            f"md;dur={self.markdown_time * 1000:.1f}",
+            f"total;dur={self.total_time * 1000:.1f}",
+        ])
+
+    def as_log_fields(self):
+        """
+        Format the timings as structured logging fields.
+        """
+        return {
+            "duration_ms": round(self.total_time * 1000, 1),
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_time * 1000, 1),
+            "template_ms": round(self.template_time * 1000, 1),
+            "markdown_ms": round(self.markdown_time * 1000, 1),
+        }
+
+
+def current_timings():
+    """
+    Return the timings for the current request, or None when
+    instrumentation is not active.
+    """
+    return _current_timings.get()
+
+
+@contextmanager
+def collect_timings():
+    """
+    Collect timings for the duration of the block.
+    """
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def track(attribute):
+    """
+    Add the time spent in the block to one of the current request's
+    timings. Does nothing outside of an instrumented request.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(timings, attribute, getattr(timings, attribute) + time.perf_counter() - start)
+
+
+def time_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper that counts and times queries.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_queries += 1
+        timings.db_time += time.perf_counter() - start
+
+
+def _instrumented_render(render):
+    def wrapper(self, context):
+        timings = _current_timings.get()
+
+        # Includes and inheritance render nested templates, so only the
+        # outermost render is timed.
+        if timings is None or timings._template_depth:
+            return render(self, context)
+
+        timings._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            timings._template_depth -= 1
+            timings.template_time += time.perf_counter() - start
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+def install_template_timing():
+    """
+    Wrap Template.render so template rendering time is tracked. Only
+    called when instrumentation is enabled, so templates render
+    untouched otherwise.
+    """
+    if not getattr(Template.render, "instrumented", False):
+        Template.render = _instrumented_render(Template.render)
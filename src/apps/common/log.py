@@ -0,0 +1,171 @@
+"""
+Structured JSON logging.
+
+Records are tagged with the current request's ID and user ID, rendered
+as one JSON object per line, and written by a background thread so that
+logging never blocks a request on stdout.
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from .constants import LoggingConfig
+from .metrics import LOG_RECORDS_DROPPED
+
+
+_request_context = ContextVar("log_request_context", default=None)
+_async_handlers = weakref.WeakSet()
+
+# Attributes every LogRecord has. Anything else was passed in `extra`.
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "request_id", "user_id", "elapsed_ms",
+}
+
+
+@contextmanager
+def request_context(request_id):
+    """
+    Tag log records emitted within the block with the request ID.
+    """
+    token = _request_context.set({
+        "request_id": request_id,
+        "user_id": None,
+        "started_at": time.perf_counter(),
+    })
+    try:
+        yield
+    finally:
+        _request_context.reset(token)
+
+
+def set_user_id(user_id):
+    """
+    Tag the remaining log records of the current request with the user.
+    """
+    context = _request_context.get()
+    if context is not None:
+        context["user_id"] = user_id
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Add request_id, user_id and elapsed_ms (time since the request
+    started) to records. All three are None outside of a request.
+    """
+    def filter(self, record):
+        context = _request_context.get()
+        if context is None:
+            record.request_id = record.user_id = record.elapsed_ms = None
+        else:
+            record.request_id = context["request_id"]
+            record.user_id = context["user_id"]
+            record.elapsed_ms = round((time.perf_counter() - context["started_at"]) * 1000, 1)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a random fraction of records, for loggers too noisy to keep in
+    full. Kept records carry the sample rate so counts can be scaled
+    back up downstream.
+    """
+    def __init__(self, rate=1.0, name=""):
+        super().__init__(name)
+        self.rate = float(rate)
+
+    def filter(self, record):
+        if self.rate < 1.0 and random.random() >= self.rate:
+            return False
+        record.sample_rate = self.rate
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Render records as single-line JSON objects, including any fields
+    passed in `extra`.
+    """
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "user_id": getattr(record, "user_id", None),
+            "elapsed_ms": getattr(record, "elapsed_ms", None),
+            "process": record.process,
+        }
+        entry.update(
+            (key, value) for key, value in vars(record).items()
+            if key not in RESERVED_ATTRS and not key.startswith("_")
+        )
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+
+        return json.dumps(entry, default=str)
+
+
+class AsyncStreamHandler(QueueHandler):
+    """
+    Format records in the calling thread, then hand them to a background
+    thread that writes them to the stream. The queue is bounded: when it
+    is full, records are dropped rather than blocking, and counted in
+    dropped and the littlenote_log_records_dropped_total metric.
+
+    The writer thread is restarted in forked children, so the handler
+    also works when configured before gunicorn forks its workers.
+    """
+    def __init__(self, stream=None, queue_size=LoggingConfig.QUEUE_SIZE):
+        self.stream_handler = logging.StreamHandler(stream or sys.stdout)
+        self.queue_size = queue_size
+        self.dropped = 0
+        super().__init__(queue.Queue(queue_size))
+        self._start_listener()
+        _async_handlers.add(self)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.stream_handler)
+        self.listener.start()
+
+    def _restart_in_child(self):
+        # Only the forking thread survives a fork, so the parent's
+        # listener thread (and possibly its queue lock) is gone.
+        self.queue = queue.Queue(self.queue_size)
+        self.dropped = 0
+        self._start_listener()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+    def close(self):
+        if self in _async_handlers:
+            _async_handlers.discard(self)
+            self.listener.stop()
+            self.stream_handler.close()
+        super().close()
+
+
+def _restart_handlers_in_child():
+    for handler in list(_async_handlers):
+        handler._restart_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_handlers_in_child)
@@ -0,0 +1,46 @@
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...constants import StartupProfileConfig
+from ...startup import profile_startup
+
+
+class Command(BaseCommand):
+    help = "Import an entry point in a fresh interpreter and report how long it took to be ready and which imports it spent the time on."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--module",
+            default=StartupProfileConfig.MODULE,
+            help="Entry point to import.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=StartupProfileConfig.LIMIT,
+            help="Number of modules to list.",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=["cumulative", "self"],
+            default="cumulative",
+            help="Order modules by their time including or excluding their own imports.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            ready_seconds, imports = profile_startup(options["module"])
+        except subprocess.CalledProcessError as exc:
+            raise CommandError(f"Importing {options['module']} failed:\n{exc.stderr[-2000:]}")
+
+        column = 2 if options["sort"] == "cumulative" else 1
+        imports.sort(key=lambda timing: timing[column], reverse=True)
+
+        self.stdout.write(f"{'self [us]':>10} | {'cumulative':>10} | imported package")
+        for module, self_us, cumulative_us in imports[:options["limit"]]:
+            self.stdout.write(f"{self_us:>10} | {cumulative_us:>10} | {module}")
+
+        self.stdout.write(
+            f"{options['module']} ready in {ready_seconds * 1000:.0f} ms, {len(imports)} modules imported."
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from ...warmup import warm_up_templates
+
+
+class Command(BaseCommand):
+    help = "Compile every project template, as workers do when they start, and report how long each took."
+
+    def handle(self, *args, **options):
+        timings = warm_up_templates()
+
+        for name, seconds in timings:
+            self.stdout.write(f"{seconds * 1000:8.1f} ms  {name}")
+
+        total_time = sum(seconds for _, seconds in timings)
+        self.stdout.write(f"Compiled {len(timings)} templates in {total_time * 1000:.1f} ms.")
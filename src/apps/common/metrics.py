@@ -0,0 +1,106 @@
+"""
+Prometheus metrics.
+
+When PROMETHEUS_MULTIPROC_DIR is set, each worker writes its samples to
+memory-mapped files in that directory and the exposition view aggregates
+all of them, so any worker can answer a scrape. config/gunicorn.py sets
+it before the app is loaded and empties it when the server starts;
+without it (runserver, tests) each process only reports its own
+samples.
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+REQUEST_LATENCY = Histogram(
+    "littlenote_request_duration_seconds",
+    "Request latency by URL name.",
+    ["view", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+DB_QUERY_DURATION = Histogram(
+    "littlenote_db_query_duration_seconds",
+    "Duration of individual database queries.",
+    buckets=FAST_BUCKETS,
+)
+
+EMAIL_SEND_DURATION = Histogram(
+    "littlenote_email_send_duration_seconds",
+    "Time taken to send passcode emails.",
+    ["transport"],
+    buckets=LATENCY_BUCKETS,
+)
+
+EMAIL_SEND_FAILURES = Counter(
+    "littlenote_email_send_failures_total",
+    "Passcode emails that failed to send.",
+    ["transport"],
+)
+
+RATE_LIMIT_REJECTIONS = Counter(
+    "littlenote_rate_limit_rejections_total",
+    "Requests rejected by a rate limit.",
+    ["limit"],
+)
+
+CACHE_REQUESTS = Counter(
+    "littlenote_cache_requests_total",
+    "Two-tier cache lookups by result (local_hit, shared_hit, miss).",
+    ["result"],
+)
+
+LOG_RECORDS_DROPPED = Counter(
+    "littlenote_log_records_dropped_total",
+    "Log records dropped because the asynchronous log queue was full.",
+)
+
+MARKDOWN_RENDER_DURATION = Histogram(
+    "littlenote_markdown_render_duration_seconds",
+    "Time taken to render Markdown to HTML.",
+    buckets=FAST_BUCKETS,
+)
+
+
+def observe_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper that records query durations.
+    """
+    with DB_QUERY_DURATION.time():
+        return execute(sql, params, many, context)
+
+
+def status_class(status_code):
+    """
+    Collapse a status code to its class (2xx, 4xx...) to keep label
+    cardinality low.
+    """
+    return f"{status_code // 100}xx"
+
+
+def render_metrics():
+    """
+    Render all metrics in the Prometheus text format, aggregated across
+    worker processes when running in multiprocess mode.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
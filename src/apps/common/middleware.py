@@ -0,0 +1,212 @@
+"""Project-wide middleware."""
+
+import cProfile
+import logging
+import re
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.urls import reverse
+from django_ratelimit.core import is_ratelimited
+
+from .constants import LoggingConfig, ProfilingConfig, ReplicaConfig
+
+from .instrumentation import collect_timings, install_template_timing, time_query
+from .log import request_context, set_user_id
+from .metrics import REQUEST_LATENCY, observe_query, status_class
+from .profiling import profile_requested, profiler_lock, save_profile
+from .replicas import is_pinned, replica_routing, replicas_enabled
+
+
+access_logger = logging.getLogger("src.apps.common.access")
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_PATTERN = re.compile(LoggingConfig.REQUEST_ID_PATTERN)
+
+
+class RequestContextMiddleware:
+    """
+    Give each request an ID, taken from the X-Request-ID header when the
+    proxy sets one, and tag every log record emitted while handling it
+    with the request ID and the user's ID. The ID is echoed back in the
+    response so client reports can be matched to log lines.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.headers.get(LoggingConfig.REQUEST_ID_HEADER, "")
+        if not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.id = request_id
+
+        with request_context(request_id):
+            response = self.get_response(request)
+
+        response[LoggingConfig.REQUEST_ID_HEADER] = request_id
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # By now the authentication middleware has run. Views load the
+        # user anyway, so this doesn't add a query.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            set_user_id(user.pk)
+
+
+class InstrumentationMiddleware:
+    """
+    Record query count, DB time, template render time and Markdown
+    render time for each request. The totals are sent back in a
+    Server-Timing header and logged as structured fields.
+
+    Removed from the middleware chain entirely unless
+    INSTRUMENTATION_ENABLED is set.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, "INSTRUMENTATION_ENABLED", False):
+            raise MiddlewareNotUsed
+
+        install_template_timing()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with collect_timings() as timings, ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(time_query))
+            response = self.get_response(request)
+
+        response["Server-Timing"] = timings.server_timing()
+        access_logger.info(
+            "%s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                **timings.as_log_fields(),
+            },
+        )
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Record request latency per URL name and the duration of every
+    database query in Prometheus histograms.
+
+    Removed from the middleware chain entirely unless METRICS_ENABLED
+    is set.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(observe_query))
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        REQUEST_LATENCY.labels(
+            view=match.view_name if match else "<unresolved>",
+            method=request.method,
+            status=status_class(response.status_code),
+        ).observe(time.perf_counter() - start)
+
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Run a single request under cProfile when a staff user asks for it
+    with the _profile query parameter or the X-Profile header. The stats
+    file is saved to PROFILING_DIR and linked in the X-Profile-URL
+    response header.
+
+    Profiles are capped per user by ProfilingConfig.RATE, and only one
+    request per process is profiled at a time. Requests that don't ask
+    to be profiled pass straight through.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profile_requested(request) or not request.user.is_staff:
+            return self.get_response(request)
+
+        if is_ratelimited(
+            request,
+            group=ProfilingConfig.RATELIMIT_GROUP,
+            key="user",
+            rate=ProfilingConfig.RATE,
+            increment=True,
+        ):
+            logger.warning("Profiling rate limit reached for user %s", request.user.pk)
+            return self.get_response(request)
+
+        if not profiler_lock.acquire(blocking=False):
+            logger.warning("Profiler busy, not profiling request for user %s", request.user.pk)
+            return self.get_response(request)
+
+        try:
+            profiler = cProfile.Profile()
+            response = profiler.runcall(self.get_response, request)
+        finally:
+            profiler_lock.release()
+
+        # The response is ready; a profile that can't be saved shouldn't
+        # turn it into an error
+        try:
+            name = save_profile(profiler)
+        except OSError:
+            logger.exception("Couldn't save profile for user %s", request.user.pk)
+            return response
+
+        response[ProfilingConfig.RESPONSE_HEADER] = reverse("common:profile", args=[name])
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Track each request's database routing (see common.replicas), and
+    pin clients that wrote to the primary there for a little while, so
+    they read their own writes.
+
+    Removed from the middleware chain entirely unless DATABASE_REPLICAS
+    lists any replicas.
+    """
+    def __init__(self, get_response):
+        if not replicas_enabled():
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with replica_routing(is_pinned(request)) as routing:
+            response = self.get_response(request)
+
+        if routing["wrote"]:
+            response.set_cookie(
+                ReplicaConfig.STICKY_COOKIE,
+                str(time.time() + ReplicaConfig.STICKY_SECONDS),
+                max_age=ReplicaConfig.STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
@@ -0,0 +1,71 @@
+"""On-demand cProfile profiling of individual requests."""
+
+import secrets
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .constants import ProfilingConfig
+
+
+# Only one cProfile profiler can be active in a process at a time (from
+# Python 3.12), so profiled requests take turns. Requests that find it
+# taken aren't profiled.
+profiler_lock = threading.Lock()
+
+
+def profile_requested(request):
+    """
+    Return True if the request asks to be profiled. Only looks at the
+    query string and headers, so it costs nothing for normal requests.
+    """
+    return (
+        ProfilingConfig.QUERY_PARAM in request.GET
+        or ProfilingConfig.REQUEST_HEADER in request.headers
+    )
+
+
+def profile_path(name):
+    """
+    Return the path of the stats file for a profile name.
+    """
+    return Path(settings.PROFILING_DIR) / f"{name}{ProfilingConfig.EXTENSION}"
+
+
+def save_profile(profiler):
+    """
+    Dump the profiler's stats in pstats format and return the profile's
+    name. Open the file with `python -m pstats`, snakeviz or speedscope.
+    """
+    name = f"{timezone.now():%Y%m%d-%H%M%S}-{secrets.token_hex(4)}"
+    path = profile_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(path)
+    prune_profiles()
+    return name
+
+
+def prune_profiles():
+    """
+    Delete saved profiles beyond the newest ProfilingConfig.KEEP, and
+    any older than ProfilingConfig.MAX_AGE.
+    """
+    directory = Path(settings.PROFILING_DIR)
+    cutoff = time.time() - ProfilingConfig.MAX_AGE.total_seconds()
+
+    # Every worker prunes the same directory, so any file may already be
+    # gone by the time it's looked at
+    profiles = []
+    for path in directory.glob(f"*{ProfilingConfig.EXTENSION}"):
+        try:
+            profiles.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    profiles.sort(reverse=True)
+
+    for index, (mtime, path) in enumerate(profiles):
+        if index >= ProfilingConfig.KEEP or mtime < cutoff:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,214 @@
+"""
+Read replicas.
+
+Views marked with ReplicaReadMixin read from one of the replicas in
+DATABASE_REPLICAS when they're handling a GET or HEAD. Everything else,
+and every write, goes to the primary (default). Reads inside a
+transaction or after the request has written stay on the primary, and
+so do database cache lookups, which have to see the cache's own writes.
+Anything rendered for the shared cache is read under read_from_primary:
+the cache serves it to every later request, the writer's included.
+
+Read-your-writes: when a request writes to the primary,
+ReplicaRoutingMiddleware pins the client to the primary for
+ReplicaConfig.STICKY_SECONDS with a cookie. Their next few requests
+then read what they've just written, whichever worker serves them.
+
+Replicas more than ReplicaConfig.MAX_LAG seconds behind, or that can't
+be reached, are skipped. Each process checks a replica's lag at most
+every ReplicaConfig.LAG_CHECK_INTERVAL seconds. With no replica fit to
+use, reads go to the primary.
+"""
+
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from .constants import ReplicaConfig
+
+
+logger = logging.getLogger(__name__)
+
+_routing = ContextVar("replica_routing", default=None)
+
+# {alias: (checked_at, lag)} for this process, lag None if unreachable
+_lag_checks = {}
+_lag_checks_lock = threading.Lock()
+
+LAG_QUERY = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+def replicas_enabled():
+    return bool(getattr(settings, "DATABASE_REPLICAS", None))
+
+
+def measure_lag(alias):
+    """
+    Return how many seconds the replica is behind the primary, or None
+    if it can't be reached. Only PostgreSQL reports replica lag; other
+    databases are taken to be up to date.
+    """
+    connection = connections[alias]
+    try:
+        if connection.vendor != "postgresql":
+            connection.ensure_connection()
+            return 0.0
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_QUERY)
+            lag = cursor.fetchone()[0]
+    except DatabaseError:
+        logger.warning("Replica %s is unreachable", alias, exc_info=True)
+        return None
+    # No replay timestamp yet: the replica hasn't replayed anything
+    return float(lag) if lag is not None else None
+
+
+def replica_lag(alias):
+    """
+    Return the replica's lag, measuring it again if the last check is
+    more than LAG_CHECK_INTERVAL old.
+    """
+    now = time.monotonic()
+    checked_at, lag = _lag_checks.get(alias, (None, None))
+    if checked_at is not None and now - checked_at < ReplicaConfig.LAG_CHECK_INTERVAL:
+        return lag
+
+    with _lag_checks_lock:
+        # Another thread may have measured it in the meantime
+        checked_at, lag = _lag_checks.get(alias, (None, None))
+        if checked_at is None or now - checked_at >= ReplicaConfig.LAG_CHECK_INTERVAL:
+            lag = measure_lag(alias)
+            _lag_checks[alias] = (time.monotonic(), lag)
+    return lag
+
+
+def choose_replica():
+    """
+    Return the alias of a random replica that's caught up, or None if
+    there isn't one.
+    """
+    usable = [
+        alias for alias in settings.DATABASE_REPLICAS
+        if (lag := replica_lag(alias)) is not None and lag <= ReplicaConfig.MAX_LAG
+    ]
+    return random.choice(usable) if usable else None
+
+
+def is_pinned(request):
+    """
+    Return True if the client wrote recently enough to be kept on the
+    primary.
+    """
+    try:
+        pinned_until = float(request.COOKIES.get(ReplicaConfig.STICKY_COOKIE, 0))
+    except ValueError:
+        return False
+    return pinned_until > time.time()
+
+
+@contextmanager
+def replica_routing(pinned):
+    """
+    Track the routing of one request: whether it may read from a
+    replica and whether it has written to the primary. Yields the
+    request's routing state.
+    """
+    state = {"pinned": pinned, "replica": None, "wrote": False}
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+def use_replica():
+    """
+    Send the rest of the current request's reads to a replica, unless
+    the client is pinned to the primary or no replica is caught up.
+    Template responses render after the view returns, so this lasts
+    until the response is done rather than just the view.
+    """
+    state = _routing.get()
+    if state is None or state["pinned"] or not replicas_enabled():
+        return
+    state["replica"] = choose_replica()
+
+
+@contextmanager
+def read_from_primary():
+    """
+    Send the current request's reads to the primary for the duration,
+    for results that outlive the request, like shared cache entries,
+    and so mustn't be stale.
+    """
+    state = _routing.get()
+    if state is None:
+        yield
+        return
+
+    replica = state["replica"]
+    state["replica"] = None
+    try:
+        yield
+    finally:
+        state["replica"] = replica
+
+
+class ReplicaReadMixin:
+    """
+    Mixin for read-only views whose GET and HEAD requests can be served
+    from a replica. List it first, so the replica also serves the
+    session and user lookups.
+    """
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in ("GET", "HEAD"):
+            use_replica()
+        return super().dispatch(request, *args, **kwargs)
+
+
+class ReplicaRouter:
+    """
+    Database router sending reads to the request's replica, if it has
+    one, and writes to the primary.
+    """
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or state["replica"] is None:
+            return None
+        if (
+            state["wrote"]
+            or model._meta.app_label in ReplicaConfig.PRIMARY_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return state["replica"]
+
+    def db_for_write(self, model, **hints):
+        # Instances read from a replica are saved to the primary too
+        state = _routing.get()
+        if state is not None and model._meta.app_label not in ReplicaConfig.PRIMARY_APPS:
+            state["wrote"] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        databases = {DEFAULT_DB_ALIAS, *getattr(settings, "DATABASE_REPLICAS", [])}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in getattr(settings, "DATABASE_REPLICAS", []):
+            return False
+        return None
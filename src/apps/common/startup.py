@@ -0,0 +1,66 @@
+"""
+Startup profiling: where a worker's boot time goes.
+
+The entry point is imported in a fresh interpreter run with
+`-X importtime`, since everything is already imported in the process
+asking. Each import's own and cumulative time are read from its
+report, along with how long the entry point took to import, which for
+config.wsgi is the time until a worker is ready for requests.
+"""
+
+import subprocess
+import sys
+
+from django.conf import settings
+
+from .constants import StartupProfileConfig
+
+
+IMPORTTIME_PREFIX = "import time:"
+READY_PREFIX = "ready in:"
+
+# Run in the profiled interpreter; prints the time to import the module
+READY_SCRIPT = f"""
+import sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+print("{READY_PREFIX}", time.perf_counter() - start, flush=True)
+"""
+
+
+def parse_importtime(output):
+    """
+    Parse the report written by `-X importtime` into (module, self_us,
+    cumulative_us) tuples, in the order the imports finished.
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+        self_us, cumulative_us, name = line.removeprefix(IMPORTTIME_PREFIX).split("|")
+        if not self_us.strip().isdigit():
+            # The header line
+            continue
+        timings.append((name.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+def profile_startup(module=StartupProfileConfig.MODULE):
+    """
+    Import module in a fresh interpreter with the current settings.
+    Returns (ready_seconds, imports), with imports as parsed by
+    parse_importtime.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", READY_SCRIPT, module],
+        cwd=settings.BASE_DIR,
+        capture_output=True,
+        text=True,
+        timeout=StartupProfileConfig.TIMEOUT,
+        check=True,
+    )
+    ready_line = next(
+        line for line in result.stdout.splitlines() if line.startswith(READY_PREFIX)
+    )
+    ready_seconds = float(ready_line.removeprefix(READY_PREFIX))
+    return ready_seconds, parse_importtime(result.stderr)
@@ -1,7 +1,12 @@
 from django import template
 from django.template.defaultfilters import stringfilter
 
-import markdown as md
+from ..imports import lazy_import
+from ..instrumentation import track
+from ..metrics import MARKDOWN_RENDER_DURATION
+
+# Only loaded when something is first rendered as Markdown
+md = lazy_import("markdown")
 
 register = template.Library()
 
@@ -9,4 +14,5 @@ register = template.Library()
 @register.filter()
 @stringfilter
 def markdown(value):
-    return md.markdown(value, extensions=["markdown.extensions.fenced_code"])
+    with track("markdown_time"), MARKDOWN_RENDER_DURATION.time():
+        return md.markdown(value, extensions=["markdown.extensions.fenced_code"])
@@ -0,0 +1,134 @@
+"""Test helpers for pinning the number of queries a view issues."""
+
+import re
+from collections import Counter
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+
+STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+IN_LIST_PATTERN = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|'[^']*'|\d+)\s*,?)+\)", re.IGNORECASE)
+SAVEPOINT_PATTERN = re.compile(r"^\s*(?:SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE)
+
+
+def normalize_sql(sql):
+    """
+    Reduce a query to its shape by replacing literals and IN lists, so
+    the same query with different parameters compares equal.
+    """
+    shape = STRING_LITERAL_PATTERN.sub("?", sql)
+    shape = NUMBER_LITERAL_PATTERN.sub("?", shape)
+    shape = IN_LIST_PATTERN.sub("IN (...)", shape)
+    return " ".join(shape.split())
+
+
+def app_queries(queries):
+    """
+    Drop savepoints from captured queries. Database cache lookups are
+    kept: without Redis the cache is a table in production too, and
+    every lookup is a round trip.
+    """
+    return [query for query in queries if not SAVEPOINT_PATTERN.match(query["sql"])]
+
+
+def is_cache_query(query):
+    cache_tables = [
+        cache["LOCATION"] for cache in settings.CACHES.values()
+        if cache["BACKEND"].endswith("DatabaseCache")
+    ]
+    return any(table in query["sql"] for table in cache_tables)
+
+
+def repeated_query_shapes(queries, threshold):
+    """
+    Return {shape: count} for query shapes that ran at least threshold
+    times. Savepoints are ignored, and so are cache lookups, which
+    share a shape whatever their key.
+    """
+    shapes = Counter(
+        normalize_sql(query["sql"]) for query in app_queries(queries)
+        if not is_cache_query(query)
+    )
+    return {shape: count for shape, count in shapes.items() if count >= threshold}
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin that pins views to the query_budget declared on the
+    view class, and fails on N+1 patterns: the same query shape issued
+    repeatedly within one request.
+
+    A budget is the exact number of queries the view runs, so a request
+    that runs fewer fails too, until the budget is lowered to match. It
+    is either a number, or a dict of numbers by request method for views
+    whose methods run different queries.
+    """
+    n_plus_one_threshold = 3
+
+    def get_query_budget(self, url, method="get"):
+        view_class = resolve(urlparse(url).path).func.view_class
+        budget = getattr(view_class, "query_budget", None)
+        if isinstance(budget, dict):
+            budget = budget.get(method.upper())
+        if budget is None:
+            self.fail(f"{view_class.__name__} does not declare a query_budget for {method.upper()}.")
+        return budget
+
+    def request_with_queries(self, url, method="get", data=None, **extra):
+        """
+        Make a request and return the response with the queries it ran.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, data, **extra)
+        return response, context.captured_queries
+
+    def assertNoNPlusOne(self, queries):
+        repeated = repeated_query_shapes(queries, self.n_plus_one_threshold)
+        if repeated:
+            details = "\n".join(f"{count}x {shape}" for shape, count in repeated.items())
+            self.fail(f"Repeated query shapes (possible N+1):\n{details}")
+
+    def assertWithinQueryBudget(self, url, method="get", data=None, budget=None, **extra):
+        """
+        Assert that a request runs exactly its view's query budget, or
+        the budget given for requests that take a lighter path through
+        the view (e.g. htmx fragments), and issues no repeated query
+        shapes. Returns the response and the number of queries it ran.
+        """
+        if budget is None:
+            budget = self.get_query_budget(url, method)
+        response, queries = self.request_with_queries(url, method, data, **extra)
+        queries = app_queries(queries)
+
+        if len(queries) != budget:
+            details = "\n".join(q["sql"] for q in queries)
+            if len(queries) < budget:
+                self.fail(
+                    f"{url} ran {len(queries)} queries, under its budget of {budget}; "
+                    f"lower the budget to pin the new count:\n{details}"
+                )
+            self.fail(f"{url} ran {len(queries)} queries, budget is {budget}:\n{details}")
+
+        self.assertNoNPlusOne(queries)
+        return response, len(queries)
+
+    def assertQueryCountConstant(self, url, populate, sizes=(1, 100), budget=None, **extra):
+        """
+        Assert that a request runs the same number of queries, its
+        budget, whatever the amount of data. populate(size) is called
+        before each request to bring the data up to size rows.
+        """
+        counts = {}
+        for size in sizes:
+            populate(size)
+            _, counts[size] = self.assertWithinQueryBudget(url, budget=budget, **extra)
+
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f"Query count for {url} grows with data size: {counts}"
+        )
@@ -1,7 +1,62 @@
 """Tests for common app."""
 
-from django.template import Context, Template
-from django.test import TestCase
+import io
+import json
+import logging
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from importlib import reload
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles import finders
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.template import Context, Template, engines
+from django.templatetags.static import static
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from src.apps.common import replicas, warmup
+from src.apps.common.admin import EstimatedCountPaginator, estimated_count
+from src.apps.common.assets import join_css, minify_css
+from src.apps.common.cache import LocalLRU, TieredCache, tiered_cache
+from src.apps.common.constants import AdminConfig, CacheConfig, LoggingConfig, ProfilingConfig, ReplicaConfig
+from src.apps.common.htmx import render_blocks
+from src.apps.common.ids import uuid7
+from src.apps.common.imports import lazy_import
+from src.apps.common.instrumentation import collect_timings, track
+from src.apps.common.log import (
+    AsyncStreamHandler,
+    JSONFormatter,
+    RequestContextFilter,
+    SamplingFilter,
+    request_context,
+    set_user_id,
+)
+from src.apps.common.profiling import profile_path, profiler_lock, prune_profiles
+from src.apps.common.startup import parse_importtime, profile_startup
+from src.apps.common.testing import QueryBudgetMixin, normalize_sql, repeated_query_shapes
+from src.apps.common.views import ReadinessView
+from src.apps.common.warmup import find_templates, warm_up, warm_up_templates
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+from src.apps.notes.views import NotesListView
+from src.apps.pages.utils.auth_utils import send_passcode_email
+
+
+User = get_user_model()
 
 
 class MarkdownFilterTest(TestCase):
@@ -114,3 +169,998 @@ class MarkdownFilterTest(TestCase):
         self.assertIn("<h1>H1</h1>", result)
         self.assertIn("<h2>H2</h2>", result)
         self.assertIn("<h3>H3</h3>", result)
+
+
+class TrackTest(TestCase):
+    """Tests for the track context manager."""
+
+    def test_track_outside_request_is_noop(self):
+        """Test that tracking without active timings does nothing."""
+        with track("markdown_time"):
+            pass
+
+    def test_markdown_filter_records_render_time(self):
+        """Test that the markdown filter adds to the Markdown timing."""
+        template = Template("{% load markdown_extras %}{{ content|markdown|safe }}")
+
+        with collect_timings() as timings:
+            template.render(Context({"content": "# Hello"}))
+
+        self.assertGreater(timings.markdown_time, 0)
+
+
+@override_settings(INSTRUMENTATION_ENABLED=True)
+class InstrumentationMiddlewareTest(TestCase):
+    """Tests for the InstrumentationMiddleware."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+        JournalEntry.objects.create(content="**Hello**", author=self.user)
+        self.client.force_login(self.user)
+
+    def test_server_timing_header(self):
+        """Test that responses carry a Server-Timing header."""
+        response = self.client.get("/journal/")
+        header = response["Server-Timing"]
+
+        for metric in ("db;dur=", "tpl;dur=", "md;dur=", "total;dur="):
+            self.assertIn(metric, header)
+
+    def test_query_count_is_reported(self):
+        """Test that the query count matches the queries executed."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/journal/")
+        self.assertIn(f'desc="{len(queries)} queries"', response["Server-Timing"])
+
+    def test_access_log_has_structured_fields(self):
+        """Test that the access log record carries the timings."""
+        with self.assertLogs("src.apps.common.access", level="INFO") as logs:
+            self.client.get("/journal/")
+
+        record = logs.records[0]
+        self.assertEqual(record.status, 200)
+        self.assertGreater(record.db_queries, 0)
+        self.assertGreater(record.markdown_ms, 0)
+        self.assertGreater(record.template_ms, 0)
+
+    @override_settings(INSTRUMENTATION_ENABLED=False)
+    def test_disabled_instrumentation_adds_nothing(self):
+        """Test that no header is added when instrumentation is off."""
+        response = self.client.get("/journal/")
+        self.assertNotIn("Server-Timing", response)
+
+
+class QueryShapeTest(TestCase):
+    """Tests for the N+1 detection helpers."""
+
+    def test_normalize_sql_ignores_parameters(self):
+        """Test that queries differing only in literals share a shape."""
+        first = normalize_sql("SELECT * FROM note WHERE id = 1 AND title = 'a'")
+        second = normalize_sql("SELECT * FROM note WHERE id = 22 AND title = 'b'")
+        self.assertEqual(first, second)
+
+    def test_normalize_sql_collapses_in_lists(self):
+        """Test that IN lists of any length share a shape."""
+        self.assertEqual(
+            normalize_sql("SELECT * FROM note WHERE id IN (1, 2, 3)"),
+            normalize_sql("SELECT * FROM note WHERE id IN (4)"),
+        )
+
+    def test_repeated_query_shapes(self):
+        """Test that only shapes at or above the threshold are flagged."""
+        queries = [{"sql": f"SELECT * FROM auth_user WHERE id = {num}"} for num in range(3)]
+        queries.append({"sql": "SELECT * FROM note"})
+        queries.append({"sql": 'SAVEPOINT "s1"'})
+
+        repeated = repeated_query_shapes(queries, threshold=3)
+        self.assertEqual(list(repeated.values()), [3])
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN="scrape-token")
+class MetricsTest(TestCase):
+    """Tests for the Prometheus metrics and exposition endpoint."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+
+    def sample(self, name, labels=None):
+        return REGISTRY.get_sample_value(name, labels or {}) or 0
+
+    def test_request_latency_is_labelled_by_view(self):
+        """Test that requests are observed under their URL name."""
+        self.client.force_login(self.user)
+        labels = {"view": "journal:home", "method": "GET", "status": "2xx"}
+        before = self.sample("littlenote_request_duration_seconds_count", labels)
+
+        self.client.get("/journal/")
+
+        after = self.sample("littlenote_request_duration_seconds_count", labels)
+        self.assertEqual(after, before + 1)
+
+    def test_queries_are_observed(self):
+        """Test that database query durations are recorded."""
+        self.client.force_login(self.user)
+        before = self.sample("littlenote_db_query_duration_seconds_count")
+        self.client.get("/journal/")
+        self.assertGreater(self.sample("littlenote_db_query_duration_seconds_count"), before)
+
+    def test_email_send_duration_is_observed(self):
+        """Test that passcode emails are timed by transport."""
+        labels = {"transport": "smtp"}
+        before = self.sample("littlenote_email_send_duration_seconds_count", labels)
+        with override_settings(RESEND_API_KEY=""):
+            send_passcode_email("testuser@example.com", "123456")
+        after = self.sample("littlenote_email_send_duration_seconds_count", labels)
+        self.assertEqual(after, before + 1)
+
+    def test_endpoint_requires_token_or_staff(self):
+        """Test that anonymous and non-staff requests are refused."""
+        self.assertEqual(self.client.get("/metrics/").status_code, 403)
+
+        response = self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get("/metrics/").status_code, 403)
+
+    def test_endpoint_accepts_bearer_token(self):
+        """Test that the scrape token grants access."""
+        response = self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer scrape-token")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"littlenote_request_duration_seconds", response.content)
+
+    def test_endpoint_allows_staff(self):
+        """Test that staff users can view the metrics."""
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get("/metrics/").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_empty_token_is_never_accepted(self):
+        """Test that an unset token doesn't allow empty credentials."""
+        response = self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer ")
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(PROFILING_ENABLED=True)
+class ProfilingTest(TestCase):
+    """Tests for the on-demand request profiler."""
+
+    def setUp(self):
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profile_dir.cleanup)
+        settings_override = override_settings(PROFILING_DIR=self.profile_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        tiered_cache.clear()
+
+        self.user = User.objects.create_user(
+            username="staff@example.com",
+            email="staff@example.com",
+            is_staff=True,
+        )
+        self.client.force_login(self.user)
+
+    def profile_name(self, response):
+        return response[ProfilingConfig.RESPONSE_HEADER].rstrip("/").rsplit("/", 1)[-1]
+
+    def test_normal_requests_are_not_profiled(self):
+        """Test that requests without the flag pass through untouched."""
+        response = self.client.get("/journal/")
+        self.assertNotIn(ProfilingConfig.RESPONSE_HEADER, response)
+
+    def test_query_param_saves_linked_profile(self):
+        """Test that ?_profile saves a pstats file and links it."""
+        response = self.client.get("/journal/?_profile")
+        self.assertEqual(response.status_code, 200)
+
+        path = profile_path(self.profile_name(response))
+        self.assertTrue(path.is_file())
+        self.assertGreater(pstats.Stats(str(path)).total_calls, 0)
+
+    def test_header_triggers_profile(self):
+        """Test that the X-Profile header also triggers profiling."""
+        response = self.client.get("/journal/", HTTP_X_PROFILE="1")
+        self.assertIn(ProfilingConfig.RESPONSE_HEADER, response)
+
+    def test_non_staff_cannot_profile(self):
+        """Test that regular users are never profiled."""
+        self.user.is_staff = False
+        self.user.save()
+        response = self.client.get("/journal/?_profile")
+        self.assertNotIn(ProfilingConfig.RESPONSE_HEADER, response)
+
+    def test_profiles_are_rate_capped(self):
+        """Test that profiling stops once the cap is reached."""
+        limit = int(ProfilingConfig.RATE.split("/")[0])
+        for _ in range(limit):
+            response = self.client.get("/journal/?_profile")
+            self.assertIn(ProfilingConfig.RESPONSE_HEADER, response)
+
+        with self.assertLogs("src.apps.common.middleware", level="WARNING"):
+            response = self.client.get("/journal/?_profile")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(ProfilingConfig.RESPONSE_HEADER, response)
+
+    def test_profile_download_is_staff_only(self):
+        """Test that saved profiles can only be downloaded by staff."""
+        url = self.client.get("/journal/?_profile")[ProfilingConfig.RESPONSE_HEADER]
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment", response["Content-Disposition"])
+
+        self.user.is_staff = False
+        self.user.save()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_one_profile_at_a_time(self):
+        """Test that a request arriving while another is profiled runs unprofiled."""
+        with profiler_lock, self.assertLogs("src.apps.common.middleware", level="WARNING"):
+            response = self.client.get("/journal/?_profile")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(ProfilingConfig.RESPONSE_HEADER, response)
+
+    @patch.object(ProfilingConfig, "KEEP", 2)
+    def test_old_profiles_are_pruned(self):
+        """Test that only the newest profiles are kept, and none past the maximum age."""
+        stale = profile_path("stale")
+        stale.touch()
+        expired_at = time.time() - ProfilingConfig.MAX_AGE.total_seconds() - 60
+        os.utime(stale, (expired_at, expired_at))
+
+        for _ in range(3):
+            self.client.get("/journal/?_profile")
+
+        self.assertFalse(stale.exists())
+        self.assertEqual(len(list(Path(self.profile_dir.name).iterdir())), 2)
+
+    @patch.object(ProfilingConfig, "KEEP", 1)
+    def test_pruning_skips_profiles_removed_by_another_worker(self):
+        """Test that a profile deleted mid-prune is skipped, not an error."""
+        for name in ("first", "second", "third"):
+            profile_path(name).touch()
+        gone = profile_path("second")
+        stat = Path.stat
+
+        def stat_after_removal(path, *args, **kwargs):
+            if path == gone:
+                path.unlink(missing_ok=True)
+            return stat(path, *args, **kwargs)
+
+        with patch.object(Path, "stat", stat_after_removal):
+            prune_profiles()
+
+        self.assertEqual(len(list(Path(self.profile_dir.name).iterdir())), 1)
+
+    def test_failed_save_keeps_response(self):
+        """Test that a profile that can't be saved leaves the response alone."""
+        with (
+            patch("src.apps.common.middleware.save_profile", side_effect=OSError),
+            self.assertLogs("src.apps.common.middleware", level="ERROR"),
+        ):
+            response = self.client.get("/journal/?_profile")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(ProfilingConfig.RESPONSE_HEADER, response)
+
+    def test_missing_profile_returns_404(self):
+        """Test that unknown profile names are not found."""
+        self.assertEqual(self.client.get("/profiles/missing/").status_code, 404)
+
+
+class StructuredLoggingTest(TestCase):
+    """Tests for JSON logging and request context."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+
+    def make_record(self, **extra):
+        record = logging.LogRecord("src.apps.test", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+        record.__dict__.update(extra)
+        return record
+
+    def test_json_formatter_includes_extra_fields(self):
+        """Test that records render as JSON with their extra fields."""
+        entry = json.loads(JSONFormatter().format(self.make_record(status=200)))
+
+        self.assertEqual(entry["message"], "hello world")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["status"], 200)
+        self.assertNotIn("args", entry)
+
+    def test_request_context_filter(self):
+        """Test that records are tagged with the request and user IDs."""
+        record = self.make_record()
+        with request_context("abc123"):
+            set_user_id(42)
+            RequestContextFilter().filter(record)
+
+        self.assertEqual(record.request_id, "abc123")
+        self.assertEqual(record.user_id, 42)
+        self.assertIsNotNone(record.elapsed_ms)
+
+    def test_request_context_filter_outside_request(self):
+        """Test that records outside a request get empty context."""
+        record = self.make_record()
+        RequestContextFilter().filter(record)
+        self.assertIsNone(record.request_id)
+
+    def test_sampling_filter(self):
+        """Test that the sample rate bounds which records are kept."""
+        self.assertFalse(SamplingFilter(rate=0).filter(self.make_record()))
+
+        record = self.make_record()
+        self.assertTrue(SamplingFilter(rate=1).filter(record))
+        self.assertEqual(record.sample_rate, 1.0)
+
+    def test_async_handler_writes_json_lines(self):
+        """Test that the handler writes formatted records off-thread."""
+        stream = io.StringIO()
+        handler = AsyncStreamHandler(stream)
+        handler.setFormatter(JSONFormatter())
+        handler.handle(self.make_record())
+        handler.close()
+
+        self.assertEqual(json.loads(stream.getvalue())["message"], "hello world")
+
+    def test_async_handler_drops_when_full(self):
+        """Test that a full queue drops records instead of blocking, and counts them in a metric."""
+        before = REGISTRY.get_sample_value("littlenote_log_records_dropped_total") or 0
+        handler = AsyncStreamHandler(io.StringIO(), queue_size=1)
+        handler.listener.stop()
+        handler.handle(self.make_record())
+        handler.handle(self.make_record())
+
+        self.assertEqual(handler.dropped, 1)
+        self.assertEqual(REGISTRY.get_sample_value("littlenote_log_records_dropped_total"), before + 1)
+        handler.listener.start()
+        handler.close()
+
+    @override_settings(INSTRUMENTATION_ENABLED=True)
+    def test_middleware_tags_request_logs(self):
+        """Test that request logs carry the request ID and user ID."""
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.addFilter(RequestContextFilter())
+        handler.setFormatter(JSONFormatter())
+        access_logger = logging.getLogger("src.apps.common.access")
+        access_logger.addHandler(handler)
+        access_logger.setLevel(logging.INFO)
+        self.addCleanup(access_logger.setLevel, logging.NOTSET)
+        self.addCleanup(access_logger.removeHandler, handler)
+
+        self.client.force_login(self.user)
+        response = self.client.get("/journal/", HTTP_X_REQUEST_ID="req-1")
+
+        self.assertEqual(response[LoggingConfig.REQUEST_ID_HEADER], "req-1")
+        entry = json.loads(stream.getvalue().splitlines()[-1])
+        self.assertEqual(entry["request_id"], "req-1")
+        self.assertEqual(entry["user_id"], self.user.pk)
+        self.assertIn("duration_ms", entry)
+
+    def test_invalid_request_id_is_replaced(self):
+        """Test that malformed incoming request IDs are not trusted."""
+        response = self.client.get("/", HTTP_X_REQUEST_ID="bad id\n")
+        self.assertRegex(response[LoggingConfig.REQUEST_ID_HEADER], r"^[0-9a-f]{32}$")
+
+
+@override_settings(CACHES={
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+})
+class TieredCacheTest(TestCase):
+    """Tests for the two-tier cache."""
+
+    def setUp(self):
+        self.cache = TieredCache(max_entries=2)
+        self.cache.clear()
+
+    def test_local_lru_is_bounded(self):
+        """Test that the least recently used entry is evicted."""
+        lru = LocalLRU(max_entries=2, timeout=60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        self.assertEqual(lru.get("a"), 1)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(len(lru), 2)
+
+    def test_local_lru_entries_expire(self):
+        """Test that local entries expire after their timeout."""
+        lru = LocalLRU(max_entries=2, timeout=0)
+        lru.set("a", 1)
+        self.assertIsNone(lru.get("a"))
+
+    def test_shared_hits_fill_local_tier(self):
+        """Test that values from the shared tier are kept locally."""
+        self.cache.shared.set("key", "value")
+
+        self.assertEqual(self.cache.get("key"), "value")
+        self.assertEqual(self.cache.get("key"), "value")
+        self.assertIsNone(self.cache.get("missing"))
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["shared_hit"], 1)
+        self.assertEqual(stats["local_hit"], 1)
+        self.assertEqual(stats["miss"], 1)
+        self.assertAlmostEqual(stats["hit_ratio"], 2 / 3)
+
+    def test_cached_none_is_a_hit(self):
+        """Test that None can be cached without recomputing."""
+        calls = []
+        self.cache.get_or_set("key", lambda: calls.append(1))
+        self.cache.get_or_set("key", lambda: calls.append(1))
+        self.assertEqual(len(calls), 1)
+
+    def test_bump_version_changes_keys(self):
+        """Test that bumping a namespace moves it to new keys."""
+        before = self.cache.versioned_key("notes", "page1")
+        self.cache.set(before, "old")
+
+        self.cache.bump_version("notes")
+        after = self.cache.versioned_key("notes", "page1")
+
+        self.assertNotEqual(before, after)
+        self.assertIsNone(self.cache.get(after))
+
+    def test_bump_version_survives_eviction(self):
+        """Test that a lost version key restarts at a new version."""
+        version = self.cache.get_version("notes")
+        self.cache.shared.clear()
+        self.assertGreater(self.cache.bump_version("notes"), version)
+
+    def test_concurrent_misses_compute_once(self):
+        """Test that concurrent misses for a key share one compute."""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_set("key", compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 5)
+
+
+@override_settings(CACHES={
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "littlenote_cache",
+    },
+})
+class DatabaseVersionBumpTest(TestCase):
+    """Tests for version bumps with the database cache."""
+
+    def test_database_version_bumps_lock_the_row(self):
+        """Test that a bump locks the version row before reading it, and keeps it from expiring."""
+        cache = TieredCache()
+        version = cache.get_version("notes")
+        statements = []
+
+        def record(execute, sql, params, many, context):
+            if "littlenote_cache" in sql:
+                statements.append(sql)
+            # SQLite has no row locks to take
+            if "FOR UPDATE" not in sql:
+                return execute(sql, params, many, context)
+
+        with patch.object(connection.features, "has_select_for_update", True), \
+                connection.execute_wrapper(record):
+            self.assertEqual(cache.bump_version("notes"), version + 1)
+
+        self.assertIn("FOR UPDATE", statements[0])
+        self.assertEqual(cache.get_version("notes"), version + 1)
+
+        key = cache.shared.make_and_validate_key(CacheConfig.VERSION_KEY.format(name="notes"))
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT expires FROM littlenote_cache WHERE cache_key = %s", [key])
+            [(expires,)] = cursor.fetchall()
+        self.assertEqual(expires.year, 9999)
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    """
+    Tests for the admin's estimated count paginator.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser@example.com")
+        JournalEntry.objects.create(content="Hello", author=self.user)
+        self.queryset = JournalEntry.objects.order_by("-created_at")
+
+    def test_counts_exactly_without_estimate(self):
+        """Test that tables without an estimate are counted."""
+        self.assertIsNone(estimated_count(self.queryset))
+        self.assertEqual(EstimatedCountPaginator(self.queryset, 10).count, 1)
+
+    def test_large_tables_use_estimate(self):
+        """Test that the estimate is used for large tables."""
+        estimate = AdminConfig.ESTIMATE_THRESHOLD * 10
+        with patch("src.apps.common.admin.estimated_count", return_value=estimate):
+            with self.assertNumQueries(0):
+                self.assertEqual(EstimatedCountPaginator(self.queryset, 10).count, estimate)
+
+    def test_small_tables_are_counted(self):
+        """Test that small estimates are replaced by an exact count."""
+        with patch("src.apps.common.admin.estimated_count", return_value=5):
+            self.assertEqual(EstimatedCountPaginator(self.queryset, 10).count, 1)
+
+
+class UUID7Test(TestCase):
+    """
+    Tests for time-ordered UUID generation.
+    """
+    def test_version_and_variant(self):
+        """Test that generated IDs are RFC 9562 version 7 UUIDs."""
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_embeds_current_time(self):
+        """Test that the first 48 bits are the time in milliseconds."""
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+        self.assertTrue(before <= value.int >> 80 <= after)
+
+    def test_later_ids_sort_higher(self):
+        """Test that IDs generated a millisecond apart are ordered."""
+        first = uuid7()
+        time.sleep(0.002)
+        self.assertLess(first, uuid7())
+
+
+class AssetBundleTest(TestCase):
+    """
+    Tests for bundled, fingerprinted static assets.
+    """
+    def setUp(self):
+        self.bundle_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.bundle_dir.cleanup)
+        settings_override = override_settings(STATIC_BUNDLE_DIR=self.bundle_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        finders.get_finder.cache_clear()
+        self.addCleanup(finders.get_finder.cache_clear)
+
+    def test_minify_css(self):
+        """Test that comments and insignificant whitespace are stripped."""
+        css = """
+            /* Comment */
+            .a .b,
+            .c > p {
+                content: "x ,  y";
+                margin: 0 auto;
+            }
+        """
+        self.assertEqual(minify_css(css), '.a .b,.c>p{content: "x ,  y";margin: 0 auto;}')
+
+    def test_imports_are_moved_to_the_top(self):
+        """Test that @import rules from later files lead the bundle."""
+        css = join_css([".a{}", '@import url("font.css");\n.b{}'])
+        self.assertEqual(css, '@import url("font.css");.a{}.b{}')
+
+    def test_finder_builds_bundles(self):
+        """Test that bundles are found like any other static file."""
+        path = finders.find("bundles/app.css")
+
+        with open(path, encoding="utf-8") as file:
+            bundle = file.read()
+        self.assertTrue(bundle.startswith("@import"))
+        self.assertIn(".note-list", bundle)
+        self.assertIn(".journal-entry", bundle)
+
+    def test_finder_rebuilds_changed_bundles(self):
+        """Test that a bundle older than its sources is rebuilt."""
+        path = finders.find("bundles/front.css")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("stale")
+        os.utime(path, (0, 0))
+
+        with open(finders.find("bundles/front.css"), encoding="utf-8") as file:
+            self.assertNotEqual(file.read(), "stale")
+
+    def test_collected_bundles_are_fingerprinted_and_cached_forever(self):
+        """Test that collectstatic compresses bundles and WhiteNoise serves them as immutable."""
+        static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(static_root.cleanup)
+        storages = {
+            "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+        }
+
+        with override_settings(STATIC_ROOT=static_root.name, STORAGES=storages):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            url = static("bundles/app.css")
+            response = Client().get(url, headers={"Accept-Encoding": "br, gzip"})
+
+        self.assertRegex(url, r"^/static/bundles/app\.[0-9a-f]{12}\.css$")
+        self.assertTrue(os.path.exists(os.path.join(static_root.name, url.removeprefix("/static/") + ".gz")))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn(response["Content-Encoding"], ("br", "gzip"))
+
+
+class RenderBlocksTest(TestCase):
+    """Tests for rendering single blocks of a page template."""
+
+    def setUp(self):
+        self.note = SimpleNamespace(id=uuid.uuid4(), title="Title", content="Content")
+
+    def test_blocks_are_rendered_with_inheritance(self):
+        """Test that blocks from the template and its parents are rendered alone."""
+        blocks = render_blocks("notes/edit.html", ["nav_button", "app_content"], {"note": self.note})
+
+        self.assertIn(f"/notes/{self.note.id}/", blocks["nav_button"])
+        self.assertIn(">Content</textarea>", blocks["app_content"])
+        self.assertNotIn("<html", blocks["app_content"])
+
+    def test_inherited_blocks_include_overrides(self):
+        """Test that a parent block renders the child's overrides inside it."""
+        blocks = render_blocks("notes/edit.html", ["app_header"], {"note": self.note})
+        self.assertIn('class="back-btn"', blocks["app_header"])
+
+    def test_missing_block(self):
+        """Test that asking for a block the template lacks is an error."""
+        with self.assertRaises(ValueError):
+            render_blocks("notes/edit.html", ["sidebar"], {"note": self.note})
+
+
+class TemplateWarmupTest(TestCase):
+    """Tests for compiling templates before taking requests."""
+
+    def setUp(self):
+        self.loader = engines["django"].engine.template_loaders[0]
+        self.loader.reset()
+        self.addCleanup(self.loader.reset)
+
+    def test_project_templates_are_found(self):
+        """Test that project and app templates are warmed up, but not third-party ones."""
+        names = find_templates()
+
+        self.assertIn("app.html", names)
+        self.assertIn("notes/list.html", names)
+        self.assertIn("journal/partials/entry.html", names)
+        self.assertNotIn("admin/base.html", names)
+
+    def test_templates_are_compiled_into_the_cache(self):
+        """Test that warmed up templates are served from the cached loader."""
+        timings = warm_up_templates()
+
+        self.assertEqual(len(timings), len(find_templates()))
+        self.assertIn("notes/list.html", self.loader.get_template_cache)
+        self.assertEqual(timings, sorted(timings, key=lambda timing: timing[1], reverse=True))
+
+    @override_settings(TEMPLATE_WARMUP=True)
+    def test_warm_up_logs_compile_times(self):
+        """Test that the warm-up reports how many templates it compiled and how long it took."""
+        with self.assertLogs("src.apps.common.warmup", "INFO") as logs:
+            warm_up()
+
+        [record] = logs.records
+        self.assertEqual(record.templates, len(find_templates()))
+        self.assertGreater(record.duration_ms, 0)
+
+    @override_settings(TEMPLATE_WARMUP=False)
+    def test_warm_up_can_be_turned_off(self):
+        """Test that nothing is compiled when the warm-up is off."""
+        warm_up()
+        self.assertEqual(self.loader.get_template_cache, {})
+
+
+class StartupTest(TestCase):
+    """Tests for lazy imports and startup profiling."""
+
+    def test_lazy_import_loads_on_first_use(self):
+        """Test that a lazily imported module works once it's used."""
+        with patch.dict(sys.modules):
+            sys.modules.pop("colorsys", None)
+            colorsys = lazy_import("colorsys")
+
+            self.assertIs(sys.modules["colorsys"], colorsys)
+            self.assertEqual(colorsys.rgb_to_hsv(1, 0, 0), (0, 1, 1))
+
+    def test_lazy_import_of_missing_module(self):
+        """Test that modules that aren't installed fail straight away."""
+        with self.assertRaises(ModuleNotFoundError):
+            lazy_import("not_a_module")
+
+    def test_parse_importtime(self):
+        """Test that -X importtime reports are parsed, skipping the header and other output."""
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       103 |        103 |   markdown.__meta__\n"
+            "import time:       189 |      16906 | markdown\n"
+            "Something else\n"
+        )
+        self.assertEqual(
+            parse_importtime(output),
+            [("markdown.__meta__", 103, 103), ("markdown", 189, 16906)],
+        )
+
+    def test_profile_startup(self):
+        """Test that the WSGI app is imported in a fresh interpreter and timed."""
+        ready_seconds, imports = profile_startup("config.wsgi")
+        modules = {module: cumulative_us for module, _, cumulative_us in imports}
+
+        self.assertGreater(ready_seconds, 0)
+        self.assertIn("django.core.wsgi", modules)
+        self.assertLessEqual(modules["django.core.wsgi"], modules["config.wsgi"])
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Tests for pinning views to their query budgets."""
+
+    def setUp(self):
+        self.url = reverse("common:ready")
+
+    def test_queries_over_budget_fail(self):
+        """Test that a request running more queries than its budget fails."""
+        with patch.object(ReadinessView, "query_budget", 1), self.assertRaises(AssertionError):
+            self.assertWithinQueryBudget(self.url)
+
+    def test_queries_under_budget_fail(self):
+        """Test that a budget left above the view's queries fails until it's lowered."""
+        with patch.object(ReadinessView, "query_budget", 3), \
+                self.assertRaisesMessage(AssertionError, "lower the budget"):
+            self.assertWithinQueryBudget(self.url)
+
+    def test_budget_by_method(self):
+        """Test that budgets can be declared per request method."""
+        with patch.object(ReadinessView, "query_budget", {"GET": 2}):
+            _, count = self.assertWithinQueryBudget(self.url)
+        self.assertEqual(count, 2)
+
+        with patch.object(ReadinessView, "query_budget", {"POST": 2}), self.assertRaises(AssertionError):
+            self.assertWithinQueryBudget(self.url)
+
+
+class ReadinessTest(QueryBudgetMixin, TestCase):
+    """Tests for the readiness check."""
+
+    def setUp(self):
+        self.url = reverse("common:ready")
+        warmed_up = patch.object(warmup, "warmed_up", True)
+        warmed_up.start()
+        self.addCleanup(warmed_up.stop)
+
+    def test_ready(self):
+        """Test that a warmed up process with a database and cache is ready."""
+        response, _ = self.assertWithinQueryBudget(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "ready": True,
+            "checks": {"database": True, "cache": True, "templates": True},
+        })
+        self.assertEqual(response["Cache-Control"], "no-store")
+
+    def test_not_ready_before_warm_up(self):
+        """Test that a process still warming up isn't ready."""
+        with patch.object(warmup, "warmed_up", False):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.json()["checks"]["templates"])
+
+    def test_not_ready_without_cache(self):
+        """Test that a process that can't reach the cache isn't ready."""
+        with patch("src.apps.common.views.cache.get", side_effect=ConnectionError):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["checks"]["cache"], False)
+        self.assertEqual(response.json()["checks"]["database"], True)
+
+
+class GunicornConfigTest(TestCase):
+    """Tests for the production server configuration."""
+
+    def load_config(self, **environ):
+        metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, metrics_dir, ignore_errors=True)
+        environ.setdefault("PROMETHEUS_MULTIPROC_DIR", metrics_dir)
+
+        with patch.dict(os.environ, environ):
+            import config.gunicorn
+            return reload(config.gunicorn)
+
+    def test_defaults(self):
+        """Test that the app is preloaded into ASGI workers that recycle at staggered times."""
+        conf = self.load_config()
+
+        self.assertTrue(conf.preload_app)
+        self.assertEqual(conf.worker_class, "uvicorn_worker.UvicornWorker")
+        self.assertEqual(conf.wsgi_app, "config.asgi:application")
+        self.assertGreater(conf.max_requests_jitter, 0)
+
+    def test_threaded_workers(self):
+        """Test that gthread workers serve the WSGI app, with a warning that live updates are off."""
+        conf = self.load_config(GUNICORN_WORKER_CLASS="gthread")
+        self.assertEqual(conf.wsgi_app, "config.wsgi:application")
+
+        server = SimpleNamespace(log=SimpleNamespace(warning=Mock()))
+        with patch("gc.freeze"):
+            conf.when_ready(server)
+        server.log.warning.assert_called_once()
+
+    def test_unknown_worker_class(self):
+        """Test that an unknown worker class is refused."""
+        with self.assertRaises(ImproperlyConfigured):
+            self.load_config(GUNICORN_WORKER_CLASS="eventlet")
+
+    def test_metrics_dir_is_emptied_on_start(self):
+        """Test that workers share a metrics directory that starts empty for each deploy."""
+        metrics_dir = os.path.join(tempfile.mkdtemp(), "metrics")
+        self.addCleanup(shutil.rmtree, os.path.dirname(metrics_dir))
+
+        conf = self.load_config(PROMETHEUS_MULTIPROC_DIR=metrics_dir)
+        self.assertEqual(conf.metrics_dir, metrics_dir)
+        self.assertTrue(os.path.isdir(metrics_dir))
+        stale = os.path.join(metrics_dir, "counter_1234.db")
+        open(stale, "w").close()
+
+        conf.on_starting(None)
+        self.assertEqual(os.listdir(metrics_dir), [])
+
+    def test_exited_workers_are_dropped_from_metrics(self):
+        """Test that an exited worker's live gauges are dropped in multiprocess mode."""
+        conf = self.load_config()
+
+        with patch("prometheus_client.multiprocess.mark_process_dead") as mark_process_dead:
+            conf.child_exit(None, SimpleNamespace(pid=1234))
+
+        mark_process_dead.assert_called_once_with(1234, conf.metrics_dir)
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1", "replica_2"])
+class ReplicaRouterTest(SimpleTestCase):
+    """Tests for routing reads to replicas and writes to the primary."""
+
+    def setUp(self):
+        self.router = replicas.ReplicaRouter()
+        replicas._lag_checks.clear()
+        self.addCleanup(replicas._lag_checks.clear)
+
+        measure_lag = patch.object(replicas, "measure_lag", return_value=0.0)
+        self.measure_lag = measure_lag.start()
+        self.addCleanup(measure_lag.stop)
+
+    def test_reads_outside_replica_views_use_the_primary(self):
+        """Test that only views that ask for a replica read from one."""
+        with replicas.replica_routing(pinned=False):
+            self.assertIsNone(self.router.db_for_read(Note))
+        self.assertIsNone(self.router.db_for_read(Note))
+
+    def test_replica_reads_and_primary_writes(self):
+        """Test that a replica view reads from a replica and writes to the primary."""
+        with replicas.replica_routing(pinned=False):
+            replicas.use_replica()
+
+            self.assertIn(self.router.db_for_read(Note), ["replica_1", "replica_2"])
+            self.assertEqual(self.router.db_for_write(Note), "default")
+
+    def test_reads_after_a_write_use_the_primary(self):
+        """Test that a request reads its own writes."""
+        with replicas.replica_routing(pinned=False) as routing:
+            replicas.use_replica()
+            self.router.db_for_write(Note)
+
+            self.assertTrue(routing["wrote"])
+            self.assertEqual(self.router.db_for_read(Note), "default")
+
+    def test_pinned_clients_read_from_the_primary(self):
+        """Test that clients who wrote recently aren't sent to a replica."""
+        with replicas.replica_routing(pinned=True):
+            replicas.use_replica()
+            self.assertIsNone(self.router.db_for_read(Note))
+
+    def test_reads_for_the_shared_cache_use_the_primary(self):
+        """Test that results rendered for the cache aren't read from a replica."""
+        with replicas.replica_routing(pinned=False):
+            replicas.use_replica()
+
+            with replicas.read_from_primary():
+                self.assertIsNone(self.router.db_for_read(Note))
+            self.assertIn(self.router.db_for_read(Note), ["replica_1", "replica_2"])
+
+    def test_database_cache_stays_on_the_primary(self):
+        """Test that cache entries are read from the primary, and writing them doesn't pin."""
+        cache_entry = SimpleNamespace(_meta=SimpleNamespace(app_label="django_cache"))
+
+        with replicas.replica_routing(pinned=False) as routing:
+            replicas.use_replica()
+            self.router.db_for_write(cache_entry)
+
+            self.assertFalse(routing["wrote"])
+            self.assertEqual(self.router.db_for_read(cache_entry), "default")
+
+    def test_lagging_and_unreachable_replicas_are_skipped(self):
+        """Test that replicas too far behind, or down, aren't read from."""
+        self.measure_lag.side_effect = lambda alias: {
+            "replica_1": ReplicaConfig.MAX_LAG + 1,
+            "replica_2": None,
+        }[alias]
+        self.assertIsNone(replicas.choose_replica())
+
+        replicas._lag_checks.clear()
+        self.measure_lag.side_effect = lambda alias: {"replica_1": 0.5, "replica_2": None}[alias]
+        self.assertEqual(replicas.choose_replica(), "replica_1")
+
+    def test_lag_checks_are_cached(self):
+        """Test that each replica's lag is measured at most once per interval."""
+        replicas.choose_replica()
+        replicas.choose_replica()
+        self.assertEqual(self.measure_lag.call_count, 2)
+
+    def test_replicas_are_not_migrated(self):
+        """Test that migrations only run on the primary."""
+        self.assertFalse(self.router.allow_migrate("replica_1", "notes"))
+        self.assertIsNone(self.router.allow_migrate("default", "notes"))
+
+
+@override_settings(DATABASE_REPLICAS=["default"])
+class ReplicaRoutingMiddlewareTest(TestCase):
+    """Tests for pinning clients that write to the primary."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser@example.com", email="testuser@example.com")
+        self.client.force_login(self.user)
+
+    def test_writes_pin_the_client(self):
+        """Test that a request that writes sets the pinning cookie."""
+        response = self.client.post(reverse("notes:new"), {"title": "", "content": "Hello"})
+
+        cookie = response.cookies[ReplicaConfig.STICKY_COOKIE]
+        self.assertEqual(cookie["max-age"], ReplicaConfig.STICKY_SECONDS)
+        self.assertTrue(cookie["httponly"])
+
+    def test_reads_do_not_pin_the_client(self):
+        """Test that read-only requests leave the client free to use replicas."""
+        response = self.client.get(reverse("notes:list"))
+        self.assertNotIn(ReplicaConfig.STICKY_COOKIE, response.cookies)
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_list_cache_is_filled_from_the_primary(self):
+        """Test that the shared list cache isn't filled from a replica."""
+        tiered_cache.clear()
+        render_entries = NotesListView.render_entries
+        rendered_from = []
+
+        def record_replica(view):
+            rendered_from.append(replicas._routing.get()["replica"])
+            return render_entries(view)
+
+        with patch.object(replicas, "choose_replica", return_value="default"), \
+                patch.object(NotesListView, "render_entries", record_replica):
+            self.client.get(reverse("notes:list"))
+
+        self.assertEqual(rendered_from, [None])
+
+    def test_pinned_clients_skip_replicas(self):
+        """Test that a pinned client's reads aren't sent to a replica."""
+        self.client.cookies[ReplicaConfig.STICKY_COOKIE] = str(time.time() + 60)
+
+        with patch.object(replicas, "choose_replica") as choose_replica:
+            self.client.get(reverse("notes:list"))
+        choose_replica.assert_not_called()
+
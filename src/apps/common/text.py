@@ -0,0 +1,5 @@
+"""Text measurements shared by models and stats."""
+
+
+def count_words(text):
+    return len(text.split()) if text else 0
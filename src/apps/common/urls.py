@@ -0,0 +1,11 @@
+from django.urls import path
+
+from .views import MetricsView, ProfileView, ReadinessView
+
+app_name = "common"
+
+urlpatterns = [
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path("profiles/<slug:name>/", ProfileView.as_view(), name="profile"),
+    path("ready/", ReadinessView.as_view(), name="ready"),
+]
@@ -0,0 +1,93 @@
+"""Views for the common app."""
+
+import secrets
+
+from django.conf import settings
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.cache import cache
+from django.db import connection
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden, JsonResponse
+from django.views import View
+
+from . import warmup
+from .constants import ReadinessConfig
+from .metrics import render_metrics
+from .profiling import profile_path
+
+
+class MetricsView(View):
+    """
+    Prometheus exposition endpoint. Scrapers authenticate with the
+    METRICS_TOKEN bearer token; staff users can view it in the browser.
+    """
+    def get(self, request, *args, **kwargs):
+        if not self.has_access(request):
+            return HttpResponseForbidden()
+
+        body, content_type = render_metrics()
+        return HttpResponse(body, content_type=content_type)
+
+    def has_access(self, request):
+        if request.user.is_authenticated and request.user.is_staff:
+            return True
+
+        token = getattr(settings, "METRICS_TOKEN", "")
+        scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+        return bool(token) and scheme.lower() == "bearer" and secrets.compare_digest(credentials, token)
+
+
+class ProfileView(UserPassesTestMixin, View):
+    """
+    Download a saved request profile. Staff only.
+    """
+    raise_exception = True
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, name, *args, **kwargs):
+        path = profile_path(name)
+        if not path.is_file():
+            raise Http404
+
+        return FileResponse(path.open("rb"), as_attachment=True, filename=path.name)
+
+
+class ReadinessView(View):
+    """
+    Readiness check for load balancers and deploys. Answers 200 only
+    once this process has warmed up its templates and can reach the
+    database and the shared cache, and 503 until then, listing which
+    checks failed.
+    """
+    # Database check, and the cache check when the cache is a table
+    query_budget = 2
+
+    def get(self, request, *args, **kwargs):
+        checks = {
+            ReadinessConfig.DATABASE: self.check_database(),
+            ReadinessConfig.CACHE: self.check_cache(),
+            ReadinessConfig.TEMPLATES: warmup.warmed_up,
+        }
+        ready = all(checks.values())
+        response = JsonResponse(
+            {"ready": ready, "checks": checks}, status=200 if ready else 503
+        )
+        response["Cache-Control"] = "no-store"
+        return response
+
+    def check_database(self):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except Exception:
+            return False
+        return True
+
+    def check_cache(self):
+        try:
+            cache.get(ReadinessConfig.CACHE_KEY)
+        except Exception:
+            return False
+        return True
+
@@ -0,0 +1,98 @@
+"""
+Template warm-up.
+
+The cached template loader compiles each template the first time it's
+used and keeps it for the life of the process, so without a warm-up
+the first requests a worker serves pay for compiling every template
+they touch, cotton components included. warm_up compiles all of the
+project's templates when a process starts instead: config.wsgi and
+config.asgi call it after loading the app, so with a preloading server
+the workers inherit the compiled templates from the master.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+
+
+logger = logging.getLogger(__name__)
+
+# Set once warm_up has run, for the readiness check
+warmed_up = False
+
+
+def find_templates():
+    """
+    Return the names of the project's templates: those in src/templates
+    and the apps' template directories, cotton components included.
+    Third-party templates, like the admin's, are left to compile on
+    first use.
+    """
+    engine = engines["django"].engine
+    directories = [*engine.dirs, *get_app_template_dirs("templates")]
+
+    names = set()
+    for directory in map(Path, directories):
+        if not directory.is_relative_to(settings.SRC_DIR):
+            continue
+        names.update(
+            path.relative_to(directory).as_posix() for path in directory.rglob("*.html")
+        )
+    return sorted(names)
+
+
+def warm_up_templates():
+    """
+    Compile the project's templates into the cached loader. Returns a
+    list of (name, seconds) pairs, slowest first. Templates that fail
+    to compile are logged and skipped, leaving the error to the request
+    that uses them.
+    """
+    engine = engines["django"].engine
+
+    timings = []
+    for name in find_templates():
+        start = time.perf_counter()
+        try:
+            engine.get_template(name)
+        except TemplateSyntaxError:
+            logger.exception("Template %s failed to compile", name)
+            continue
+        timings.append((name, time.perf_counter() - start))
+
+    return sorted(timings, key=lambda timing: timing[1], reverse=True)
+
+
+def warm_up():
+    """
+    Warm up the templates if TEMPLATE_WARMUP is on, and log how long
+    it took.
+    """
+    global warmed_up
+
+    if not settings.TEMPLATE_WARMUP:
+        warmed_up = True
+        return
+
+    timings = warm_up_templates()
+    warmed_up = True
+    if not timings:
+        return
+
+    slowest, slowest_time = timings[0]
+    total_time = sum(seconds for _, seconds in timings)
+    logger.info(
+        "Compiled %d templates in %.1f ms",
+        len(timings),
+        total_time * 1000,
+        extra={
+            "templates": len(timings),
+            "duration_ms": round(total_time * 1000, 1),
+            "slowest_template": slowest,
+            "slowest_ms": round(slowest_time * 1000, 1),
+        },
+    )
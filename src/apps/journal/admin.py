@@ -1,5 +1,26 @@
 from django.contrib import admin
+from django.db.models.functions import Substr
 
+from src.apps.common.admin import LargeTableAdmin
+from src.apps.common.constants import AdminConfig
 from src.apps.journal.models import JournalEntry
 
-admin.site.register(JournalEntry)
+
+@admin.register(JournalEntry)
+class JournalEntryAdmin(LargeTableAdmin):
+    list_display = ["id", "content_preview", "author", "created_at"]
+    list_select_related = ["author"]
+    list_only = ["id", "created_at", "author__username"]
+    raw_id_fields = ["author"]
+    search_fields = ["=author__username"]
+    search_help_text = "Search by journal entry ID or the author's email address."
+
+    def get_queryset(self, request):
+        # Entries can be long, so only fetch the start
+        return super().get_queryset(request).annotate(
+            content_preview=Substr("content", 1, AdminConfig.PREVIEW_LENGTH)
+        )
+
+    @admin.display(description="Content")
+    def content_preview(self, entry):
+        return entry.content_preview
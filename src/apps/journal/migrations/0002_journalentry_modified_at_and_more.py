@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_created_at(apps, schema_editor):
+    # Existing entries were last changed when they were created
+    JournalEntry = apps.get_model("journal", "JournalEntry")
+    JournalEntry.objects.update(modified_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("journal", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journalentry",
+            name="modified_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="journalentry",
+            index=models.Index(
+                fields=["author", "modified_at"], name="journal_jou_author__dfd373_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:58
+
+import src.apps.common.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("journal", "0002_journalentry_modified_at_and_more"),
+    ]
+
+    operations = [
+        # Only the default changes. Existing rows keep their UUIDv4 IDs.
+        migrations.AlterField(
+            model_name="journalentry",
+            name="id",
+            field=models.UUIDField(
+                default=src.apps.common.ids.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
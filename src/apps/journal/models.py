@@ -1,20 +1,38 @@
-import uuid
-
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+
+from src.apps.common.ids import uuid7
+from src.apps.common.text import count_words
 
 
 class JournalEntry(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    modified_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["-created_at"]),
+            models.Index(fields=["author", "modified_at"]),
         ]
 
     def __str__(self):
         return self.content
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Only the word count of the loaded content is kept, so saves
+        # can tell how many words they added; see accounts.stats
+        if "content" in field_names:
+            instance._loaded_word_count = count_words(instance.content)
+        return instance
+
+    def save(self, *args, **kwargs):
+        # post_save handlers keep per-user stats, which have to commit
+        # or roll back together with the row itself
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
@@ -0,0 +1,35 @@
+"""Integration tests for the journal admin."""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from src.apps.journal.models import JournalEntry
+
+
+User = get_user_model()
+
+
+class JournalEntryAdminTestCase(TestCase):
+    """
+    Integration tests for the JournalEntry admin change list.
+    """
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username="admin@example.com",
+            email="admin@example.com"
+        )
+        self.client.force_login(self.admin_user)
+
+    def test_changelist_shows_content_preview(self):
+        """
+        Test that only the start of each entry is loaded and shown.
+        """
+        JournalEntry.objects.create(content="B" * 200, author=self.admin_user)
+
+        response = self.client.get(reverse("admin:journal_journalentry_changelist"))
+
+        self.assertContains(response, "B" * 80)
+        self.assertNotContains(response, "B" * 81)
+        entry = response.context["cl"].result_list[0]
+        self.assertIn("content", entry.get_deferred_fields())
@@ -5,6 +5,7 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse_lazy
 
+from src.apps.common.testing import QueryBudgetMixin
 from src.apps.journal.models import JournalEntry
 
 
@@ -86,6 +87,20 @@ class JournalEntryListTests(TestCase):
         response = self.client.get(self.journal_url)
         self.assertNotIn("Why do I have to be so strange?!", response.text)
 
+    def test_htmx_request_gets_entries_fragment(self):
+        """
+        Test that htmx requests get just the entries, and that responses
+        vary on the htmx request header.
+        """
+        JournalEntry.objects.create(content="Just the entries", author=self.test_user)
+        self.client.force_login(self.test_user)
+        response = self.client.get(self.journal_url, headers={"HX-Request": "true"})
+
+        self.assertTrue(response.text.strip().startswith('<div class="journal-entries">'))
+        self.assertIn("Just the entries", response.text)
+        self.assertNotIn('id="journal_entry"', response.text)
+        self.assertIn("HX-Request", response["Vary"])
+
 
 class JournalEntryCreationTests(TestCase):
     """
@@ -119,3 +134,38 @@ class JournalEntryCreationTests(TestCase):
             "content": "Ahhh!"
         })
         self.assertRedirects(response, "/")
+
+
+class JournalQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Query-count contracts for journal views.
+    """
+    def setUp(self):
+        self.journal_url = reverse_lazy("journal:home")
+        self.test_user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+        self.client.force_login(self.test_user)
+
+    def _populate_entries(self, count):
+        existing = JournalEntry.objects.filter(author=self.test_user).count()
+        JournalEntry.objects.bulk_create([
+            JournalEntry(content=f"Entry #{num}", author=self.test_user)
+            for num in range(existing, count)
+        ])
+
+    def test_journal_query_count_is_constant(self):
+        """
+        Test that the journal runs the same queries for 1 or 100
+        entries.
+        """
+        self.assertQueryCountConstant(str(self.journal_url), self._populate_entries)
+
+    def test_new_entry_within_budget(self):
+        """
+        Test that creating a journal entry stays within budget.
+        """
+        self.assertWithinQueryBudget(
+            str(reverse_lazy("journal:new-entry")), "post", {"content": "Hello"}
+        )
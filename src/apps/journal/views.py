@@ -1,12 +1,13 @@
-from django.contrib.auth import get_user
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, ListView
 
+from src.apps.common.htmx import BoostedNavigationMixin, FragmentMixin
+from src.apps.common.replicas import ReplicaReadMixin
 from src.apps.journal.models import JournalEntry
 
 
-class JournalEntryCreateView(LoginRequiredMixin, CreateView):
+class JournalEntryCreateView(LoginRequiredMixin, FragmentMixin, CreateView):
     """
     View for journal entry creation.
     """
@@ -15,20 +16,26 @@ class JournalEntryCreateView(LoginRequiredMixin, CreateView):
     success_url = reverse_lazy("journal:home")
     redirect_field_name = None
 
+    # Session, user, insert, stats
+    query_budget = 4
+
     def form_valid(self, form):
         form.instance.author = self.request.user
         return super().form_valid(form)
 
 
-class JournalEntryListView(LoginRequiredMixin, ListView):
+class JournalEntryListView(ReplicaReadMixin, LoginRequiredMixin, BoostedNavigationMixin, ListView):
     """
     View for journal entry list.
     """
     model = JournalEntry
     template_name = "journal/journal.html"
+    fragment_block = "journal_entries"
     context_object_name = "journal_entries"
     redirect_field_name = None
 
+    # Session, user, journal entries, stats
+    query_budget = 4
+
     def get_queryset(self):
-        user = get_user(self.request)
-        return JournalEntry.objects.filter(author=user)
+        return JournalEntry.objects.filter(author=self.request.user)
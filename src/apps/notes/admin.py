@@ -1,5 +1,35 @@
 from django.contrib import admin
+from django.db.models.functions import Substr
+
+from src.apps.common.admin import LargeTableAdmin
+from src.apps.common.constants import AdminConfig
 
 from .models import Note
 
-admin.site.register(Note)
+
+@admin.register(Note)
+class NoteAdmin(LargeTableAdmin):
+    list_display = ["id", "title_preview", "author", "created_at", "modified_at", "deleted_at"]
+    list_filter = ["deleted_at"]
+    list_select_related = ["author"]
+    list_only = ["id", "created_at", "modified_at", "deleted_at", "author__username"]
+    raw_id_fields = ["author"]
+    search_fields = ["=author__username"]
+    search_help_text = "Search by note ID or the author's email address."
+
+    def get_queryset(self, request):
+        # The default manager hides trashed notes, and staff need to
+        # see those too
+        queryset = Note.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+
+        # Titles can be arbitrarily long, so only fetch the start
+        return queryset.annotate(
+            title_preview=Substr("title", 1, AdminConfig.PREVIEW_LENGTH)
+        )
+
+    @admin.display(description="Title")
+    def title_preview(self, note):
+        return note.title_preview
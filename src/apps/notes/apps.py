@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class NotesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "src.apps.notes"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,144 @@
+"""Apply many note creates, updates and deletes in one transaction."""
+
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+
+from src.apps.common.ids import uuid7
+
+from .cache import invalidate_list
+from .constants import BatchConfig, ErrorMessages
+from .models import Note
+from .signals import notes_bulk_saved
+from .trash import trash_notes
+
+
+class BatchError(Exception):
+    pass
+
+
+def parse_id(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def validate_operation(operation):
+    """
+    Check one operation's shape. Returns (op, note_id, fields), or
+    raises BatchError with a message for the client.
+    """
+    if not isinstance(operation, dict) or operation.get("op") not in BatchConfig.OPERATIONS:
+        raise BatchError(ErrorMessages.UNKNOWN_OPERATION)
+
+    op = operation["op"]
+    if operation.get("id") is None and op == BatchConfig.CREATE:
+        note_id = uuid7()
+    else:
+        note_id = parse_id(operation.get("id"))
+        if note_id is None:
+            raise BatchError(ErrorMessages.INVALID_ID)
+
+    fields = {key: operation[key] for key in ("title", "content") if key in operation}
+    if not all(isinstance(value, str) for value in fields.values()):
+        raise BatchError(ErrorMessages.INVALID_FIELDS)
+    if op == BatchConfig.CREATE and not fields.get("content"):
+        raise BatchError(ErrorMessages.MISSING_CONTENT)
+    if op == BatchConfig.UPDATE and "content" in fields and not fields["content"]:
+        raise BatchError(ErrorMessages.MISSING_CONTENT)
+
+    return op, note_id, fields
+
+
+def apply_batch(user, operations):
+    """
+    Apply a list of create, update and delete operations to the user's
+    notes and return one result per operation, in order.
+
+    Valid operations are applied together in one transaction, with one
+    bulk_create, one bulk_update and one UPDATE moving deleted notes to
+    the trash, whatever the size of the batch. Invalid operations are
+    reported and skipped.
+    """
+    if len(operations) > BatchConfig.MAX_OPERATIONS:
+        raise BatchError(ErrorMessages.TOO_MANY_OPERATIONS.format(limit=BatchConfig.MAX_OPERATIONS))
+
+    results = [None] * len(operations)
+    pending = {op: {} for op in BatchConfig.OPERATIONS}
+    seen = set()
+
+    for index, operation in enumerate(operations):
+        try:
+            op, note_id, fields = validate_operation(operation)
+        except BatchError as error:
+            results[index] = {"status": BatchConfig.ERROR, "error": str(error)}
+            continue
+
+        if note_id in seen:
+            results[index] = {"status": BatchConfig.ERROR, "id": note_id, "error": ErrorMessages.DUPLICATE_ID}
+            continue
+
+        seen.add(note_id)
+        pending[op][note_id] = (index, fields)
+
+    def fail(note_id, index, message):
+        results[index] = {"status": BatchConfig.ERROR, "id": note_id, "error": message}
+
+    now = timezone.now()
+    with transaction.atomic():
+        creates = pending[BatchConfig.CREATE]
+        if creates:
+            # Trashed notes still hold their IDs
+            taken = set(Note.all_objects.filter(id__in=creates).values_list("id", flat=True))
+            new_notes = []
+            for note_id, (index, fields) in creates.items():
+                if note_id in taken:
+                    fail(note_id, index, ErrorMessages.ID_EXISTS)
+                    continue
+                new_notes.append(Note(id=note_id, author=user, **fields))
+                results[index] = {"status": BatchConfig.CREATED, "id": note_id}
+            Note.objects.bulk_create(new_notes)
+            if new_notes:
+                notes_bulk_saved.send(sender=Note, author_id=user.pk, notes=new_notes, created=True)
+
+        updates = pending[BatchConfig.UPDATE]
+        if updates:
+            notes = Note.objects.filter(author=user).select_for_update().in_bulk(list(updates))
+            changed_fields = {"modified_at"}
+            for note_id, (index, fields) in updates.items():
+                note = notes.get(note_id)
+                if note is None:
+                    fail(note_id, index, ErrorMessages.NOT_FOUND)
+                    continue
+                for field, value in fields.items():
+                    setattr(note, field, value)
+                # bulk_update skips auto_now
+                note.modified_at = now
+                changed_fields.update(fields)
+                results[index] = {"status": BatchConfig.UPDATED, "id": note_id}
+            Note.objects.bulk_update(notes.values(), sorted(changed_fields))
+            if notes:
+                notes_bulk_saved.send(
+                    sender=Note, author_id=user.pk, notes=list(notes.values()), created=False
+                )
+
+        deletes = pending[BatchConfig.DELETE]
+        if deletes:
+            # Locked, so notes a concurrent delete trashes first are
+            # reported as not found rather than deleted
+            owned = Note.objects.select_for_update().filter(author=user, id__in=deletes)
+            deleted_ids = set(owned.values_list("id", flat=True))
+            for note_id, (index, _) in deletes.items():
+                if note_id in deleted_ids:
+                    results[index] = {"status": BatchConfig.DELETED, "id": note_id}
+                else:
+                    fail(note_id, index, ErrorMessages.NOT_FOUND)
+
+            if deleted_ids:
+                trash_notes(user.pk, sorted(deleted_ids))
+
+        invalidate_list(user.pk)
+
+    return results
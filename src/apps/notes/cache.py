@@ -0,0 +1,103 @@
+"""
+Per-user cache of the rendered note list and search results.
+
+Every cache key includes the user's list version, which is bumped
+whenever one of their notes is created, edited or deleted. Stale
+entries are never invalidated explicitly; they just stop being read.
+
+The list is only cached when the shared cache is outside the database
+(Redis). With the database cache, reading the version on every list
+and bumping it on every write cost more queries than rendering the list
+does, so there the list is rendered each time and nothing is bumped.
+"""
+
+import hashlib
+
+from django.db import transaction
+
+from src.apps.common.cache import tiered_cache
+from src.apps.common.replicas import read_from_primary
+
+from .constants import ListCacheConfig
+
+
+def normalize_query(query):
+    """
+    Normalize a search query so that equivalent searches share a cache
+    entry: lowercased with runs of whitespace collapsed.
+    """
+    return " ".join(query.split()).lower()
+
+
+def list_cache_enabled():
+    """
+    Return True if note lists are cached, see the module docstring.
+    """
+    return not tiered_cache.in_database
+
+
+def list_namespace(user_id):
+    return ListCacheConfig.NAMESPACE.format(user_id=user_id)
+
+
+def get_list_version(user_id):
+    """
+    Return the user's current list version.
+    """
+    return tiered_cache.get_version(list_namespace(user_id))
+
+
+def bump_list_version(user_id):
+    """
+    Atomically move the user's list to a new version, so cached results
+    from before the change are no longer used.
+    """
+    return tiered_cache.bump_version(list_namespace(user_id))
+
+
+def invalidate_list(user_id):
+    """
+    Bump the user's list version now, and again once the current
+    transaction commits, in case a concurrent request cached the old
+    rows under the new version in the meantime.
+    """
+    if not list_cache_enabled():
+        return
+
+    bump_list_version(user_id)
+    transaction.on_commit(lambda: bump_list_version(user_id))
+
+
+def list_entries_key(user_id, query):
+    """
+    Cache key for a user's note list or search results. The list isn't
+    paginated, so nothing from the query string but the search goes
+    in: any other parameter would let clients fill the cache with
+    copies of the same list.
+    """
+    digest = hashlib.md5(normalize_query(query).encode(), usedforsecurity=False).hexdigest()
+    return tiered_cache.versioned_key(
+        list_namespace(user_id),
+        ListCacheConfig.ENTRIES_KEY.format(query=digest),
+    )
+
+
+def get_or_render_entries(user_id, query, render):
+    """
+    Return the cached (has_notes, html) pair for the list, calling
+    render() to build and cache it on a miss. Concurrent misses for the
+    same search render it once.
+
+    Rendered from the primary: a replica may not have the change that
+    bumped the version yet, and the cache would keep serving its stale
+    list under the new version, to the writer too.
+    """
+    if not list_cache_enabled():
+        return render()
+
+    def render_from_primary():
+        with read_from_primary():
+            return render()
+
+    key = list_entries_key(user_id, query)
+    return tiered_cache.get_or_set(key, render_from_primary, ListCacheConfig.TIMEOUT)
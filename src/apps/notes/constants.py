@@ -0,0 +1,61 @@
+"""Constants for the notes app."""
+
+import datetime
+
+
+class ListCacheConfig:
+    """
+    Note list and search cache constants.
+    """
+    NAMESPACE = "notes:list:{user_id}"
+    ENTRIES_KEY = "entries:{query}"
+
+    # Entries for old versions are never read again and simply expire
+    TIMEOUT = 60 * 60 * 24
+
+
+class TrashConfig:
+    """
+    Trash and purge constants.
+    """
+    # Trashed notes are purged for good after this long
+    RETENTION = datetime.timedelta(days=30)
+
+    # Notes hard-deleted per statement when purging, and the pause
+    # between statements, so purges never hold locks for long
+    PURGE_BATCH_SIZE = 500
+    PURGE_PAUSE = 0.1
+
+
+class BatchConfig:
+    """
+    Batch write API constants.
+    """
+    MAX_OPERATIONS = 1000
+
+    # Operations
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    OPERATIONS = (CREATE, UPDATE, DELETE)
+
+    # Result statuses
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    ERROR = "error"
+
+
+class ErrorMessages:
+    """
+    Error message constants.
+    """
+    INVALID_JSON = "Request body must be a JSON object with an operations list."
+    TOO_MANY_OPERATIONS = "A batch can contain at most {limit} operations."
+    UNKNOWN_OPERATION = "Unknown operation. Expected create, update or delete."
+    INVALID_ID = "Missing or invalid note ID."
+    INVALID_FIELDS = "Title and content must be strings."
+    MISSING_CONTENT = "A note needs content."
+    DUPLICATE_ID = "The same note can only appear once per batch."
+    ID_EXISTS = "A note with this ID already exists."
+    NOT_FOUND = "Note not found."
@@ -0,0 +1,38 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from ...constants import TrashConfig
+from ...trash import purge_trash
+
+
+class Command(BaseCommand):
+    help = "Permanently delete notes that have been in the trash for longer than the retention period, in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=TrashConfig.RETENTION.days,
+            help="Purge notes trashed more than this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=TrashConfig.PURGE_BATCH_SIZE,
+            help="Notes deleted per statement.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=TrashConfig.PURGE_PAUSE,
+            help="Seconds to wait between batches.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_trash(
+            retention=datetime.timedelta(days=options["days"]),
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+        )
+        self.stdout.write(f"Deleted {deleted} notes.")
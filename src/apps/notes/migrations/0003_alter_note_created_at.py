@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notes", "0002_alter_note_title"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="note",
+            name="created_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
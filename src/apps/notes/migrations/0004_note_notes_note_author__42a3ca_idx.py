@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notes", "0003_alter_note_created_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="note",
+            index=models.Index(
+                fields=["author", "modified_at"], name="notes_note_author__42a3ca_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:58
+
+import src.apps.common.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notes", "0004_note_notes_note_author__42a3ca_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="note",
+            name="timestamp_id",
+        ),
+        # Only the default changes. Existing rows keep their UUIDv4 IDs.
+        migrations.AlterField(
+            model_name="note",
+            name="id",
+            field=models.UUIDField(
+                default=src.apps.common.ids.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -1,36 +1,88 @@
 from django.conf import settings
-from django.db import models
-from django.db.models.fields import uuid
+from django.db import models, transaction
 from django.utils import timezone
 
+from src.apps.common.ids import uuid7
+from src.apps.common.text import count_words
+
 
 def generate_timestamp():
     """
-    Generate timestamp for the note timestamp_id field.
+    Generate timestamp for the retired note timestamp_id field. Only
+    kept because the initial migration refers to it.
     """
     return timezone.now().strftime("%Y%m%d%H%M%S")
 
 
+class NoteQuerySet(models.QuerySet):
+    def alive(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def trashed(self):
+        return self.filter(deleted_at__isnull=False)
+
+
+class AliveNoteManager(models.Manager.from_queryset(NoteQuerySet)):
+    """
+    Manager that leaves out notes in the trash.
+    """
+    def get_queryset(self):
+        return super().get_queryset().alive()
+
+
 class Note(models.Model):
     """
-    Model for notes.
+    Model for notes. Deleted notes are moved to the trash by setting
+    deleted_at, and purged for good later. Note.objects leaves them out;
+    use Note.all_objects to include them.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    timestamp_id = models.CharField(max_length=14, default=generate_timestamp)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     title = models.TextField(blank=True)
     content = models.TextField()
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
     )
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     modified_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = AliveNoteManager()
+    all_objects = NoteQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["-created_at"]),
+            models.Index(fields=["author", "modified_at"]),
+            # The note list and search, which never show trashed notes
+            models.Index(
+                fields=["author", "-created_at"],
+                name="notes_note_alive_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            # Trash pages and purging, which only read trashed notes
+            models.Index(
+                fields=["deleted_at"],
+                name="notes_note_trashed_idx",
+                condition=models.Q(deleted_at__isnull=False),
+            ),
         ]
 
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Only the word count of the loaded content is kept, so saves
+        # can tell how many words they added; see accounts.stats
+        if "content" in field_names:
+            instance._loaded_word_count = count_words(instance.content)
+        return instance
+
+    def save(self, *args, **kwargs):
+        # post_save handlers keep per-user stats, which have to commit
+        # or roll back together with the row itself
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
@@ -0,0 +1,33 @@
+"""Signals and signal handlers for the notes app."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from src.apps.accounts.deletion import deleting_account
+
+from .cache import invalidate_list
+from .models import Note
+
+
+# Sent with author_id, the notes and whether they were created after
+# notes are created or updated in bulk, without per-instance post_save
+# signals
+notes_bulk_saved = Signal()
+
+# Sent with author_id and ids after notes are moved to or restored from
+# the trash, which is done with queryset updates
+notes_trashed = Signal()
+notes_restored = Signal()
+
+
+@receiver(post_save, sender=Note)
+@receiver(post_delete, sender=Note)
+def invalidate_note_list(sender, instance, origin=None, **kwargs):
+    """
+    Invalidate the author's cached note list whenever one of their notes
+    changes. bulk_create and queryset.update() don't send signals, so
+    callers of those invalidate the list themselves. Notes deleted with
+    their author leave no list behind to invalidate.
+    """
+    if not deleting_account(origin):
+        invalidate_list(instance.author_id)
@@ -1,29 +1,27 @@
-(() => {
-    const deleteNoteButtonId = "delete_note_button";
-    const deleteNoteButton = document.getElementById(deleteNoteButtonId);
-
-    const deleteNoteDialogId = "delete_note_dialog";
-    const deleteNoteDialog = document.getElementById(deleteNoteDialogId);
+// Pages are swapped in by boosted navigation, so set up the delete
+// dialog whenever content containing it is loaded.
+htmx.onLoad((content) => {
+    const deleteNoteButton = content.matches("#delete_note_button")
+        ? content
+        : content.querySelector("#delete_note_button");
+    const deleteNoteDialog = document.getElementById("delete_note_dialog");
 
     if (!deleteNoteButton) {
-        console.error(`Could not find button with ID "${deleteNoteButtonId}".`);
         return;
     }
 
     deleteNoteButton.addEventListener("click", () => {
         if (!deleteNoteDialog) {
-            console.error(
-                `Could not find dialog with ID "${deleteNoteDialogId}".`,
-            );
+            console.error('Could not find dialog with ID "delete_note_dialog".');
             return;
         }
 
         deleteNoteDialog.showModal();
     });
 
-    deleteNoteDialog.addEventListener("click", (e) => {
+    deleteNoteDialog?.addEventListener("click", (e) => {
         if (e.target === deleteNoteDialog) {
             deleteNoteDialog.close();
         }
     });
-})();
+});
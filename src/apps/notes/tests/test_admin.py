@@ -0,0 +1,97 @@
+"""Integration tests for the notes admin."""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+
+from src.apps.common.testing import app_queries
+from src.apps.notes.models import Note
+from src.apps.notes.trash import trash_notes
+
+
+User = get_user_model()
+
+
+class NoteAdminTestCase(TestCase):
+    """
+    Integration tests for the Note admin change list.
+    """
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username="admin@example.com",
+            email="admin@example.com"
+        )
+        self.test_user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+        self.client.force_login(self.admin_user)
+        self.changelist_url = reverse("admin:notes_note_changelist")
+
+    def get_changelist(self, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.changelist_url, params)
+        return response, len(app_queries(context.captured_queries))
+
+    def test_changelist_does_not_load_content(self):
+        """
+        Test that the change list shows a title preview without loading
+        note contents.
+        """
+        Note.objects.create(title="A" * 200, content="Secret content", author=self.test_user)
+
+        response, _ = self.get_changelist()
+
+        self.assertContains(response, "A" * 80)
+        self.assertNotContains(response, "A" * 81)
+        note = response.context["cl"].result_list[0]
+        self.assertTrue({"title", "content"} <= note.get_deferred_fields())
+
+    def test_changelist_query_count_is_constant(self):
+        """
+        Test that authors are joined rather than loaded per row.
+        """
+        Note.objects.create(content="Hello", author=self.test_user)
+        _, few = self.get_changelist()
+
+        Note.objects.bulk_create(
+            Note(content="Hello", author=self.test_user) for _ in range(50)
+        )
+        _, many = self.get_changelist()
+
+        self.assertEqual(few, many)
+
+    def test_search_by_author_or_id(self):
+        """
+        Test that search matches an exact author email or note ID.
+        """
+        note = Note.objects.create(content="Hello", author=self.test_user)
+        Note.objects.create(content="Hello", author=self.admin_user)
+
+        response, _ = self.get_changelist(q="testuser@example.com")
+        self.assertEqual(list(response.context["cl"].result_list), [note])
+
+        response, _ = self.get_changelist(q=str(note.pk))
+        self.assertEqual(list(response.context["cl"].result_list), [note])
+
+        response, _ = self.get_changelist(q="testuser")
+        self.assertEqual(list(response.context["cl"].result_list), [])
+
+    def test_changelist_shows_trashed_notes(self):
+        """
+        Test that trashed notes are listed, and can be filtered on.
+        """
+        note = Note.objects.create(content="Hello", author=self.test_user)
+        trashed = Note.objects.create(content="Goodbye", author=self.test_user)
+        trash_notes(self.test_user.pk, [trashed.pk])
+
+        response, _ = self.get_changelist()
+        self.assertEqual(set(response.context["cl"].result_list), {note, trashed})
+
+        response, _ = self.get_changelist(deleted_at__isnull="False")
+        self.assertEqual(list(response.context["cl"].result_list), [trashed])
+
+        response = self.client.get(reverse("admin:notes_note_change", args=[trashed.pk]))
+        self.assertEqual(response.status_code, 200)
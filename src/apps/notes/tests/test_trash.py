@@ -0,0 +1,69 @@
+"""Tests for purging the trash."""
+
+import datetime
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from src.apps.notes.models import Note
+from src.apps.notes.trash import purge_trash, trash_notes
+
+
+User = get_user_model()
+
+
+class PurgeTrashTests(TestCase):
+    """
+    Tests for the batched trash purge.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+        self.notes = Note.objects.bulk_create(
+            Note(content=f"Note #{num}", author=self.user) for num in range(5)
+        )
+        trash_notes(self.user.pk, [note.pk for note in self.notes[:4]])
+
+    def age_trash(self, notes, days):
+        Note.all_objects.filter(pk__in=[note.pk for note in notes]).update(
+            deleted_at=timezone.now() - datetime.timedelta(days=days)
+        )
+
+    def test_purges_only_expired_trash(self):
+        """
+        Test that only notes trashed before the retention period are
+        deleted, and live notes are left alone.
+        """
+        self.age_trash(self.notes[:3], days=31)
+
+        self.assertEqual(purge_trash(batch_size=2, pause=0), 3)
+        self.assertEqual(
+            set(Note.all_objects.values_list("pk", flat=True)),
+            {self.notes[3].pk, self.notes[4].pk},
+        )
+
+    def test_purges_in_batches(self):
+        """
+        Test that each batch is a separate bounded DELETE.
+        """
+        self.age_trash(self.notes[:4], days=31)
+
+        with self.assertNumQueries(5):
+            # Two rounds of select and delete, then an empty select
+            purge_trash(batch_size=2, pause=0)
+
+    def test_purge_trash_command(self):
+        """
+        Test that the command reports how many notes it deleted.
+        """
+        self.age_trash(self.notes[:1], days=10)
+        out = io.StringIO()
+
+        call_command("purge_trash", days=7, pause=0, stdout=out)
+
+        self.assertIn("Deleted 1 notes.", out.getvalue())
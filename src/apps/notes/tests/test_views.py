@@ -1,15 +1,27 @@
 """Integration tests for views."""
 
+import json
+import uuid
 
 from django.contrib.auth import get_user, get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from src.apps.common.cache import tiered_cache
+from src.apps.common.testing import QueryBudgetMixin, app_queries
+from src.apps.notes.cache import invalidate_list
+from src.apps.notes.constants import BatchConfig, ErrorMessages
 from src.apps.notes.models import Note
+from src.apps.sync.models import Tombstone
 
 
 User = get_user_model()
 
+# The note list is only cached outside the database, see notes.cache
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
 
 class NoteTestCase(TestCase):
     """
@@ -17,6 +29,8 @@ class NoteTestCase(TestCase):
     users, each with their own set up notes.
     """
     def setUp(self):
+        tiered_cache.clear()
+
         # Create a test user
         self.test_user_email = "testuser@example.com"
         self.test_user = User.objects.create_user(
@@ -95,6 +109,211 @@ class NoteListTests(NoteTestCase):
         self.assertNotIn("Strange note #3", response.text)
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
+class NoteListCacheTests(NoteTestCase):
+    """
+    Integration tests for the cached note list and search results.
+    """
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.test_user)
+        self.search_url = f"{self.note_list_url}?search=test"
+        self.htmx = {"HX-Request": "true"}
+
+    def test_repeated_search_skips_notes_query(self):
+        """
+        Test that repeating a search, in any case or spacing, is served
+        from the cache without querying the notes.
+        """
+        self.client.get(self.search_url, headers=self.htmx)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f"{self.note_list_url}?search=  TEST ", headers=self.htmx
+            )
+        # Session and user
+        self.assertEqual(len(app_queries(queries)), 2)
+        self.assertIn("Test note #1", response.text)
+
+    def test_search_gets_list_fragment(self):
+        """
+        Test that searches get only the list, and that the list page
+        varies on the htmx request header.
+        """
+        response = self.client.get(self.search_url, headers=self.htmx)
+
+        self.assertTrue(response.text.strip().startswith('<ul class="note-list">'))
+        self.assertNotIn('id="note_search_input"', response.text)
+        self.assertIn("HX-Request", response["Vary"])
+
+    def test_full_page_uses_cached_entries(self):
+        """
+        Test that the full page (e.g. after the back button) reuses the
+        entries cached by a search.
+        """
+        self.client.get(self.search_url, headers=self.htmx)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.search_url)
+        # Session, user and the navbar's stats
+        self.assertEqual(len(app_queries(queries)), 3)
+        self.assertIn("Test note #1", response.text)
+        self.assertIn('id="note_search_input"', response.text)
+
+    def test_other_parameters_share_the_cache_entry(self):
+        """
+        Test that query parameters other than the search, like a page
+        number, don't get cache entries of their own.
+        """
+        self.client.get(self.search_url, headers=self.htmx)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f"{self.search_url}&page=2", headers=self.htmx)
+        # Session and user
+        self.assertEqual(len(app_queries(queries)), 2)
+
+    def test_create_invalidates_cache(self):
+        """
+        Test that a new note shows up in a previously cached search.
+        """
+        self.client.get(self.search_url, headers=self.htmx)
+        Note.objects.create(title="Test note #4", content="New", author=self.test_user)
+
+        response = self.client.get(self.search_url, headers=self.htmx)
+        self.assertIn("Test note #4", response.text)
+
+    def test_edit_invalidates_cache(self):
+        """
+        Test that edited titles replace the cached ones.
+        """
+        self.client.get(self.note_list_url)
+        note = Note.objects.get(title="Test note #1")
+        self.client.post(
+            reverse("notes:edit", args=[note.id]),
+            {"title": "Renamed note", "content": note.content},
+        )
+
+        response = self.client.get(self.note_list_url)
+        self.assertIn("Renamed note", response.text)
+        self.assertNotIn("Test note #1", response.text)
+
+    def test_delete_invalidates_cache(self):
+        """
+        Test that deleted notes drop out of the cached list.
+        """
+        self.client.get(self.note_list_url)
+        note = Note.objects.get(title="Test note #1")
+        self.client.post(reverse("notes:delete", args=[note.id]))
+
+        response = self.client.get(self.note_list_url)
+        self.assertNotIn("Test note #1", response.text)
+
+    def test_cache_is_per_user(self):
+        """
+        Test that users never see each other's cached results.
+        """
+        self.client.get(self.note_list_url)
+        self.client.force_login(self.strange_user)
+
+        response = self.client.get(self.note_list_url)
+        self.assertIn("Strange note #1", response.text)
+        self.assertNotIn("Test note #1", response.text)
+
+
+class NoteListDatabaseCacheTests(NoteTestCase):
+    """
+    Integration tests for the note list without Redis, where the shared
+    cache is a database table.
+    """
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.test_user)
+
+    def test_list_is_not_cached(self):
+        """
+        Test that the list is rendered from the notes each time rather
+        than cached in the database.
+        """
+        self.client.get(self.note_list_url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.note_list_url, headers={"HX-Request": "true"})
+        # Session, user and notes
+        self.assertEqual(len(app_queries(queries)), 3)
+        self.assertIn("Test note #1", response.text)
+
+    def test_writes_skip_the_cache(self):
+        """
+        Test that saving a note doesn't bump a list version in the
+        cache table.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse("notes:new"), {"title": "New", "content": "New"})
+        self.assertFalse([q for q in queries if "littlenote_cache" in q["sql"]])
+
+
+class BoostedNavigationTests(NoteTestCase):
+    """
+    Integration tests for boosted navigation between app pages.
+    """
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.test_user)
+        self.boosted = {"HX-Request": "true", "HX-Boosted": "true"}
+
+    def test_boosted_request_gets_content_and_header(self):
+        """
+        Test that boosted navigation gets the page content and an
+        out-of-band header with the navbar, without the page around it.
+        """
+        response = self.client.get(reverse("journal:home"), headers=self.boosted)
+
+        self.assertNotIn("<html", response.text)
+        self.assertNotIn('id="admin_nav"', response.text)
+        self.assertIn('class="journal"', response.text)
+        self.assertIn('<header id="app_header" hx-swap-oob="innerHTML">', response.text)
+        self.assertRegex(response.text, r'nav-item active">\s*<a href="/journal/')
+        self.assertIn("HX-Boosted", response["Vary"])
+
+    def test_boosted_list_is_not_a_fragment(self):
+        """
+        Test that boosted navigation to the notes list gets the search
+        form along with the entries, unlike a search.
+        """
+        response = self.client.get(self.note_list_url, headers=self.boosted)
+
+        self.assertNotIn("<html", response.text)
+        self.assertIn('id="note_search_input"', response.text)
+        self.assertIn("Test note #1", response.text)
+
+    def test_history_restore_gets_full_page(self):
+        """
+        Test that a history restore, which replaces the whole body, gets
+        the full page.
+        """
+        response = self.client.get(
+            self.note_list_url,
+            headers={"HX-Request": "true", "HX-History-Restore-Request": "true"},
+        )
+        self.assertIn("<html", response.text)
+
+    def test_boosted_form_errors_stay_in_content(self):
+        """
+        Test that a boosted form with errors is shown again in the
+        content block.
+        """
+        note = Note.objects.get(title="Test note #1")
+        response = self.client.post(
+            reverse("notes:edit", args=[note.id]),
+            {"title": "Renamed note", "content": ""},
+            headers=self.boosted,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("<html", response.text)
+        self.assertIn('id="note_form"', response.text)
+
+
 class NewNoteTests(NoteTestCase):
     """
     Integration tests for new note page.
@@ -210,6 +429,94 @@ class NoteDeleteTests(NoteTestCase):
         response = self.client.get(self.note_list_url)
         self.assertNotIn(self.test_note.title, response.text)
 
+    def test_deleted_note_is_moved_to_trash(self):
+        """
+        Test that deleting a note keeps it in the trash, where it can
+        no longer be opened.
+        """
+        self.client.force_login(self.test_user)
+        self.client.post(self.test_note_delete_url)
+
+        self.assertFalse(Note.objects.filter(id=self.test_note.id).exists())
+        self.assertTrue(Note.all_objects.trashed().filter(id=self.test_note.id).exists())
+        self.assertTrue(Tombstone.objects.filter(object_id=self.test_note.id).exists())
+
+        response = self.client.get(reverse("notes:detail", args=[self.test_note.id]))
+        self.assertEqual(response.status_code, 404)
+
+
+class NoteTrashTests(NoteTestCase):
+    """
+    Integration tests for the trash page, restoring and deleting for
+    good.
+    """
+    def setUp(self):
+        super().setUp()
+        self.test_note = Note.objects.get(title="Test note #1")
+        self.test_note_delete_url = reverse("notes:delete", args=[self.test_note.id])
+        self.restore_url = reverse("notes:restore", args=[self.test_note.id])
+        self.destroy_url = reverse("notes:destroy", args=[self.test_note.id])
+        self.trash_url = reverse("notes:trash")
+
+        self.client.force_login(self.test_user)
+        self.client.post(self.test_note_delete_url)
+
+    def test_trash_lists_only_own_trashed_notes(self):
+        """
+        Test that the trash shows the user's trashed notes only.
+        """
+        strange_note = Note.objects.get(title="Strange note #1")
+        self.client.force_login(self.strange_user)
+        self.client.post(reverse("notes:delete", args=[strange_note.id]))
+
+        self.client.force_login(self.test_user)
+        response = self.client.get(self.trash_url)
+        self.assertContains(response, "Test note #1")
+        self.assertNotContains(response, "Test note #2")
+        self.assertNotContains(response, "Strange note #1")
+
+    def test_restore_brings_note_back(self):
+        """
+        Test that a restored note is back in the list and no longer
+        reported to sync as deleted.
+        """
+        self.client.get(self.note_list_url)
+        response = self.client.post(self.restore_url)
+
+        self.assertRedirects(response, self.trash_url)
+        self.assertContains(self.client.get(self.note_list_url), "Test note #1")
+        self.assertFalse(Tombstone.objects.filter(object_id=self.test_note.id).exists())
+
+    def test_destroy_deletes_for_good(self):
+        """
+        Test that deleting from the trash removes the note without a
+        second tombstone.
+        """
+        self.client.post(self.destroy_url)
+
+        self.assertFalse(Note.all_objects.filter(id=self.test_note.id).exists())
+        self.assertEqual(Tombstone.objects.filter(object_id=self.test_note.id).count(), 1)
+
+    def test_strangers_cannot_restore_or_destroy(self):
+        """
+        Test that other users' trashed notes 404.
+        """
+        self.client.force_login(self.strange_user)
+
+        self.assertEqual(self.client.post(self.restore_url).status_code, 404)
+        self.assertEqual(self.client.post(self.destroy_url).status_code, 404)
+        self.assertTrue(Note.all_objects.trashed().filter(id=self.test_note.id).exists())
+
+    def test_live_notes_cannot_be_destroyed(self):
+        """
+        Test that only notes in the trash can be deleted for good.
+        """
+        live_note = Note.objects.get(title="Test note #2")
+        response = self.client.post(reverse("notes:destroy", args=[live_note.id]))
+
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Note.objects.filter(id=live_note.id).exists())
+
 
 class NoteEditTests(NoteTestCase):
     """
@@ -285,3 +592,231 @@ class NoteEditTests(NoteTestCase):
         response = self.client.get(reverse("notes:detail", args=[self.test_note.id]))
         self.assertNotIn("Test note #1", response.text)
         self.assertNotIn("Hello, test user!", response.text)
+
+
+class NoteBatchTests(QueryBudgetMixin, NoteTestCase):
+    """
+    Integration tests for the batch write endpoint.
+    """
+    def setUp(self):
+        super().setUp()
+        self.batch_url = reverse("notes:batch")
+        self.test_note = Note.objects.get(title="Test note #1")
+        self.strange_note = Note.objects.get(title="Strange note #1")
+        self.client.force_login(self.test_user)
+
+    def post_batch(self, operations):
+        return self.client.post(
+            self.batch_url,
+            json.dumps({"operations": operations}),
+            content_type="application/json",
+        )
+
+    def test_batch_requires_login(self):
+        """
+        Test that anonymous requests are refused rather than redirected.
+        """
+        self.client.logout()
+        self.assertEqual(self.post_batch([]).status_code, 403)
+
+    def test_batch_applies_operations_in_order(self):
+        """
+        Test that creates, updates and deletes are applied and reported
+        in request order.
+        """
+        new_id = str(uuid.uuid4())
+        second_note = Note.objects.get(title="Test note #2")
+
+        response = self.post_batch([
+            {"op": "create", "id": new_id, "title": "Offline note", "content": "Written offline"},
+            {"op": "update", "id": str(self.test_note.id), "content": "Edited offline"},
+            {"op": "delete", "id": str(second_note.id)},
+        ])
+
+        statuses = [result["status"] for result in response.json()["results"]]
+        self.assertEqual(statuses, [BatchConfig.CREATED, BatchConfig.UPDATED, BatchConfig.DELETED])
+        self.assertTrue(Note.objects.filter(id=new_id, author=self.test_user).exists())
+        self.test_note.refresh_from_db()
+        self.assertEqual(self.test_note.content, "Edited offline")
+        self.assertEqual(self.test_note.title, "Test note #1")
+        self.assertFalse(Note.objects.filter(id=second_note.id).exists())
+
+    def test_invalid_operations_are_reported_individually(self):
+        """
+        Test that bad operations fail on their own without blocking the
+        rest of the batch.
+        """
+        response = self.post_batch([
+            {"op": "rename"},
+            {"op": "update", "id": "not-a-uuid", "content": "x"},
+            {"op": "create", "title": "No content"},
+            {"op": "create", "content": "Fine"},
+        ])
+
+        results = response.json()["results"]
+        self.assertEqual(
+            [result.get("error") for result in results],
+            [
+                ErrorMessages.UNKNOWN_OPERATION,
+                ErrorMessages.INVALID_ID,
+                ErrorMessages.MISSING_CONTENT,
+                None,
+            ],
+        )
+        self.assertTrue(Note.objects.filter(content="Fine").exists())
+
+    def test_batch_cannot_touch_strange_notes(self):
+        """
+        Test that other users' notes are reported as not found and left
+        alone.
+        """
+        response = self.post_batch([
+            {"op": "update", "id": str(self.strange_note.id), "content": "Hijacked"},
+            {"op": "delete", "id": str(self.strange_note.id)},
+        ])
+
+        results = response.json()["results"]
+        self.assertEqual(results[0]["error"], ErrorMessages.NOT_FOUND)
+        self.assertEqual(results[1]["error"], ErrorMessages.DUPLICATE_ID)
+        self.strange_note.refresh_from_db()
+        self.assertEqual(self.strange_note.content, "Hello, stranger!")
+
+    def test_create_with_existing_id_fails(self):
+        """
+        Test that creates can't overwrite an existing note.
+        """
+        response = self.post_batch([
+            {"op": "create", "id": str(self.strange_note.id), "content": "Mine now"},
+        ])
+        self.assertEqual(response.json()["results"][0]["error"], ErrorMessages.ID_EXISTS)
+
+    def test_deletes_leave_tombstones_and_refresh_list(self):
+        """
+        Test that batch deletes are visible to sync and the note list.
+        """
+        self.client.get(self.note_list_url)
+        self.post_batch([{"op": "delete", "id": str(self.test_note.id)}])
+
+        self.assertTrue(Tombstone.objects.filter(object_id=self.test_note.id).exists())
+        self.assertNotIn("Test note #1", self.client.get(self.note_list_url).text)
+
+    def test_malformed_requests(self):
+        """
+        Test that bodies without an operations list, or with too many
+        operations, are rejected.
+        """
+        response = self.client.post(self.batch_url, "[]", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+        too_many = [{"op": "create", "content": "x"}] * (BatchConfig.MAX_OPERATIONS + 1)
+        self.assertEqual(self.post_batch(too_many).status_code, 400)
+
+    def test_batch_query_count_is_constant(self):
+        """
+        Test that a batch runs the same queries for 1 or 100 of each
+        operation.
+        """
+        counts = []
+        for size in (1, 100):
+            notes = Note.objects.bulk_create([
+                Note(title=f"Bulk note #{num}", content="Hello!", author=self.test_user)
+                for num in range(size * 2)
+            ])
+            operations = (
+                [{"op": "create", "content": "New"} for _ in range(size)]
+                + [{"op": "update", "id": str(note.id), "content": "Edited twice"} for note in notes[:size]]
+                + [{"op": "delete", "id": str(note.id)} for note in notes[size:]]
+            )
+            _, count = self.assertWithinQueryBudget(
+                self.batch_url,
+                "post",
+                json.dumps({"operations": operations}),
+                content_type="application/json",
+            )
+            counts.append(count)
+
+        self.assertEqual(counts[0], counts[1])
+
+
+class NoteQueryBudgetTests(QueryBudgetMixin, NoteTestCase):
+    """
+    Query-count contracts for note views.
+    """
+    def setUp(self):
+        super().setUp()
+        self.test_note = Note.objects.get(title="Test note #1")
+        self.client.force_login(self.test_user)
+
+    def _populate_notes(self, count):
+        existing = Note.objects.filter(author=self.test_user).count()
+        Note.objects.bulk_create([
+            Note(title=f"Bulk note #{num}", content="Hello!", author=self.test_user)
+            for num in range(existing, count)
+        ])
+        invalidate_list(self.test_user.pk)
+
+    def test_note_list_query_count_is_constant(self):
+        """
+        Test that the note list runs the same queries for 1 or 100
+        notes.
+        """
+        Note.objects.filter(author=self.test_user).delete()
+        self.assertQueryCountConstant(self.note_list_url, self._populate_notes)
+
+    def test_note_search_query_count_is_constant(self):
+        """
+        Test that note search runs the same queries for 1 or 100 notes.
+        """
+        Note.objects.filter(author=self.test_user).delete()
+        # Searches get the list fragment, without the navbar's stats
+        self.assertQueryCountConstant(
+            f"{self.note_list_url}?search=note",
+            self._populate_notes,
+            budget=3,
+            headers={"HX-Request": "true"},
+        )
+
+    def test_note_detail_within_budget(self):
+        """
+        Test that note detail stays within its query budget, without a
+        separate query for the author.
+        """
+        self.assertWithinQueryBudget(reverse("notes:detail", args=[self.test_note.id]))
+
+    def test_note_edit_within_budget(self):
+        """
+        Test that viewing and submitting the edit page stay within
+        budget.
+        """
+        url = reverse("notes:edit", args=[self.test_note.id])
+        self.assertWithinQueryBudget(url)
+        self.assertWithinQueryBudget(url, "post", {"title": "Edited", "content": "Edited"})
+
+    def test_new_note_within_budget(self):
+        """
+        Test that creating a note stays within budget.
+        """
+        self.assertWithinQueryBudget(
+            reverse("notes:new"), "post", {"title": "New", "content": "New"}
+        )
+
+    def test_note_delete_within_budget(self):
+        """
+        Test that deleting a note stays within budget.
+        """
+        self.assertWithinQueryBudget(
+            reverse("notes:delete", args=[self.test_note.id]), "post"
+        )
+
+    def test_trash_within_budget(self):
+        """
+        Test that the trash, restoring and deleting for good stay within
+        budget.
+        """
+        for note in Note.objects.filter(author=self.test_user):
+            self.client.post(reverse("notes:delete", args=[note.id]))
+        notes = list(Note.all_objects.filter(author=self.test_user))
+
+        self.assertWithinQueryBudget(reverse("notes:trash"))
+        self.assertWithinQueryBudget(reverse("notes:restore", args=[notes[0].id]), "post")
+        self.assertWithinQueryBudget(reverse("notes:destroy", args=[notes[1].id]), "post")
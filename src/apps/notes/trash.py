@@ -0,0 +1,79 @@
+"""Moving notes to the trash, restoring them and purging them for good."""
+
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_list
+from .constants import TrashConfig
+from .models import Note
+from .signals import notes_restored, notes_trashed
+
+
+def lock_notes(queryset, ids):
+    """
+    Lock the notes in queryset with the given IDs and return the IDs
+    of those that are still in it. A concurrent trash or restore of the
+    same notes has to wait for the lock, and then finds them gone from
+    its queryset, so the notes it changes are never counted twice.
+    """
+    return list(
+        queryset.select_for_update().filter(pk__in=ids).order_by("pk").values_list("pk", flat=True)
+    )
+
+
+def trash_notes(author_id, ids):
+    """
+    Move the author's notes to the trash with a single UPDATE, in the
+    same transaction as the notes_trashed handlers, which get only the
+    notes that were trashed. Returns the number of notes trashed.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = lock_notes(Note.objects.filter(author_id=author_id), ids)
+        if ids:
+            Note.all_objects.filter(pk__in=ids).update(deleted_at=now, modified_at=now)
+            notes_trashed.send(sender=Note, author_id=author_id, ids=ids)
+            invalidate_list(author_id)
+    return len(ids)
+
+
+def restore_notes(author_id, ids):
+    """
+    Take the author's notes back out of the trash. Returns the number
+    of notes restored.
+    """
+    with transaction.atomic():
+        ids = lock_notes(Note.all_objects.trashed().filter(author_id=author_id), ids)
+        if ids:
+            Note.all_objects.filter(pk__in=ids).update(deleted_at=None, modified_at=timezone.now())
+            notes_restored.send(sender=Note, author_id=author_id, ids=ids)
+            invalidate_list(author_id)
+    return len(ids)
+
+
+def purge_trash(retention=TrashConfig.RETENTION, batch_size=TrashConfig.PURGE_BATCH_SIZE,
+                pause=TrashConfig.PURGE_PAUSE):
+    """
+    Permanently delete notes that have been in the trash for longer
+    than retention, batch_size at a time. Each batch is its own short
+    DELETE by primary key, so no lock is held for long however much
+    there is to purge. Returns the number of notes deleted.
+
+    Signals aren't sent: trashed notes already have their tombstones
+    and are no longer in anyone's note list.
+    """
+    cutoff = timezone.now() - retention
+    trashed = Note.all_objects.filter(deleted_at__lt=cutoff)
+    total = 0
+
+    while ids := list(trashed.values_list("pk", flat=True)[:batch_size]):
+        # Nothing references notes, so deleting without loading them is safe
+        Note.all_objects.filter(pk__in=ids)._raw_delete(Note.all_objects.db)
+        total += len(ids)
+        if len(ids) < batch_size:
+            break
+        time.sleep(pause)
+
+    return total
@@ -2,10 +2,14 @@ from django.urls import path
 
 from .views import (
     NotesListView,
+    NoteBatchView,
     NoteCreateView,
     NoteDeleteView,
+    NoteDestroyView,
     NoteDetailView,
     NoteEditView,
+    NoteRestoreView,
+    NoteTrashView,
 )
 
 app_name = "notes"
@@ -15,5 +19,9 @@ urlpatterns = [
     path("<uuid:pk>/", NoteDetailView.as_view(), name="detail"),
     path("new/", NoteCreateView.as_view(), name="new"),
     path("edit/<uuid:pk>/", NoteEditView.as_view(), name="edit"),
-    path("delete/<uuid:pk>/", NoteDeleteView.as_view(), name="delete")
+    path("delete/<uuid:pk>/", NoteDeleteView.as_view(), name="delete"),
+    path("batch/", NoteBatchView.as_view(), name="batch"),
+    path("trash/", NoteTrashView.as_view(), name="trash"),
+    path("trash/<uuid:pk>/restore/", NoteRestoreView.as_view(), name="restore"),
+    path("trash/<uuid:pk>/delete/", NoteDestroyView.as_view(), name="destroy"),
 ]
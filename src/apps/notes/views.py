@@ -1,32 +1,62 @@
-from django.contrib.auth import get_user
+import json
+
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import IntegrityError
 from django.db.models import Q
-from django.http import Http404
+from django.http import Http404, HttpResponseRedirect, JsonResponse
 from django.urls import reverse_lazy
-from django.views.generic import CreateView, DetailView, ListView, UpdateView
+from django.utils.safestring import mark_safe
+from django.views import View
+from django.views.generic import CreateView, DetailView, ListView, TemplateView, UpdateView
 from django.views.generic.edit import DeleteView
 
+from src.apps.common.htmx import BoostedNavigationMixin, FragmentMixin, render_blocks
+from src.apps.common.replicas import ReplicaReadMixin
+
+from .batch import BatchError, apply_batch
+from .cache import get_or_render_entries, normalize_query
+from .constants import ErrorMessages, TrashConfig
 from .models import Note
+from .trash import restore_notes, trash_notes
 
 
-class NotesListView(LoginRequiredMixin, ListView):
+class AuthorNoteMixin:
     """
-    View for the notes list page.
+    Limit note lookups to the logged-in user's notes, so other users'
+    notes 404 without a second query to load the author.
     """
 
-    model = Note
-    context_object_name = "notes"
+    def get_queryset(self):
+        return Note.objects.filter(author=self.request.user)
+
+
+class NotesListView(ReplicaReadMixin, LoginRequiredMixin, BoostedNavigationMixin, TemplateView):
+    """
+    View for the notes list page. The list entries are cached per user
+    and search, see notes.cache.
+    """
+
+    template_name = "notes/list.html"
+    fragment_block = "note_list"
     redirect_field_name = None
 
-    def get_template_names(self):
-        if self.request.headers.get("HX-Request"):
-            return ["notes/partials/list_entries.html"]
-        return ["notes/list.html"]
+    # Session, user, notes, stats. With Redis the notes are only queried
+    # on a cache miss; with the database cache the list isn't cached.
+    query_budget = 4
+
+    def get(self, request, *args, **kwargs):
+        has_notes, entries = get_or_render_entries(
+            request.user.pk, self.get_search_query(), self.render_entries
+        )
+
+        return self.render_to_response({"has_notes": has_notes, "entries": mark_safe(entries)})
+
+    def get_search_query(self):
+        return normalize_query(self.request.GET.get("search", ""))
 
     def get_queryset(self):
-        user = get_user(self.request)
-        query = self.request.GET.get("search", "").strip()
-        queryset = Note.objects.filter(author=user)
+        query = self.get_search_query()
+        queryset = Note.objects.filter(author=self.request.user)
 
         if query:
             queryset = queryset.filter(
@@ -35,8 +65,19 @@ class NotesListView(LoginRequiredMixin, ListView):
 
         return queryset
 
+    def render_entries(self):
+        """
+        Render the list entries for the cache. Only called on a cache
+        miss, so repeated searches don't touch the notes table.
+        """
+        notes = list(self.get_queryset())
+        blocks = render_blocks(
+            self.template_name, [self.fragment_block], {"notes": notes}, self.request
+        )
+        return bool(notes), blocks[self.fragment_block]
+
 
-class NoteCreateView(LoginRequiredMixin, CreateView):
+class NoteCreateView(LoginRequiredMixin, BoostedNavigationMixin, CreateView):
     """
     View for the new note page.
     """
@@ -47,14 +88,18 @@ class NoteCreateView(LoginRequiredMixin, CreateView):
     success_url = reverse_lazy("notes:list")
     redirect_field_name = None
 
+    # Session, user, insert, stats
+    query_budget = 4
+
     def form_valid(self, form):
         form.instance.author = self.request.user
         return super().form_valid(form)
 
 
-class NoteDeleteView(LoginRequiredMixin, DeleteView):
+class NoteDeleteView(LoginRequiredMixin, FragmentMixin, AuthorNoteMixin, DeleteView):
     """
-    View for note deletion.
+    View for note deletion. Notes are moved to the trash rather than
+    deleted, see notes.trash.
     """
 
     model = Note
@@ -62,16 +107,80 @@ class NoteDeleteView(LoginRequiredMixin, DeleteView):
     template_name = "notes/delete.html"
     redirect_field_name = None
 
-    def get_object(self, queryset=None):
-        note = super().get_object(queryset)
+    # Session, user, note, lock, update, tombstone, trashed content,
+    # stats
+    query_budget = 8
+
+    def form_valid(self, form):
+        trash_notes(self.request.user.pk, [self.object.pk])
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class NoteTrashView(LoginRequiredMixin, BoostedNavigationMixin, ListView):
+    """
+    View for the trash page, listing trashed notes with the most
+    recently deleted first.
+    """
+
+    template_name = "notes/trash.html"
+    context_object_name = "notes"
+    redirect_field_name = None
+
+    # Session, user, notes, stats
+    query_budget = 4
+
+    def get_queryset(self):
+        return (
+            Note.all_objects.trashed()
+            .filter(author=self.request.user)
+            .only("id", "title", "content", "deleted_at")
+            .order_by("-deleted_at")
+        )
 
-        if get_user(self.request) != note.author:
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["retention_days"] = TrashConfig.RETENTION.days
+        return context
+
+
+class NoteRestoreView(LoginRequiredMixin, FragmentMixin, View):
+    """
+    View for taking a note back out of the trash.
+    """
+
+    redirect_field_name = None
+
+    # Session, user, lock, update, tombstone, restored content, stats
+    query_budget = 7
+
+    def post(self, request, *args, **kwargs):
+        if not restore_notes(request.user.pk, [kwargs["pk"]]):
             raise Http404
+        return HttpResponseRedirect(reverse_lazy("notes:trash"))
+
+
+class NoteDestroyView(LoginRequiredMixin, FragmentMixin, View):
+    """
+    View for deleting a note in the trash for good.
+    """
+
+    redirect_field_name = None
+
+    # Session, user, note, delete
+    query_budget = 4
 
-        return note
+    def post(self, request, *args, **kwargs):
+        deleted, _ = (
+            Note.all_objects.trashed()
+            .filter(author=request.user, pk=kwargs["pk"])
+            .delete()
+        )
+        if not deleted:
+            raise Http404
+        return HttpResponseRedirect(reverse_lazy("notes:trash"))
 
 
-class NoteDetailView(LoginRequiredMixin, DetailView):
+class NoteDetailView(ReplicaReadMixin, LoginRequiredMixin, BoostedNavigationMixin, AuthorNoteMixin, DetailView):
     """
     View for a single note.
     """
@@ -80,16 +189,11 @@ class NoteDetailView(LoginRequiredMixin, DetailView):
     template_name = "notes/detail.html"
     redirect_field_name = None
 
-    def get_object(self, queryset=None):
-        note = super().get_object(queryset)
+    # Session, user, note, stats
+    query_budget = 4
 
-        if get_user(self.request) != note.author:
-            raise Http404
 
-        return note
-
-
-class NoteEditView(LoginRequiredMixin, UpdateView):
+class NoteEditView(LoginRequiredMixin, BoostedNavigationMixin, AuthorNoteMixin, UpdateView):
     """
     View for note edit page.
     """
@@ -100,13 +204,40 @@ class NoteEditView(LoginRequiredMixin, UpdateView):
     context_object_name = "note"
     redirect_field_name = None
 
-    def get_object(self, queryset=None):
-        note = super().get_object(queryset)
-
-        if get_user(self.request) != note.author:
-            raise Http404
-
-        return note
+    # Session, user, note, stats to show the page; session, user, note,
+    # update, stats to save it
+    query_budget = {"GET": 4, "POST": 5}
 
     def get_success_url(self):
         return reverse_lazy("notes:detail", args=[self.object.id])
+
+
+class NoteBatchView(LoginRequiredMixin, View):
+    """
+    JSON endpoint that applies a list of note create, update and delete
+    operations in one transaction, for clients reconciling offline
+    edits. Returns one result per operation.
+    """
+    raise_exception = True
+
+    # Session, user, ID check, insert, stats, lookup, update, stats,
+    # delete lookup, lock, trash, tombstones, trashed content, stats
+    query_budget = 14
+
+    def post(self, request, *args, **kwargs):
+        try:
+            operations = json.loads(request.body)["operations"]
+            if not isinstance(operations, list):
+                raise TypeError
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({"error": ErrorMessages.INVALID_JSON}, status=400)
+
+        try:
+            results = apply_batch(request.user, operations)
+        except BatchError as error:
+            return JsonResponse({"error": str(error)}, status=400)
+        except IntegrityError:
+            # A concurrent request created a note with one of the IDs
+            return JsonResponse({"error": ErrorMessages.ID_EXISTS}, status=409)
+
+        return JsonResponse({"results": results})
@@ -15,6 +15,12 @@ class AuthConfig:
     EMAIL_REQUEST_RATE_LIMIT = "3/h"
     PASSCODE_ATTEMPT_RATE_LIMIT = "5/m"
 
+    # Names of the rate limits, used as ratelimit groups and as metric
+    # and log labels
+    LOGIN_LIMIT = "login"
+    EMAIL_LIMIT = "email"
+    PASSCODE_LIMIT = "passcode"
+
 
 class AuthSessionKeys:
     """
@@ -52,6 +58,7 @@ class ErrorMessages:
     INCORRECT_EMAIL = "Incorrect email address. Please try again."
     INCORRECT_PASSCODE = "Incorrect passcode. Please try again."
     EXPIRED_PASSCODE = "Passcode has expired. Please try again."
+    ACCOUNT_DISABLED = "This account is being deleted."
 
     # Rate-limit errors
     TOO_MANY_LOGIN_ATTEMPTS = "Too many login attempts. Please wait a moment before trying again."
@@ -66,6 +73,10 @@ class TemplatePaths:
     FRONT_PAGE = "pages/front_page.html"
     DASHBOARD = "pages/dashboard.html"
 
-    # Partials
-    EMAIL_FORM = "pages/partials/email_form.html"
-    PASSCODE_FORM = "pages/partials/passcode_form.html"
+
+class TemplateBlocks:
+    """
+    Blocks of the front page sent as fragments to htmx requests.
+    """
+    EMAIL_FORM = "email_form"
+    PASSCODE_FORM = "passcode_form"
@@ -143,6 +143,17 @@ class AuthPasscodeTest(AuthTestCase):
         user = get_user(self.client)
         self.assertTrue(user.is_authenticated)
 
+    def test_disabled_account_cannot_sign_in(self):
+        """
+        Test that an account being deleted can't be signed into, even
+        with the correct passcode.
+        """
+        User.objects.create_user(username=self.user_email, email=self.user_email, is_active=False)
+        passcode = self._get_correct_passcode()
+        response = self._submit_passcode(self.user_email, passcode)
+        self.assertContains(response, ErrorMessages.ACCOUNT_DISABLED)
+        self.assertFalse(get_user(self.client).is_authenticated)
+
     def test_expired_passcode_shows_error_message(self):
         """
         Test that submission of an expired passcode keeps the user on
@@ -281,3 +292,35 @@ class AuthEmailTest(AuthTestCase):
         response = self._submit_email(self.invalid_user_email)
         self.assertContains(response, self.EMAIL_INPUT_ID)
         self.assertNotContains(response, self.PASSCODE_INPUT_ID)
+
+    def test_htmx_email_submission_gets_passcode_form_fragment(self):
+        """
+        Test that htmx submissions get only the passcode form, and that
+        the front page varies on the htmx request header.
+        """
+        response = self.client.post(
+            self.front_page_url,
+            {"email": self.valid_user_email},
+            headers={"HX-Request": "true"},
+        )
+
+        self.assertTrue(response.text.strip().startswith("<form"))
+        self.assertContains(response, self.PASSCODE_INPUT_ID)
+        self.assertNotContains(response, "<html")
+        self.assertIn("HX-Request", response["Vary"])
+
+    def test_htmx_invalid_email_gets_email_form_fragment(self):
+        """
+        Test that htmx submissions of an invalid email address get the
+        email form back with the error message.
+        """
+        response = self.client.post(
+            self.front_page_url,
+            {"email": self.invalid_user_email},
+            headers={"HX-Request": "true"},
+        )
+
+        self.assertContains(response, "continue_with_email_button")
+        self.assertContains(response, ErrorMessages.INVALID_EMAIL)
+        self.assertNotContains(response, "<html")
+
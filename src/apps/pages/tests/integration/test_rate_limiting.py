@@ -4,8 +4,9 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from django_ratelimit.exceptions import Ratelimited
+from prometheus_client import REGISTRY
 
-from src.apps.pages.constants import ErrorMessages
+from src.apps.pages.constants import AuthConfig, ErrorMessages
 
 
 User = get_user_model()
@@ -189,3 +190,66 @@ class RateLimitingIPTest(TestCase):
             HTTP_X_FORWARDED_FOR="10.0.0.1"
         )
         self.assertEqual(response.status_code, 429)
+
+
+@override_settings(RATELIMIT_ENABLE=True)
+class RateLimitRejectionsTest(TestCase):
+    """Test that each rate limit's rejections are counted and logged under its own name."""
+
+    def setUp(self):
+        self.front_page_url = reverse("pages:front")
+        self.email = "test@example.com"
+
+    def rejections(self):
+        return {
+            limit: REGISTRY.get_sample_value(
+                "littlenote_rate_limit_rejections_total", {"limit": limit}
+            ) or 0
+            for limit in (AuthConfig.LOGIN_LIMIT, AuthConfig.EMAIL_LIMIT, AuthConfig.PASSCODE_LIMIT)
+        }
+
+    def assertRejected(self, before, limit):
+        expected = dict(before, **{limit: before[limit] + 1})
+        self.assertEqual(self.rejections(), expected)
+
+    def test_ip_limit_is_counted_as_login(self):
+        """Test that requests over the per-IP limit are counted and logged as login."""
+        for i in range(15):
+            self.client.post(self.front_page_url, {"email": f"test{i}@example.com"})
+        before = self.rejections()
+
+        with self.assertLogs("src.apps.pages.ratelimit", level="WARNING") as logs:
+            response = self.client.post(self.front_page_url, {"email": "blocked@example.com"})
+
+        self.assertContains(response, ErrorMessages.TOO_MANY_LOGIN_ATTEMPTS)
+        self.assertRejected(before, AuthConfig.LOGIN_LIMIT)
+        self.assertEqual(logs.records[0].limit, AuthConfig.LOGIN_LIMIT)
+
+    def test_email_limit_is_counted_as_email(self):
+        """Test that passcode requests over the per-email limit are counted and logged as email."""
+        for _ in range(3):
+            self.client.post(self.front_page_url, {"email": self.email})
+        before = self.rejections()
+
+        with self.assertLogs("src.apps.pages.ratelimit", level="WARNING") as logs:
+            response = self.client.post(self.front_page_url, {"email": self.email})
+
+        self.assertContains(response, ErrorMessages.TOO_MANY_EMAIL_REQUESTS)
+        self.assertRejected(before, AuthConfig.EMAIL_LIMIT)
+        self.assertEqual(logs.records[0].limit, AuthConfig.EMAIL_LIMIT)
+
+    def test_passcode_limit_is_counted_as_passcode(self):
+        """Test that passcode attempts over the limit are counted and logged as passcode."""
+        self.client.post(self.front_page_url, {"email": self.email})
+        for i in range(5):
+            self.client.post(self.front_page_url, {"email": self.email, "passcode": f"wrong{i}"})
+        before = self.rejections()
+
+        with self.assertLogs("src.apps.pages.ratelimit", level="WARNING") as logs:
+            response = self.client.post(
+                self.front_page_url, {"email": self.email, "passcode": "wrong"}
+            )
+
+        self.assertContains(response, ErrorMessages.TOO_MANY_PASSCODE_ATTEMPTS)
+        self.assertRejected(before, AuthConfig.PASSCODE_LIMIT)
+        self.assertEqual(logs.records[0].limit, AuthConfig.PASSCODE_LIMIT)
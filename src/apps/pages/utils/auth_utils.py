@@ -5,11 +5,16 @@ import time
 
 from django.conf import settings
 from django.core.mail import send_mail
-import resend
+
+from src.apps.common.imports import lazy_import
+from src.apps.common.metrics import EMAIL_SEND_DURATION, EMAIL_SEND_FAILURES
 
 from ..constants import AuthSessionKeys, EmailTemplates, ErrorMessages, AuthConfig
 
 
+# Only loaded when an email is sent through Resend
+resend = lazy_import("resend")
+
 def normalize_email(email):
     """
     Normalize email address by setting to lowercase and removing
@@ -32,19 +37,32 @@ def send_passcode_email(email, passcode):
 
     if hasattr(settings, 'RESEND_API_KEY') and getattr(settings, 'RESEND_API_KEY'):
         try:
-            resend.api_key = settings.RESEND_API_KEY
-            resend.Emails.send({
-                "from": settings.SERVER_EMAIL,
-                "to": [email],
-                "subject": subject,
-                "text": message,
-            })
+            with EMAIL_SEND_DURATION.labels("resend").time():
+                resend.api_key = settings.RESEND_API_KEY
+                resend.Emails.send({
+                    "from": settings.SERVER_EMAIL,
+                    "to": [email],
+                    "subject": subject,
+                    "text": message,
+                })
         except Exception:
             # Fallback to SMTP if Resend fails
-            send_mail(subject, message, settings.SERVER_EMAIL, [email], fail_silently=False)
+            EMAIL_SEND_FAILURES.labels("resend").inc()
+            _send_smtp(subject, message, email)
     else:
         # Use SMTP for development/local
-        send_mail(subject, message, settings.SERVER_EMAIL, [email], fail_silently=False)
+        _send_smtp(subject, message, email)
+
+def _send_smtp(subject, message, email):
+    """
+    Send an email over SMTP, recording its duration and any failure.
+    """
+    try:
+        with EMAIL_SEND_DURATION.labels("smtp").time():
+            send_mail(subject, message, settings.SERVER_EMAIL, [email], fail_silently=False)
+    except Exception:
+        EMAIL_SEND_FAILURES.labels("smtp").inc()
+        raise
 
 def set_passcode_session(request, email, code):
     """
@@ -1,18 +1,20 @@
 """Views for the front page."""
 
+import logging
+
 from django.contrib import messages
 from django.contrib.auth import get_user_model, login
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
-from django.http.response import HttpResponse
-from django.shortcuts import redirect, render
+from django.shortcuts import redirect
 from django.urls import reverse
-from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
-from django_ratelimit.decorators import ratelimit
-from django_ratelimit.exceptions import Ratelimited
+from django_ratelimit.core import is_ratelimited
+
+from src.apps.common.htmx import FragmentMixin, htmx_redirect
+from src.apps.common.metrics import RATE_LIMIT_REJECTIONS
 
-from ..constants import AuthConfig, ErrorMessages, SuccessMessages, TemplatePaths
+from ..constants import AuthConfig, ErrorMessages, SuccessMessages, TemplateBlocks, TemplatePaths
 from ..utils.auth_utils import (
     delete_passcode_session_data,
     generate_passcode,
@@ -24,9 +26,10 @@ from ..utils.auth_utils import (
 
 
 User = get_user_model()
+ratelimit_logger = logging.getLogger("src.apps.pages.ratelimit")
 
 
-class FrontPageView(TemplateView):
+class FrontPageView(FragmentMixin, TemplateView):
     template_name =  TemplatePaths.FRONT_PAGE
 
     def dispatch(self, request, *args, **kwargs):
@@ -34,80 +37,95 @@ class FrontPageView(TemplateView):
             return redirect("notes:list")
         return super().dispatch(request, *args, **kwargs)
 
-    @method_decorator(ratelimit(key="ip", rate=AuthConfig.GENERAL_RATE_LIMIT, method="POST", block=True))
     def post(self, request, *args, **kwargs):
         """Handle POST requests from the home page."""
-        try:
-            user_email = normalize_email(request.POST.get("email", ""))
-            user_passcode = request.POST.get("passcode", "")
-
-            try:
-                validate_email(user_email)
-            except ValidationError:
-                messages.error(request, ErrorMessages.INVALID_EMAIL)
-                return self._render_email_form(request)
-
-            if user_passcode:
-                return self._handle_passcode_submission(request, user_email, user_passcode)
-            else:
-                return self._handle_email_submission(request, user_email)
-
-        except Ratelimited:
+        if self._rate_limited(request, AuthConfig.LOGIN_LIMIT, "ip", AuthConfig.GENERAL_RATE_LIMIT):
             messages.error(request, ErrorMessages.TOO_MANY_LOGIN_ATTEMPTS)
             return self._render_email_form(request)
 
+        user_email = normalize_email(request.POST.get("email", ""))
+        user_passcode = request.POST.get("passcode", "")
 
-    @method_decorator(ratelimit(key="post:email", rate=AuthConfig.EMAIL_REQUEST_RATE_LIMIT, method="POST", block=True))
-    def _handle_email_submission(self, request, user_email):
-        """Handle email submission and send passcode to user."""
         try:
-            context = {
-                "email": user_email,
-                "user_has_account": User.objects.filter(email=user_email).exists()
-            }
-
-            passcode = generate_passcode()
-            set_passcode_session(request, user_email, passcode)
-            send_passcode_email(user_email, passcode)
+            validate_email(user_email)
+        except ValidationError:
+            messages.error(request, ErrorMessages.INVALID_EMAIL)
+            return self._render_email_form(request)
 
-            return self._render_passcode_form(request, context)
+        if user_passcode:
+            return self._handle_passcode_submission(request, user_email, user_passcode)
+        else:
+            return self._handle_email_submission(request, user_email)
 
-        except Ratelimited:
+    def _handle_email_submission(self, request, user_email):
+        """Handle email submission and send passcode to user."""
+        if self._rate_limited(
+            request, AuthConfig.EMAIL_LIMIT, "post:email", AuthConfig.EMAIL_REQUEST_RATE_LIMIT
+        ):
             messages.error(request, ErrorMessages.TOO_MANY_EMAIL_REQUESTS)
             return self._render_email_form(request)
 
+        context = {
+            "email": user_email,
+            "user_has_account": User.objects.filter(email=user_email).exists()
+        }
+
+        passcode = generate_passcode()
+        set_passcode_session(request, user_email, passcode)
+        send_passcode_email(user_email, passcode)
+
+        return self._render_passcode_form(request, context)
 
-    @method_decorator(ratelimit(key="post:email", rate=AuthConfig.PASSCODE_ATTEMPT_RATE_LIMIT, method="POST", block=True))
     def _handle_passcode_submission(self, request, user_email, user_passcode):
         """Handle passcode submission and authentication."""
-        try:
-            is_valid, message, should_reset = validate_passcode_session(request, user_email, user_passcode)
-
-            if not is_valid:
-                messages.error(request, message)
-                return self._handle_form_reset(request, should_reset, user_email)
-
-            user, user_is_new = User.objects.get_or_create(
-                email=user_email, defaults={"username": user_email}
-            )
+        if self._rate_limited(
+            request, AuthConfig.PASSCODE_LIMIT, "post:email", AuthConfig.PASSCODE_ATTEMPT_RATE_LIMIT
+        ):
+            messages.error(request, ErrorMessages.TOO_MANY_PASSCODE_ATTEMPTS)
+            return self._render_passcode_form(request, {"email": user_email})
 
-            login(request, user)
-            delete_passcode_session_data(request)
+        is_valid, message, should_reset = validate_passcode_session(request, user_email, user_passcode)
 
-            if user_is_new:
-                messages.success(request, SuccessMessages.WELCOME_NEW_USER)
+        if not is_valid:
+            messages.error(request, message)
+            return self._handle_form_reset(request, should_reset, user_email)
 
-            redirect_url = reverse("notes:list")
-            if request.headers.get("HX-Request"):
-                response = HttpResponse()
-                response["HX-Redirect"] = redirect_url
-                return response
+        user, user_is_new = User.objects.get_or_create(
+            email=user_email, defaults={"username": user_email}
+        )
 
-            return redirect(redirect_url)
+        # Accounts are disabled while they're being deleted
+        if not user.is_active:
+            delete_passcode_session_data(request)
+            messages.error(request, ErrorMessages.ACCOUNT_DISABLED)
+            return self._render_email_form(request)
 
-        except Ratelimited:
-            messages.error(request, ErrorMessages.TOO_MANY_PASSCODE_ATTEMPTS)
-            return self._render_passcode_form(request, {"email": user_email})
+        login(request, user)
+        delete_passcode_session_data(request)
+
+        if user_is_new:
+            messages.success(request, SuccessMessages.WELCOME_NEW_USER)
+
+        return htmx_redirect(request, reverse("notes:list"))
+
+    def _rate_limited(self, request, limit, key, rate):
+        """
+        Count the request against the named rate limit, and record and
+        log it if the limit has been reached.
+        """
+        if not is_ratelimited(
+            request,
+            group=f"pages.{limit}",
+            key=key,
+            rate=rate,
+            method="POST",
+            increment=True,
+        ):
+            return False
+
+        RATE_LIMIT_REJECTIONS.labels(limit).inc()
+        ratelimit_logger.warning("Rate limit hit", extra={"limit": limit})
+        return True
 
     def _handle_form_reset(self, request, should_reset, user_email):
         """Handle form reset when passcode session data is invalid."""
@@ -121,18 +139,20 @@ class FrontPageView(TemplateView):
         }
         return self._render_passcode_form(request, context)
 
+    def get_fragment_block(self, context):
+        """Send htmx requests whichever form the page is showing."""
+        if context.get("passcode_sent"):
+            return TemplateBlocks.PASSCODE_FORM
+        return TemplateBlocks.EMAIL_FORM
+
     def _render_email_form(self, request, context=None):
         """Render email form based on request type."""
         context = context or {}
         context["passcode_sent"] = False
-
-        template_name = TemplatePaths.EMAIL_FORM if request.headers.get("HX-Request") else TemplatePaths.FRONT_PAGE
-        return render(request, template_name, context)
+        return self.render_to_response(context)
 
     def _render_passcode_form(self, request, context=None):
         """Render passcode form based on request type."""
         context = context or {}
         context["passcode_sent"] = True
-
-        template_name = TemplatePaths.PASSCODE_FORM if request.headers.get("HX-Request") else TemplatePaths.FRONT_PAGE
-        return render(request, template_name, context)
+        return self.render_to_response(context)
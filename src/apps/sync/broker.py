@@ -0,0 +1,184 @@
+"""
+Fan-out of note and journal changes to open live update streams.
+
+Every process keeps a LocalBroker of its open streams, keyed by user.
+On SQLite there's only ever one process, so events go straight to it.
+On PostgreSQL, events are sent with NOTIFY on a shared channel, and a
+listener thread in each process with open streams LISTENs on it and
+passes them on to its local broker. That way a change saved by one
+worker reaches streams held by any other.
+
+Events are small dicts with the kind of item, the action and the IDs
+of the items it applies to. Streams load and render the items
+themselves.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .constants import LiveConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBroker:
+    """
+    In-process fan-out to the asyncio queues of open streams. Safe to
+    publish to from any thread.
+    """
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        """
+        Return a queue that receives the user's events. Must be called
+        from the event loop that reads the queue.
+        """
+        queue = asyncio.Queue(LiveConfig.QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers.setdefault(user_id, {})[queue] = loop
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        with self._lock:
+            queues = self._subscribers.get(user_id, {})
+            queues.pop(queue, None)
+            if not queues:
+                self._subscribers.pop(user_id, None)
+
+    def publish(self, user_id, event):
+        with self._lock:
+            queues = list(self._subscribers.get(user_id, {}).items())
+        self._deliver(queues, event)
+
+    def publish_all(self, event):
+        """
+        Send an event to every open stream in this process.
+        """
+        with self._lock:
+            queues = [item for queues in self._subscribers.values() for item in queues.items()]
+        self._deliver(queues, event)
+
+    def _deliver(self, queues, event):
+        for queue, loop in queues:
+            try:
+                loop.call_soon_threadsafe(_put, queue, event)
+            except RuntimeError:
+                # The stream's loop has closed; it unsubscribes on its way out
+                pass
+
+
+def _put(queue, event):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # The stream has fallen too far behind to catch up event by
+        # event. Drop what's queued and have it reload instead.
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({"kind": LiveConfig.RESYNC})
+
+
+class PostgresBroker:
+    """
+    Fan-out across processes through PostgreSQL LISTEN/NOTIFY.
+    """
+    def __init__(self, local):
+        self.local = local
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        self._ensure_listener()
+        return self.local.subscribe(user_id)
+
+    def unsubscribe(self, user_id, queue):
+        self.local.unsubscribe(user_id, queue)
+
+    def publish(self, user_id, event):
+        payload = json.dumps({"user_id": user_id, **event})
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [LiveConfig.CHANNEL, payload])
+
+    def _ensure_listener(self):
+        # Started on first use rather than at import, so it never runs
+        # in processes without streams, and isn't lost across a fork
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name="live-updates-listener", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        delay = LiveConfig.RECONNECT_DELAY
+        reconnecting = False
+        while True:
+            # A connection of our own, outside Django's per-thread
+            # handler, since it's held for as long as the process runs
+            database = connections.create_connection(DEFAULT_DB_ALIAS)
+            try:
+                with database.cursor() as cursor:
+                    cursor.execute(f"LISTEN {LiveConfig.CHANNEL}")
+                delay = LiveConfig.RECONNECT_DELAY
+
+                if reconnecting:
+                    # Anything sent while we were disconnected is gone
+                    self.local.publish_all({"kind": LiveConfig.RESYNC})
+
+                for notification in database.connection.notifies():
+                    self._dispatch(notification.payload)
+            except Exception:
+                logger.exception("Live updates listener lost its database connection")
+            finally:
+                database.close()
+
+            reconnecting = True
+            time.sleep(delay)
+            delay = min(delay * 2, LiveConfig.MAX_RECONNECT_DELAY)
+
+    def _dispatch(self, payload):
+        try:
+            event = json.loads(payload)
+            user_id = event.pop("user_id")
+        except (ValueError, KeyError):
+            logger.warning("Ignoring malformed live update: %r", payload)
+            return
+        self.local.publish(user_id, event)
+
+
+local_broker = LocalBroker()
+postgres_broker = PostgresBroker(local_broker)
+
+
+def get_broker():
+    """
+    Return the broker for the default database.
+    """
+    if connections[DEFAULT_DB_ALIAS].vendor == "postgresql":
+        return postgres_broker
+    return local_broker
+
+
+def publish_on_commit(user_id, kind, action, ids):
+    """
+    Publish a change to the user's streams once the current transaction
+    commits, so streams never load rows that aren't visible yet. Changes
+    to many items at once are sent as a resync.
+    """
+    ids = [str(pk) for pk in ids]
+    if len(ids) > LiveConfig.MAX_EVENT_IDS:
+        event = {"kind": LiveConfig.RESYNC}
+    else:
+        event = {"kind": kind, "action": action, "ids": ids}
+
+    # A broker failure shouldn't fail a request that has already committed
+    transaction.on_commit(lambda: get_broker().publish(user_id, event), robust=True)
@@ -0,0 +1,79 @@
+"""Constants for the sync app."""
+
+import datetime
+
+
+class SyncConfig:
+    """
+    Delta sync constants.
+    """
+    # Rows returned per stream in one response
+    PAGE_SIZE = 500
+
+    # Rows modified this recently are left for the next sync, so a write
+    # whose transaction commits after a sync has read past its
+    # modified_at isn't skipped
+    SETTLE_TIME = datetime.timedelta(seconds=2)
+
+    # Tombstones are kept this long. Clients that haven't synced since
+    # have to start over without a cursor.
+    TOMBSTONE_RETENTION = datetime.timedelta(days=90)
+
+    CURSOR_SALT = "sync.cursor"
+
+    # Streams
+    NOTES = "notes"
+    JOURNAL_ENTRIES = "journal_entries"
+    DELETED = "deleted"
+
+    # Tombstone kinds
+    NOTE = "note"
+    JOURNAL_ENTRY = "journal_entry"
+    KINDS = [(NOTE, "Note"), (JOURNAL_ENTRY, "Journal entry")]
+
+
+class ErrorMessages:
+    """
+    Error message constants.
+    """
+    INVALID_CURSOR = "Invalid sync cursor."
+    EXPIRED_CURSOR = "Sync cursor has expired. Sync again without a cursor."
+
+
+class LiveConfig:
+    """
+    Live update stream constants.
+    """
+    # PostgreSQL NOTIFY channel shared by every user's events
+    CHANNEL = "littlenote_changes"
+
+    # Events waiting for a slow stream before it's told to resync
+    QUEUE_SIZE = 100
+
+    # Bulk changes touching more items than this are sent as a resync,
+    # to stay well under NOTIFY's 8000 byte payload limit
+    MAX_EVENT_IDS = 50
+
+    # Seconds between keepalive comments, so proxies don't close idle
+    # streams
+    KEEPALIVE = 15
+
+    # Streams end after this many seconds and the browser reconnects,
+    # so no connection is held forever
+    MAX_DURATION = 60 * 30
+
+    # Milliseconds the browser waits before reconnecting
+    RETRY = 3000
+
+    # Seconds between listener reconnection attempts, doubling up to the
+    # maximum
+    RECONNECT_DELAY = 1
+    MAX_RECONNECT_DELAY = 30
+
+    # Actions
+    SAVED = "saved"
+    DELETED = "deleted"
+
+    # Sent when events may have been missed and the page should reload
+    # its lists
+    RESYNC = "resync"
@@ -0,0 +1,8 @@
+from .utils.live import streaming_available
+
+
+def live_updates(request):
+    """
+    Tell templates whether pages can open a live updates stream.
+    """
+    return {"live_updates": streaming_available(request)}
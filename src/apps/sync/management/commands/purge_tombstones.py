@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...constants import SyncConfig
+from ...models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Delete tombstones older than the sync cursor retention period."
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - SyncConfig.TOMBSTONE_RETENTION
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(f"Deleted {deleted} tombstones.")
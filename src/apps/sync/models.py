@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from .constants import SyncConfig
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted note or journal entry, so sync clients know to
+    remove their copy.
+    """
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=16, choices=SyncConfig.KINDS)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["author", "deleted_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
@@ -0,0 +1,89 @@
+"""Signal handlers for the sync app."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.apps.accounts.deletion import deleting_account
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+from src.apps.notes.signals import notes_bulk_saved, notes_restored, notes_trashed
+
+from .broker import publish_on_commit
+from .constants import LiveConfig, SyncConfig
+from .models import Tombstone
+
+
+@receiver(post_delete, sender=Note)
+def record_note_deletion(sender, instance, origin=None, **kwargs):
+    # Notes deleted from the trash got their tombstone when trashed
+    if not deleting_account(origin) and instance.deleted_at is None:
+        Tombstone.objects.create(
+            author_id=instance.author_id, kind=SyncConfig.NOTE, object_id=instance.pk
+        )
+
+
+@receiver(post_delete, sender=JournalEntry)
+def record_journal_entry_deletion(sender, instance, origin=None, **kwargs):
+    if not deleting_account(origin):
+        Tombstone.objects.create(
+            author_id=instance.author_id, kind=SyncConfig.JOURNAL_ENTRY, object_id=instance.pk
+        )
+
+
+@receiver(notes_trashed)
+def record_note_trashing(sender, author_id, ids, **kwargs):
+    # Sync clients don't keep a trash, so trashed notes are deleted for them
+    Tombstone.objects.bulk_create(
+        Tombstone(author_id=author_id, kind=SyncConfig.NOTE, object_id=note_id)
+        for note_id in ids
+    )
+
+
+@receiver(notes_restored)
+def forget_note_trashing(sender, author_id, ids, **kwargs):
+    # Restoring bumps modified_at, so clients that already removed the
+    # note get it back with their next sync
+    Tombstone.objects.filter(author_id=author_id, kind=SyncConfig.NOTE, object_id__in=ids).delete()
+
+
+@receiver(post_save, sender=Note)
+def publish_note_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        publish_on_commit(instance.author_id, SyncConfig.NOTE, LiveConfig.SAVED, [instance.pk])
+
+
+@receiver(post_save, sender=JournalEntry)
+def publish_journal_entry_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        publish_on_commit(
+            instance.author_id, SyncConfig.JOURNAL_ENTRY, LiveConfig.SAVED, [instance.pk]
+        )
+
+
+@receiver(post_delete, sender=Note)
+def publish_note_deleted(sender, instance, origin=None, **kwargs):
+    if not deleting_account(origin) and instance.deleted_at is None:
+        publish_on_commit(instance.author_id, SyncConfig.NOTE, LiveConfig.DELETED, [instance.pk])
+
+
+@receiver(post_delete, sender=JournalEntry)
+def publish_journal_entry_deleted(sender, instance, origin=None, **kwargs):
+    if not deleting_account(origin):
+        publish_on_commit(
+            instance.author_id, SyncConfig.JOURNAL_ENTRY, LiveConfig.DELETED, [instance.pk]
+        )
+
+
+@receiver(notes_bulk_saved)
+def publish_bulk_note_save(sender, author_id, notes, **kwargs):
+    publish_on_commit(author_id, SyncConfig.NOTE, LiveConfig.SAVED, [note.pk for note in notes])
+
+
+@receiver(notes_trashed)
+def publish_note_trashing(sender, author_id, ids, **kwargs):
+    publish_on_commit(author_id, SyncConfig.NOTE, LiveConfig.DELETED, ids)
+
+
+@receiver(notes_restored)
+def publish_note_restoring(sender, author_id, ids, **kwargs):
+    publish_on_commit(author_id, SyncConfig.NOTE, LiveConfig.SAVED, ids)
@@ -0,0 +1,91 @@
+(() => {
+    // The list each kind of item is shown in. New items go at the top.
+    const lists = {
+        note: ".note-list",
+        journal_entry: ".journal-entries",
+    };
+
+    const elementId = (kind, id) => `${kind.replace("_", "-")}-${id}`;
+
+    const isSearching = () =>
+        Boolean(new URLSearchParams(window.location.search).get("search"));
+
+    const applyChange = (kind, change) => {
+        const element = document.getElementById(elementId(kind, change.id));
+
+        if (change.action === "deleted") {
+            element?.remove();
+            return;
+        }
+
+        if (element) {
+            htmx.swap(element, change.html, { swapStyle: "outerHTML" });
+            return;
+        }
+
+        // A new note may not match the current search
+        const list = document.querySelector(lists[kind]);
+        if (list && !isSearching()) {
+            htmx.swap(list, change.html, { swapStyle: "afterbegin" });
+        }
+    };
+
+    // Reload just the lists on the page, when changes may have been missed
+    const reload = () => {
+        for (const selector of Object.values(lists)) {
+            if (document.querySelector(selector)) {
+                htmx.ajax("GET", window.location.href, {
+                    target: selector,
+                    select: selector,
+                    swap: "outerHTML",
+                });
+            }
+        }
+    };
+
+    const connect = (url) => {
+        const source = new EventSource(url);
+        let disconnected = false;
+
+        for (const kind of Object.keys(lists)) {
+            source.addEventListener(kind, (e) => {
+                applyChange(kind, JSON.parse(e.data));
+            });
+        }
+
+        source.addEventListener("resync", reload);
+
+        source.addEventListener("error", () => {
+            disconnected = true;
+        });
+
+        source.addEventListener("open", () => {
+            if (disconnected) {
+                disconnected = false;
+                reload();
+            }
+        });
+
+        return source;
+    };
+
+    // Pages showing a list mark it with their stream's URL, when the
+    // server can stream (under ASGI; see sync.context_processors). Boosted
+    // navigation keeps the document, so the stream is opened on the
+    // first page that has a marker and closed on the first that doesn't.
+    let source = null;
+
+    htmx.onLoad(() => {
+        const marker = document.querySelector("[data-live-url]");
+
+        if (!marker) {
+            source?.close();
+            source = null;
+            return;
+        }
+
+        if (!source && window.EventSource) {
+            source = connect(marker.dataset.liveUrl);
+        }
+    });
+})();
@@ -0,0 +1,138 @@
+"""Tests for delta sync queries and cursors."""
+
+import datetime
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.test import TestCase
+from django.utils import timezone
+
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+from src.apps.sync.constants import SyncConfig
+from src.apps.sync.models import Tombstone
+from src.apps.sync.utils.changes import (
+    ExpiredCursor,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    get_changes,
+)
+
+
+User = get_user_model()
+
+
+class ChangesTestCase(TestCase):
+    """
+    Extended class for sync tests. Rows count as settled as soon as
+    they're written.
+    """
+    def setUp(self):
+        settle_time = patch.object(SyncConfig, "SETTLE_TIME", datetime.timedelta(0))
+        settle_time.start()
+        self.addCleanup(settle_time.stop)
+
+        self.user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+
+
+class CursorTest(ChangesTestCase):
+    """Tests for cursor encoding."""
+
+    def test_cursor_round_trip(self):
+        """Test that decoded cursors match the encoded positions."""
+        now = timezone.now()
+        position = decode_cursor(encode_cursor({SyncConfig.NOTES: (now.isoformat(), None)}))
+        self.assertEqual(position, {SyncConfig.NOTES: (now, None)})
+
+    def test_tampered_cursor_is_rejected(self):
+        """Test that cursors we didn't sign are rejected."""
+        forged = signing.dumps({SyncConfig.NOTES: ["2020-01-01T00:00:00+00:00", None]})
+        for token in (forged, "garbage"):
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(token)
+
+
+class GetChangesTest(ChangesTestCase):
+    """Tests for get_changes."""
+
+    def test_initial_sync_returns_everything_but_deletions(self):
+        """Test that a sync without a cursor returns all rows."""
+        Note.objects.create(title="Note", content="Content", author=self.user)
+        JournalEntry.objects.create(content="Entry", author=self.user)
+        Tombstone.objects.create(author=self.user, kind=SyncConfig.NOTE, object_id=Note().pk)
+
+        changes = get_changes(self.user)
+
+        self.assertEqual(len(changes[SyncConfig.NOTES]), 1)
+        self.assertEqual(len(changes[SyncConfig.JOURNAL_ENTRIES]), 1)
+        self.assertEqual(changes[SyncConfig.DELETED], [])
+        self.assertFalse(changes["has_more"])
+
+    def test_incremental_sync_returns_only_changes(self):
+        """Test that a cursor only returns rows changed after it."""
+        unchanged = Note.objects.create(title="Unchanged", content="Content", author=self.user)
+        edited = Note.objects.create(title="Edited", content="Content", author=self.user)
+        cursor = get_changes(self.user)["cursor"]
+
+        edited.content = "New content"
+        edited.save()
+        changes = get_changes(self.user, cursor)
+
+        self.assertEqual([row["id"] for row in changes[SyncConfig.NOTES]], [edited.pk])
+        self.assertNotIn(unchanged.pk, [row["id"] for row in changes[SyncConfig.NOTES]])
+
+    def test_deletions_are_returned(self):
+        """Test that deleted notes and entries come back as tombstones."""
+        note = Note.objects.create(title="Note", content="Content", author=self.user)
+        entry = JournalEntry.objects.create(content="Entry", author=self.user)
+        expected = {(SyncConfig.NOTE, note.pk), (SyncConfig.JOURNAL_ENTRY, entry.pk)}
+        cursor = get_changes(self.user)["cursor"]
+
+        note.delete()
+        entry.delete()
+        deleted = get_changes(self.user, cursor)[SyncConfig.DELETED]
+
+        self.assertEqual({(row["type"], row["id"]) for row in deleted}, expected)
+
+    def test_account_deletion_leaves_no_tombstones(self):
+        """Test that cascaded deletes from a deleted user aren't recorded."""
+        Note.objects.create(title="Note", content="Content", author=self.user)
+        self.user.delete()
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_pages_through_changes(self):
+        """Test that large syncs are split into pages without gaps."""
+        notes = [
+            Note.objects.create(title=f"Note {num}", content="Content", author=self.user)
+            for num in range(5)
+        ]
+
+        seen = []
+        cursor = None
+        while True:
+            changes = get_changes(self.user, cursor, limit=2)
+            seen += [row["id"] for row in changes[SyncConfig.NOTES]]
+            cursor = changes["cursor"]
+            if not changes["has_more"]:
+                break
+
+        self.assertEqual(sorted(seen), sorted(note.pk for note in notes))
+
+    def test_recent_writes_wait_for_next_sync(self):
+        """Test that rows inside the settle window aren't returned yet."""
+        Note.objects.create(title="Note", content="Content", author=self.user)
+        with patch.object(SyncConfig, "SETTLE_TIME", datetime.timedelta(minutes=1)):
+            changes = get_changes(self.user)
+        self.assertEqual(changes[SyncConfig.NOTES], [])
+
+    def test_expired_cursor(self):
+        """Test that cursors older than tombstone retention are refused."""
+        old = timezone.now() - SyncConfig.TOMBSTONE_RETENTION - datetime.timedelta(days=1)
+        cursor = encode_cursor({SyncConfig.DELETED: (old.isoformat(), None)})
+        with self.assertRaises(ExpiredCursor):
+            get_changes(self.user, cursor)
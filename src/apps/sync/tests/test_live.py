@@ -0,0 +1,234 @@
+"""Tests for live update publishing and streams."""
+
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.batch import apply_batch
+from src.apps.notes.models import Note
+from src.apps.sync.broker import LocalBroker, local_broker
+from src.apps.sync.constants import LiveConfig, SyncConfig
+from src.apps.sync.utils.live import render_event
+
+
+User = get_user_model()
+
+
+class LocalBrokerTests(SimpleTestCase):
+    """
+    Tests for in-process fan-out.
+    """
+    async def test_publish_reaches_only_the_users_streams(self):
+        broker = LocalBroker()
+        queue = broker.subscribe(1)
+        other_queue = broker.subscribe(2)
+
+        broker.publish(1, {"kind": "note"})
+
+        self.assertEqual(await asyncio.wait_for(queue.get(), 1), {"kind": "note"})
+        self.assertTrue(other_queue.empty())
+
+    async def test_publish_from_another_thread(self):
+        broker = LocalBroker()
+        queue = broker.subscribe(1)
+
+        thread = threading.Thread(target=broker.publish, args=(1, {"kind": "note"}))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(await asyncio.wait_for(queue.get(), 1), {"kind": "note"})
+
+    async def test_unsubscribed_streams_get_nothing(self):
+        broker = LocalBroker()
+        queue = broker.subscribe(1)
+        broker.unsubscribe(1, queue)
+
+        broker.publish(1, {"kind": "note"})
+        await asyncio.sleep(0)
+
+        self.assertTrue(queue.empty())
+
+    async def test_full_queue_is_replaced_by_resync(self):
+        broker = LocalBroker()
+        queue = broker.subscribe(1)
+
+        for _ in range(LiveConfig.QUEUE_SIZE + 1):
+            broker.publish(1, {"kind": "note"})
+        await asyncio.sleep(0)
+
+        self.assertEqual(queue.qsize(), 1)
+        self.assertEqual(queue.get_nowait(), {"kind": LiveConfig.RESYNC})
+
+
+class LiveTestCase(TestCase):
+    """
+    Extended class for live update tests.
+    """
+    def setUp(self):
+        self.test_user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+
+
+class PublishTests(LiveTestCase):
+    """
+    Tests that changes are published once they commit.
+    """
+    def setUp(self):
+        super().setUp()
+        publish = patch.object(local_broker, "publish")
+        self.publish = publish.start()
+        self.addCleanup(publish.stop)
+
+    def test_saved_note_is_published_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            note = Note.objects.create(content="Hello", author=self.test_user)
+
+        self.publish.assert_not_called()
+        for callback in callbacks:
+            callback()
+
+        self.publish.assert_called_once_with(
+            self.test_user.pk,
+            {"kind": SyncConfig.NOTE, "action": LiveConfig.SAVED, "ids": [str(note.pk)]},
+        )
+
+    def test_deleted_journal_entry_is_published(self):
+        entry = JournalEntry.objects.create(content="Hello", author=self.test_user)
+        entry_id = entry.pk
+
+        with self.captureOnCommitCallbacks(execute=True):
+            entry.delete()
+
+        self.publish.assert_called_once_with(
+            self.test_user.pk,
+            {"kind": SyncConfig.JOURNAL_ENTRY, "action": LiveConfig.DELETED, "ids": [str(entry_id)]},
+        )
+
+    def test_batch_writes_are_published(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            results = apply_batch(self.test_user, [{"op": "create", "content": "Hello"}])
+
+        self.publish.assert_called_once_with(
+            self.test_user.pk,
+            {"kind": SyncConfig.NOTE, "action": LiveConfig.SAVED, "ids": [str(results[0]["id"])]},
+        )
+
+    def test_large_batches_are_published_as_resync(self):
+        operations = [{"op": "create", "content": "Hello"}] * (LiveConfig.MAX_EVENT_IDS + 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_batch(self.test_user, operations)
+
+        self.publish.assert_called_once_with(self.test_user.pk, {"kind": LiveConfig.RESYNC})
+
+    def test_account_deletion_is_not_published(self):
+        Note.objects.create(content="Hello", author=self.test_user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.test_user.delete()
+
+        self.publish.assert_not_called()
+
+
+class RenderEventTests(LiveTestCase):
+    """
+    Tests for rendering broker events as stream messages.
+    """
+    async def test_saved_note_is_rendered_as_list_item(self):
+        note = await Note.objects.acreate(title="Live note", content="Hello", author=self.test_user)
+
+        [(name, data)] = await render_event(
+            self.test_user,
+            {"kind": SyncConfig.NOTE, "action": LiveConfig.SAVED, "ids": [str(note.pk)]},
+        )
+
+        self.assertEqual(name, SyncConfig.NOTE)
+        self.assertEqual(data["action"], LiveConfig.SAVED)
+        self.assertIn(f'id="note-{note.pk}"', data["html"])
+        self.assertIn("Live note", data["html"])
+
+    async def test_missing_items_are_sent_as_deleted(self):
+        strange_user = await User.objects.acreate(username="strangeuser@example.com")
+        note = await Note.objects.acreate(content="Hello", author=strange_user)
+
+        [(name, data)] = await render_event(
+            self.test_user,
+            {"kind": SyncConfig.NOTE, "action": LiveConfig.SAVED, "ids": [str(note.pk)]},
+        )
+
+        self.assertEqual(data, {"action": LiveConfig.DELETED, "id": str(note.pk)})
+
+    async def test_resync(self):
+        messages = await render_event(self.test_user, {"kind": LiveConfig.RESYNC})
+        self.assertEqual(messages, [(LiveConfig.RESYNC, {})])
+
+
+class LiveUpdatesViewTests(LiveTestCase):
+    """
+    Integration tests for the live updates stream.
+    """
+    def setUp(self):
+        super().setUp()
+        self.live_url = reverse("sync:live")
+
+    def test_live_updates_require_login(self):
+        """
+        Test that anonymous requests are refused rather than redirected.
+        """
+        self.assertEqual(self.client.get(self.live_url).status_code, 403)
+
+    def test_no_stream_under_wsgi(self):
+        """
+        Test that WSGI requests get no stream, and that the browser is
+        told not to reconnect.
+        """
+        self.client.force_login(self.test_user)
+        response = self.client.get(self.live_url)
+        self.assertEqual(response.status_code, 204)
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+
+    def test_pages_ask_for_no_stream_under_wsgi(self):
+        """
+        Test that list pages carry the stream's URL only when the
+        server can stream.
+        """
+        self.client.force_login(self.test_user)
+        response = self.client.get(reverse("notes:list"))
+        self.assertNotContains(response, "data-live-url")
+
+    async def test_pages_ask_for_a_stream_under_asgi(self):
+        await self.async_client.aforce_login(self.test_user)
+        response = await self.async_client.get(reverse("notes:list"))
+        self.assertContains(response, f'data-live-url="{self.live_url}"')
+
+    async def test_stream_sends_changes(self):
+        entry = await JournalEntry.objects.acreate(content="**Hello**", author=self.test_user)
+        await self.async_client.aforce_login(self.test_user)
+
+        response = await self.async_client.get(self.live_url)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), f"retry: {LiveConfig.RETRY}\n\n".encode())
+
+        local_broker.publish(
+            self.test_user.pk,
+            {"kind": SyncConfig.JOURNAL_ENTRY, "action": LiveConfig.SAVED, "ids": [str(entry.pk)]},
+        )
+        message = (await asyncio.wait_for(anext(stream), 1)).decode()
+        await stream.aclose()
+
+        name, data = message.strip().split("\n")
+        self.assertEqual(name, f"event: {SyncConfig.JOURNAL_ENTRY}")
+        data = json.loads(data.removeprefix("data: "))
+        self.assertEqual(data["id"], str(entry.pk))
+        self.assertIn("<strong>Hello</strong>", data["html"])
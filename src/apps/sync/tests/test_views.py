@@ -0,0 +1,106 @@
+"""Integration tests for the sync view."""
+
+import datetime
+import gzip
+import json
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from src.apps.common.testing import QueryBudgetMixin
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+from src.apps.sync.constants import SyncConfig
+
+
+User = get_user_model()
+
+
+class SyncViewTests(QueryBudgetMixin, TestCase):
+    """
+    Integration tests for the sync endpoint.
+    """
+    def setUp(self):
+        settle_time = patch.object(SyncConfig, "SETTLE_TIME", datetime.timedelta(0))
+        settle_time.start()
+        self.addCleanup(settle_time.stop)
+
+        self.test_user = User.objects.create_user(
+            username="testuser@example.com",
+            email="testuser@example.com"
+        )
+        self.strange_user = User.objects.create_user(
+            username="strangeuser@example.com",
+            email="strangeuser@example.com"
+        )
+        Note.objects.create(title="Test note", content="Hello", author=self.test_user)
+        Note.objects.create(title="Strange note", content="Hello", author=self.strange_user)
+        JournalEntry.objects.create(content="Test entry", author=self.test_user)
+
+        self.sync_url = reverse("sync:changes")
+
+    def test_sync_requires_login(self):
+        """
+        Test that anonymous requests are refused rather than redirected.
+        """
+        self.assertEqual(self.client.get(self.sync_url).status_code, 403)
+
+    def test_sync_returns_own_changes(self):
+        """
+        Test that the sync only contains the user's notes and entries.
+        """
+        self.client.force_login(self.test_user)
+        data = self.client.get(self.sync_url).json()
+
+        self.assertEqual([row["title"] for row in data["notes"]], ["Test note"])
+        self.assertEqual([row["content"] for row in data["journal_entries"]], ["Test entry"])
+        self.assertIn("cursor", data)
+
+    def test_sync_with_cursor_is_empty_when_unchanged(self):
+        """
+        Test that a second sync with no changes returns nothing.
+        """
+        self.client.force_login(self.test_user)
+        cursor = self.client.get(self.sync_url).json()["cursor"]
+
+        data = self.client.get(self.sync_url, {"cursor": cursor}).json()
+        self.assertEqual(data["notes"], [])
+        self.assertEqual(data["journal_entries"], [])
+        self.assertEqual(data["deleted"], [])
+
+    def test_invalid_cursor(self):
+        """
+        Test that a bad cursor is a client error.
+        """
+        self.client.force_login(self.test_user)
+        response = self.client.get(self.sync_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_response_is_compressed(self):
+        """
+        Test that responses are gzipped for clients that accept it.
+        """
+        self.client.force_login(self.test_user)
+        for num in range(20):
+            Note.objects.create(title=f"Note {num}", content="Hello " * 50, author=self.test_user)
+
+        response = self.client.get(self.sync_url, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("notes", json.loads(gzip.decompress(response.content)))
+
+    def test_sync_query_count_is_constant(self):
+        """
+        Test that a sync runs the same queries for 1 or 100 notes.
+        """
+        self.client.force_login(self.test_user)
+
+        def populate(count):
+            existing = Note.objects.filter(author=self.test_user).count()
+            Note.objects.bulk_create([
+                Note(title=f"Bulk note #{num}", content="Hello!", author=self.test_user)
+                for num in range(existing, count)
+            ])
+
+        self.assertQueryCountConstant(self.sync_url, populate)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from .views import LiveUpdatesView, SyncView
+
+app_name = "sync"
+
+urlpatterns = [
+    path("", SyncView.as_view(), name="changes"),
+    path("live/", LiveUpdatesView.as_view(), name="live"),
+]
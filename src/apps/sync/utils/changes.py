@@ -0,0 +1,134 @@
+"""Delta sync: notes, journal entries and deletions since a cursor."""
+
+import datetime
+
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+
+from ..constants import SyncConfig
+from ..models import Tombstone
+
+
+NOTE_FIELDS = ("id", "title", "content", "created_at", "modified_at")
+JOURNAL_ENTRY_FIELDS = ("id", "content", "created_at", "modified_at")
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class ExpiredCursor(Exception):
+    pass
+
+
+def encode_cursor(position):
+    """
+    Encode sync positions as an opaque, signed token.
+    """
+    return signing.dumps(position, salt=SyncConfig.CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token):
+    """
+    Decode a token from encode_cursor. Raises InvalidCursor for tokens
+    that are malformed or weren't issued by us.
+    """
+    try:
+        position = signing.loads(token, salt=SyncConfig.CURSOR_SALT)
+        return {
+            stream: (datetime.datetime.fromisoformat(timestamp), last_id)
+            for stream, (timestamp, last_id) in position.items()
+        }
+    except (signing.BadSignature, TypeError, ValueError, AttributeError) as error:
+        raise InvalidCursor from error
+
+
+def rows_after(queryset, field, position, until, limit):
+    """
+    Return up to limit rows ordered by (field, id) that come after the
+    position and before until. A position is a (timestamp, last_id)
+    pair; a last_id of None means every row before the timestamp has
+    been seen.
+    """
+    queryset = queryset.filter(**{f"{field}__lt": until})
+
+    if position is not None:
+        timestamp, last_id = position
+        if last_id is None:
+            queryset = queryset.filter(**{f"{field}__gte": timestamp})
+        else:
+            queryset = queryset.filter(
+                Q(**{f"{field}__gt": timestamp}) | Q(**{field: timestamp, "id__gt": last_id})
+            )
+
+    return list(queryset.order_by(field, "id")[:limit + 1])
+
+
+def next_position(rows, field, until, has_more):
+    """
+    Return the position after a page of rows. Once a stream is caught
+    up, it moves on to until, so quiet streams don't rescan old rows.
+    """
+    if has_more:
+        return rows[-1][field].isoformat(), str(rows[-1]["id"])
+    return until.isoformat(), None
+
+
+def get_changes(user, cursor=None, limit=SyncConfig.PAGE_SIZE):
+    """
+    Return the user's notes, journal entries and deletions since the
+    cursor, with a cursor for the next sync. Without a cursor, all
+    notes and journal entries are returned and no deletions.
+    """
+    now = timezone.now()
+    until = now - SyncConfig.SETTLE_TIME
+
+    if cursor:
+        position = decode_cursor(cursor)
+        deleted_since = position.get(SyncConfig.DELETED, (until, None))[0]
+        if deleted_since < now - SyncConfig.TOMBSTONE_RETENTION:
+            raise ExpiredCursor
+    else:
+        # A fresh client has nothing to delete
+        position = {SyncConfig.DELETED: (until, None)}
+
+    streams = {
+        SyncConfig.NOTES: (
+            Note.objects.filter(author=user).values(*NOTE_FIELDS), "modified_at"
+        ),
+        SyncConfig.JOURNAL_ENTRIES: (
+            JournalEntry.objects.filter(author=user).values(*JOURNAL_ENTRY_FIELDS), "modified_at"
+        ),
+        SyncConfig.DELETED: (
+            Tombstone.objects.filter(author=user).values("id", "kind", "object_id", "deleted_at"),
+            "deleted_at",
+        ),
+    }
+
+    changes = {}
+    next_cursor = {}
+    has_more = False
+    for stream, (queryset, field) in streams.items():
+        rows = rows_after(queryset, field, position.get(stream), until, limit)
+        stream_has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor[stream] = next_position(rows, field, until, stream_has_more)
+        changes[stream] = rows
+        has_more = has_more or stream_has_more
+
+    # Tombstone IDs are internal; clients only need what was deleted
+    changes[SyncConfig.DELETED] = [
+        {"type": row["kind"], "id": row["object_id"], "deleted_at": row["deleted_at"]}
+        for row in changes[SyncConfig.DELETED]
+    ]
+
+    return {
+        **changes,
+        "cursor": encode_cursor(next_cursor),
+        "has_more": has_more,
+    }
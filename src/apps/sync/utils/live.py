@@ -0,0 +1,91 @@
+"""Live update streams: broker events rendered as Server-Sent Events."""
+
+import asyncio
+import json
+
+from django.core.handlers.asgi import ASGIRequest
+from django.template.loader import render_to_string
+
+from src.apps.journal.models import JournalEntry
+from src.apps.notes.models import Note
+
+from ..broker import get_broker
+from ..constants import LiveConfig, SyncConfig
+
+
+# Model, item template and template variable for each kind of item
+RENDERERS = {
+    SyncConfig.NOTE: (Note, "notes/partials/list_entry.html", "note"),
+    SyncConfig.JOURNAL_ENTRY: (JournalEntry, "journal/partials/entry.html", "entry"),
+}
+
+
+def streaming_available(request):
+    """
+    Return True if the request is served by an ASGI server. WSGI
+    servers buffer a streamed response until it ends and tie up a
+    worker thread all the while, so streams are only served under ASGI.
+    """
+    return isinstance(request, ASGIRequest)
+
+
+def format_event(name, data):
+    """
+    Format one Server-Sent Event with a JSON payload.
+    """
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+async def render_event(user, event):
+    """
+    Return the (name, data) messages for a broker event. Saved items are
+    loaded and rendered in one query; any that were deleted since are
+    sent as deletions.
+    """
+    kind = event.get("kind")
+    if kind not in RENDERERS:
+        return [(LiveConfig.RESYNC, {})]
+
+    ids = event["ids"]
+    if event["action"] == LiveConfig.DELETED:
+        return [(kind, {"action": LiveConfig.DELETED, "id": pk}) for pk in ids]
+
+    model, template, name = RENDERERS[kind]
+    items = {str(item.pk): item async for item in model.objects.filter(author=user, pk__in=ids)}
+
+    messages = []
+    for pk in ids:
+        item = items.get(pk)
+        if item is None:
+            messages.append((kind, {"action": LiveConfig.DELETED, "id": pk}))
+        else:
+            html = render_to_string(template, {name: item})
+            messages.append((kind, {"action": LiveConfig.SAVED, "id": pk, "html": html}))
+    return messages
+
+
+async def stream_events(user):
+    """
+    Yield the user's changes as Server-Sent Events until the stream has
+    been open for LiveConfig.MAX_DURATION, with keepalive comments while
+    nothing is happening.
+    """
+    broker = get_broker()
+    queue = broker.subscribe(user.pk)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + LiveConfig.MAX_DURATION
+
+    try:
+        yield f"retry: {LiveConfig.RETRY}\n\n"
+
+        while loop.time() < deadline:
+            try:
+                event = await asyncio.wait_for(queue.get(), LiveConfig.KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            for name, data in await render_event(user, event):
+                yield format_event(name, data)
+    finally:
+        broker.unsubscribe(user.pk, queue)
@@ -0,0 +1,63 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.gzip import gzip_page
+
+from .constants import ErrorMessages
+from .utils.changes import ExpiredCursor, InvalidCursor, get_changes
+from .utils.live import stream_events, streaming_available
+
+
+@method_decorator(gzip_page, name="dispatch")
+class SyncView(LoginRequiredMixin, View):
+    """
+    JSON endpoint returning the notes, journal entries and deletions
+    since the given cursor. Clients keep calling it with the returned
+    cursor until has_more is false.
+    """
+    raise_exception = True
+
+    # Session, user, notes, journal entries, tombstones
+    query_budget = 5
+
+    def get(self, request, *args, **kwargs):
+        try:
+            changes = get_changes(request.user, request.GET.get("cursor"))
+        except InvalidCursor:
+            return JsonResponse({"error": ErrorMessages.INVALID_CURSOR}, status=400)
+        except ExpiredCursor:
+            return JsonResponse({"error": ErrorMessages.EXPIRED_CURSOR}, status=410)
+
+        return JsonResponse(changes)
+
+
+class LiveUpdatesView(View):
+    """
+    Server-Sent Events stream of changes to the user's notes and journal
+    entries, as rendered list items for HTMX to swap in.
+
+    Only served under ASGI, where an open stream costs a coroutine.
+    WSGI servers buffer the whole stream before sending any of it, so
+    there the view answers 204 No Content, which tells the browser's
+    EventSource to stop reconnecting. Pages only ask for a stream when
+    one is available (see context_processors.live_updates).
+    """
+
+    # Session, user. Each event then loads its items in one query.
+    query_budget = 2
+
+    async def get(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            raise PermissionDenied
+
+        if not streaming_available(request):
+            return HttpResponse(status=204)
+
+        response = StreamingHttpResponse(stream_events(user), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream
+        response["X-Accel-Buffering"] = "no"
+        return response